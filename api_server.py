@@ -0,0 +1,345 @@
+"""
+Headless HTTP Scoring Service (ASGI)
+
+Exposes resume analysis, skill gap analysis and report generation without
+Streamlit. The job catalog, skill index and role matrix are loaded once per
+worker process at startup and shared by every request; PDF extraction runs in
+a process pool and other blocking work in a thread pool, so the event loop
+only parses requests and writes responses.
+
+Run with any ASGI server, e.g.:
+    uvicorn api_server:app --workers 4
+
+Endpoints:
+    GET  /health            Service and catalog status
+    GET  /roles             Sorted list of job roles
+    POST /analyze           Raw PDF body -> extracted text and job matches
+                            (query: top_k, max_pages, max_chars, include_text,
+                            scoring=cosine|tfidf|bm25)
+    POST /suggest           JSON {"resume_text", "role"} -> skill gaps
+                            (omit "role" for every role at once)
+    POST /report            JSON {"resume_text", "role", "username"} -> PDF
+    POST /ats               JSON {"resume_text", "roles"} -> ATS analysis and scores
+    POST /parse             Raw PDF body -> sections and entities (dates, degrees,
+                            schools, employers)
+    GET  /candidates        Stored resumes ranked for a role (query: role, limit,
+                            by=similarity|skill_match); needs RESUME_AI_STORE
+    POST /rank              JSON {"role" and/or "job_description", "k"} -> stored
+                            candidates ranked by reverse matching; needs RESUME_AI_STORE
+    GET  /metrics           Stage timings and counters (Prometheus text format)
+"""
+import os
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import parse_qs
+
+from resume_ai import (
+    analyze_resume, suggest_improvements, suggest_improvements_all,
+    get_all_job_roles, get_job_catalog, get_module_info, SCORING_MODES, DEFAULT_SCORING
+)
+from pdf_generator import generate_role_report
+from ats_analyzer import analyze_ats
+from resume_parser import parse_resume_pdf
+from resume_store import get_resume_store, RANK_COLUMNS
+from candidate_index import rank_candidates
+from instrumentation import HistogramSink, add_sink, get_histogram, timer
+
+# Largest request body accepted (PDF uploads included)
+MAX_BODY_BYTES = int(os.environ.get("RESUME_AI_MAX_BODY_BYTES", 10 * 1024 * 1024))
+
+# Worker processes used for PDF extraction
+EXTRACT_WORKERS = int(os.environ.get("RESUME_AI_EXTRACT_WORKERS", os.cpu_count() or 2))
+
+# Extraction limits applied to every upload
+MAX_PAGES = int(os.environ.get("RESUME_AI_MAX_PAGES", 20))
+MAX_CHARS = int(os.environ.get("RESUME_AI_MAX_CHARS", 100_000))
+
+_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("RESUME_AI_THREADS", 32)))
+
+# Stage timings are always collected by the service and served on /metrics
+_metrics = get_histogram() or add_sink(HistogramSink())
+
+logger = logging.getLogger(__name__)
+
+class HTTPError(Exception):
+    """Error that maps directly to an HTTP response"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+async def _read_body(receive, limit=MAX_BODY_BYTES):
+    """Read the full request body, rejecting anything over the size limit"""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "Client disconnected")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise HTTPError(413, f"Request body exceeds {limit} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+def _json_body(body):
+    """Parse a JSON object request body"""
+    try:
+        payload = json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        raise HTTPError(400, "Request body must be valid JSON")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return payload
+
+def _int_param(query, name, default):
+    """Return an integer query parameter"""
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return int(values[0])
+    except ValueError:
+        raise HTTPError(400, f"Query parameter '{name}' must be an integer")
+
+def _valid_matches(matches):
+    """Return True if `matches` is a list of {"job": str, "similarity": number} dicts"""
+    return isinstance(matches, list) and all(
+        isinstance(match, dict) and isinstance(match.get("job"), str)
+        and isinstance(match.get("similarity"), (int, float)) and not isinstance(match.get("similarity"), bool)
+        for match in matches
+    )
+
+async def _send(send, status, body, content_type):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+async def _send_json(send, status, payload):
+    await _send(send, status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+async def _run(func, *args, **kwargs):
+    """Run blocking work in the shared thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(_executor, partial(func, *args, **kwargs))
+
+async def handle_health(scope, receive, send):
+    info = get_module_info()
+    await _send_json(send, 200, {
+        "status": "ok",
+        "pymupdf_available": info["pymupdf_available"],
+        "sklearn_available": info["sklearn_available"],
+        "catalog_version": info["catalog_version"],
+        "total_job_roles": info["total_job_roles"],
+    })
+
+async def handle_roles(scope, receive, send):
+    await _send_json(send, 200, {"roles": get_all_job_roles()})
+
+async def handle_analyze(scope, receive, send):
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    top_k = _int_param(query, "top_k", None)
+    if top_k is not None and top_k < 0:
+        raise HTTPError(400, "Query parameter 'top_k' must not be negative")
+    max_pages = _int_param(query, "max_pages", MAX_PAGES)
+    if max_pages < 1:
+        raise HTTPError(400, "Query parameter 'max_pages' must be positive")
+    max_chars = _int_param(query, "max_chars", MAX_CHARS)
+    if max_chars < 1:
+        raise HTTPError(400, "Query parameter 'max_chars' must be positive")
+    include_text = query.get("include_text", ["0"])[0] in ("1", "true", "yes")
+    scoring = query.get("scoring", [DEFAULT_SCORING])[0]
+    if scoring not in SCORING_MODES:
+        raise HTTPError(400, f"Query parameter 'scoring' must be one of: {', '.join(SCORING_MODES)}")
+
+    body = await _read_body(receive)
+    if not body:
+        raise HTTPError(400, "Request body must contain a PDF")
+
+    # Cache lookups and scoring run on a thread; page parsing goes to the process pool
+    resume_text, job_matches = await _run(
+        analyze_resume, body, workers=EXTRACT_WORKERS, max_pages=min(max_pages, MAX_PAGES),
+        max_chars=min(max_chars, MAX_CHARS), scoring=scoring, top_k=top_k
+    )
+    if not resume_text or resume_text.startswith("ERROR"):
+        raise HTTPError(422, resume_text or "ERROR: No text found in PDF")
+
+    store = get_resume_store()
+    if store is not None:
+        await _run(store.add_resume, resume_text, source="api")
+
+    payload = {"matches": job_matches}
+    if include_text:
+        payload["resume_text"] = resume_text
+    await _send_json(send, 200, payload)
+
+async def handle_suggest(scope, receive, send):
+    payload = _json_body(await _read_body(receive))
+    resume_text = payload.get("resume_text")
+    if not isinstance(resume_text, str) or not resume_text:
+        raise HTTPError(400, "'resume_text' is required")
+
+    role = payload.get("role")
+    if role is not None and not isinstance(role, str):
+        raise HTTPError(400, "'role' must be a string")
+    if role:
+        result = await _run(suggest_improvements, resume_text, role)
+    else:
+        result = await _run(suggest_improvements_all, resume_text)
+    await _send_json(send, 200, result)
+
+async def handle_report(scope, receive, send):
+    payload = _json_body(await _read_body(receive))
+    resume_text = payload.get("resume_text")
+    role = payload.get("role")
+    if not isinstance(resume_text, str) or not resume_text or not isinstance(role, str) or not role:
+        raise HTTPError(400, "'resume_text' and 'role' are required")
+    username = payload.get("username") or "Candidate"
+    if not isinstance(username, str):
+        raise HTTPError(400, "'username' must be a string")
+    if role not in get_job_catalog().data:
+        raise HTTPError(404, f"Unknown role: {role}")
+    top_matches = payload.get("top_matches")
+    if top_matches is not None and not _valid_matches(top_matches):
+        raise HTTPError(400, "'top_matches' must be a list of {\"job\": str, \"similarity\": number} objects")
+
+    pdf_bytes = await _run(
+        generate_role_report, resume_text, role, username,
+        top_matches=top_matches
+    )
+    await _send(send, 200, pdf_bytes, "application/pdf")
+
+async def handle_ats(scope, receive, send):
+    payload = _json_body(await _read_body(receive))
+    resume_text = payload.get("resume_text")
+    if not isinstance(resume_text, str) or not resume_text:
+        raise HTTPError(400, "'resume_text' is required")
+    roles = payload.get("roles") or []
+    if not isinstance(roles, list) or not all(isinstance(role, str) for role in roles):
+        raise HTTPError(400, "'roles' must be a list of role names")
+
+    result = await _run(analyze_ats, resume_text, roles)
+    result.pop("skill_counts", None)
+    await _send_json(send, 200, result)
+
+async def handle_parse(scope, receive, send):
+    body = await _read_body(receive)
+    if not body:
+        raise HTTPError(400, "Request body must contain a PDF")
+
+    try:
+        document = await _run(parse_resume_pdf, body, max_pages=MAX_PAGES, max_chars=MAX_CHARS)
+    except Exception as e:
+        raise HTTPError(422, f"ERROR parsing PDF: {e}")
+    await _send_json(send, 200, document.to_dict())
+
+async def handle_candidates(scope, receive, send):
+    store = get_resume_store()
+    if store is None:
+        raise HTTPError(404, "Resume store is disabled; set RESUME_AI_STORE")
+
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    role = query.get("role", [""])[0]
+    if role not in get_job_catalog().data:
+        raise HTTPError(404, f"Unknown role: {role}")
+    limit = _int_param(query, "limit", 50)
+    if limit < 1:
+        raise HTTPError(400, "Query parameter 'limit' must be positive")
+    by = query.get("by", ["similarity"])[0]
+    if by not in RANK_COLUMNS:
+        raise HTTPError(400, f"Query parameter 'by' must be one of: {', '.join(RANK_COLUMNS)}")
+
+    candidates = await _run(store.top_candidates, role, min(limit, 1000), by)
+    await _send_json(send, 200, {"role": role, "candidates": candidates})
+
+async def handle_rank(scope, receive, send):
+    store = get_resume_store()
+    if store is None:
+        raise HTTPError(404, "Resume store is disabled; set RESUME_AI_STORE")
+
+    payload = _json_body(await _read_body(receive))
+    role = payload.get("role")
+    job_description = payload.get("job_description")
+    if not role and not job_description:
+        raise HTTPError(400, "'role' or 'job_description' is required")
+    if role and role not in get_job_catalog().data:
+        raise HTTPError(404, f"Unknown role: {role}")
+    if job_description is not None and not isinstance(job_description, str):
+        raise HTTPError(400, "'job_description' must be a string")
+    k = payload.get("k", 50)
+    if not isinstance(k, int) or k < 1:
+        raise HTTPError(400, "'k' must be a positive integer")
+
+    candidates = await _run(rank_candidates, role, job_description, min(k, 1000), store)
+    await _send_json(send, 200, {"candidates": candidates})
+
+async def handle_metrics(scope, receive, send):
+    await _send(send, 200, _metrics.prometheus_text().encode("utf-8"), "text/plain; version=0.0.4")
+
+ROUTES = {
+    ("GET", "/health"): handle_health,
+    ("GET", "/roles"): handle_roles,
+    ("POST", "/analyze"): handle_analyze,
+    ("POST", "/suggest"): handle_suggest,
+    ("POST", "/report"): handle_report,
+    ("POST", "/ats"): handle_ats,
+    ("POST", "/parse"): handle_parse,
+    ("GET", "/candidates"): handle_candidates,
+    ("POST", "/rank"): handle_rank,
+    ("GET", "/metrics"): handle_metrics,
+}
+
+def _warm_up():
+    """Load the catalog and build the shared indexes before serving traffic"""
+    catalog = get_job_catalog()
+    catalog.skill_index
+    catalog.matcher
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await _run(_warm_up)
+            except Exception as e:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    handler = ROUTES.get((scope["method"], scope["path"].rstrip("/") or "/"))
+    if handler is None:
+        known_path = any(path == scope["path"] for _, path in ROUTES)
+        await _send_json(send, 405 if known_path else 404, {"error": "Method not allowed" if known_path else "Not found"})
+        return
+
+    try:
+        with timer(f"http.{handler.__name__[len('handle_'):]}"):
+            await handler(scope, receive, send)
+    except HTTPError as e:
+        await _send_json(send, e.status, {"error": e.message})
+    except Exception:
+        logger.exception("Error handling %s %s", scope["method"], scope["path"])
+        await _send_json(send, 500, {"error": "Internal server error"})
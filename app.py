@@ -3,11 +3,20 @@ Smart Resume Enhancement System
 Core Features - Fixed Version
 """
 import streamlit as st
-import random
+from datetime import datetime
 
 # Import modules
 try:
-    from resume_ai import analyze_resume, suggest_improvements, get_all_job_roles, JOB_DATA
+    from resume_ai import (
+        analyze_resume, suggest_improvements, suggest_improvements_all,
+        get_all_job_roles, pdf_content_hash, SCORING_MODES, DEFAULT_SCORING
+    )
+    from pdf_generator import generate_role_report
+    from job_search import job_board_links, search_openings
+    from ats_analyzer import analyze_ats
+    from resume_parser import parse_resume_pdf
+    from resume_store import get_resume_store
+    from candidate_index import rank_candidates
     RESUME_AI_OK = True
 except Exception as e:
     st.error(f"Module Error: {e}")
@@ -29,18 +38,12 @@ padding:1.5rem;border-radius:10px;color:white;margin-bottom:2rem;'>
 </div>
 """, unsafe_allow_html=True)
 
-# ===================== HELPER FUNCTIONS =====================
-def search_jobs_simple(job_title, location=""):
-    """Generate job search URLs"""
-    job_boards = {
-        "LinkedIn": f"https://www.linkedin.com/jobs/search/?keywords={job_title}&location={location}",
-        "Indeed": f"https://www.indeed.com/jobs?q={job_title}&l={location}",
-        "Glassdoor": f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={job_title}",
-        "Monster": f"https://www.monster.com/jobs/search/?q={job_title}",
-        "ZipRecruiter": f"https://www.ziprecruiter.com/Jobs/{job_title}",
-        "Google Jobs": f"https://www.google.com/search?q={job_title}+jobs&ibp=htl;jobs"
-    }
-    return job_boards
+# Extraction limits so pathological uploads cannot stall the app
+MAX_RESUME_PAGES = 20
+MAX_RESUME_CHARS = 100_000
+
+# Job matches the tabs display at most
+TOP_MATCHES = 6
 
 # ===================== SESSION STATE =====================
 if "logged_in" not in st.session_state:
@@ -74,18 +77,34 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
     
     st.subheader("📂 Upload Your Resume")
     uploaded_file = st.file_uploader("Upload PDF Resume", type=["pdf"])
+    scoring = st.selectbox(
+        "Matching method",
+        SCORING_MODES,
+        index=SCORING_MODES.index(DEFAULT_SCORING),
+        format_func=lambda mode: {"cosine": "Cosine (word counts)", "tfidf": "TF-IDF", "bm25": "BM25"}[mode]
+    )
     
     if uploaded_file:
-        file_id = f"{uploaded_file.name}_{uploaded_file.size}"
+        # Identify the upload by content so renamed copies reuse earlier results
+        with uploaded_file.getbuffer() as pdf_view:
+            file_id = f"{pdf_content_hash(pdf_view)}-{scoring}"
         
         # Process file only once
         if "last_processed_file" not in st.session_state or st.session_state["last_processed_file"] != file_id:
             with st.spinner("Analyzing your resume..."):
                 try:
-                    resume_data, matched_jobs = analyze_resume(uploaded_file)
+                    resume_data, matched_jobs = analyze_resume(
+                        uploaded_file, max_pages=MAX_RESUME_PAGES, max_chars=MAX_RESUME_CHARS, scoring=scoring,
+                        top_k=TOP_MATCHES
+                    )
                     st.session_state["resume_text"] = resume_data
                     st.session_state["matched_jobs"] = matched_jobs
                     st.session_state["last_processed_file"] = file_id
+                    
+                    # Keep the resume searchable after the session ends (RESUME_AI_STORE)
+                    resume_store = get_resume_store()
+                    if resume_store is not None:
+                        resume_store.add_resume(resume_data, name=uploaded_file.name, source=f"app:{st.session_state['username']}")
                 except Exception as e:
                     st.error(f"Error processing resume: {str(e)}")
                     st.session_state["resume_text"] = None
@@ -112,6 +131,21 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
                 st.markdown("### 🎯 Top Job Matches Based on Your Resume")
                 
                 if matched_jobs:
+                    col_toggle, col_location = st.columns([1, 2])
+                    show_openings = col_toggle.checkbox("Show live openings")
+                    location = col_location.text_input("Location", placeholder="City or country (optional)")
+                    
+                    # One concurrent, cached fan-out for all five roles and every board
+                    openings = {}
+                    if show_openings:
+                        with st.spinner("Searching job boards..."):
+                            try:
+                                openings = search_openings([job["job"] for job in matched_jobs[:5]], location)
+                            except Exception as e:
+                                st.warning(f"Live job search unavailable: {str(e)}")
+                        if not openings:
+                            st.info("Live job search is not available; use the board links below.")
+                    
                     for i, job in enumerate(matched_jobs[:5], 1):
                         score = job["similarity"]
                         emoji = "🟢" if score >= 70 else "🟡" if score >= 50 else "🔴"
@@ -120,7 +154,7 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
                             st.progress(score / 100)
                             
                             st.markdown(f"**🔗 Search for {job['job']} jobs:**")
-                            job_links = search_jobs_simple(job["job"])
+                            job_links = job_board_links(job["job"], location)
                             
                             col1, col2, col3 = st.columns(3)
                             for idx, (board, url) in enumerate(job_links.items()):
@@ -130,19 +164,32 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
                                     col2.markdown(f"[{board}]({url})")
                                 else:
                                     col3.markdown(f"[{board}]({url})")
+                            
+                            postings = [
+                                posting for board_postings in openings.get(job["job"], {}).values()
+                                for posting in board_postings
+                            ]
+                            if postings:
+                                st.markdown("**📋 Live openings:**")
+                                for posting in postings[:10]:
+                                    st.markdown(f"- [{posting['title']}]({posting['url']}) · {posting['board']}")
                 else:
                     st.warning("No job matches found. Try improving your resume keywords.")
             
             # ==================== TAB 2: ATS SCORE ====================
             with tab2:
                 st.markdown("### 📊 ATS Compatibility Analysis")
-                st.caption("Estimated ATS scores based on keyword matching")
+                st.caption("ATS scores from section headings, contact details, formatting, length and role keywords")
                 
                 if matched_jobs:
+                    ats = analyze_ats(resume_data, [job["job"] for job in matched_jobs[:6]])
                     col1, col2, col3 = st.columns(3)
                     
                     for idx, job in enumerate(matched_jobs[:6]):
-                        ats_score = min(100, int(job["similarity"] + random.randint(10, 25)))
+                        role_ats = ats["roles"].get(job["job"])
+                        if role_ats is None:
+                            continue
+                        ats_score = role_ats["score"]
                         
                         if idx % 3 == 0:
                             col1.metric(job["job"], f"{ats_score}%")
@@ -151,6 +198,21 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
                         else:
                             col3.metric(job["job"], f"{ats_score}%")
                     
+                    breakdown = ats["breakdown"]
+                    st.markdown("---")
+                    st.markdown("### 🧾 Score Breakdown")
+                    b1, b2, b3, b4 = st.columns(4)
+                    b1.metric("Sections", f"{breakdown['sections']}/30")
+                    b2.metric("Contact", f"{breakdown['contact']}/15")
+                    b3.metric("Formatting", f"{breakdown['formatting']}/15")
+                    b4.metric("Length", f"{breakdown['length']}/5")
+                    st.caption(f"Keyword coverage for each role adds up to 35 points · {ats['words']} words")
+                    
+                    if ats["issues"]:
+                        st.markdown("### 🔧 Issues Found")
+                        for issue in ats["issues"]:
+                            st.markdown(f"- {issue}")
+                    
                     st.markdown("---")
                     st.markdown("### 💡 ATS Optimization Tips")
                     st.info("""
@@ -184,6 +246,23 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
                 
                 st.text_area("Extracted Resume Text", resume_data, height=400)
                 
+                # Sections and entities recovered from the PDF layout
+                try:
+                    document = parse_resume_pdf(uploaded_file, max_pages=MAX_RESUME_PAGES, max_chars=MAX_RESUME_CHARS)
+                except Exception as e:
+                    st.warning(f"Could not parse resume layout: {str(e)}")
+                    document = None
+                
+                if document is not None:
+                    st.markdown("#### 🗂️ Detected Sections")
+                    for section in document.sections:
+                        if section.name == "header":
+                            continue
+                        with st.expander(f"{section.heading} ({len(section.lines)} lines)"):
+                            for entity in section.entities:
+                                st.markdown(f"**{entity.kind.title()}:** {entity.text}")
+                            st.text(section.text)
+                
                 st.download_button(
                     "📥 Download as TXT",
                     data=resume_data,
@@ -203,108 +282,30 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
                     if report_role:
                         with st.spinner("Creating your professional report..."):
                             try:
-                                from reportlab.lib.pagesizes import letter
-                                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                                from reportlab.lib.units import inch
-                                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-                                from reportlab.lib import colors
-                                from io import BytesIO
-                                from datetime import datetime
-                                
-                                suggestions = suggest_improvements(resume_data, report_role)
-                                
-                                buffer = BytesIO()
-                                doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-                                story = []
-                                styles = getSampleStyleSheet()
-                                
-                                # Title
-                                title_style = ParagraphStyle(
-                                    'CustomTitle',
-                                    parent=styles['Heading1'],
-                                    fontSize=24,
-                                    textColor=colors.HexColor('#667eea'),
-                                    spaceAfter=12,
-                                    alignment=1
+                                # Memoized per resume and role, so repeat clicks reuse the PDF
+                                pdf_data = generate_role_report(
+                                    resume_data,
+                                    report_role,
+                                    st.session_state['username'],
+                                    top_matches=matched_jobs[:5]
                                 )
-                                story.append(Paragraph("🧠 Resume Analysis Report", title_style))
-                                story.append(Spacer(1, 0.2*inch))
-                                
-                                # Info table
-                                info_data = [
-                                    ["Candidate:", st.session_state['username']],
-                                    ["Target Role:", report_role],
-                                    ["Date:", datetime.now().strftime('%B %d, %Y')],
-                                    ["Match Score:", f"{suggestions.get('match_percentage', 0)}%"]
-                                ]
-                                info_table = Table(info_data, colWidths=[1.5*inch, 4*inch])
-                                info_table.setStyle(TableStyle([
-                                    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-                                    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                                    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-                                ]))
-                                story.append(info_table)
-                                story.append(Spacer(1, 0.3*inch))
-                                
-                                # Present skills
-                                story.append(Paragraph("<b>✅ Skills You Have:</b>", styles['Heading2']))
-                                if suggestions["present_skills"]:
-                                    skills_text = ", ".join(suggestions["present_skills"])
-                                    story.append(Paragraph(skills_text, styles['Normal']))
-                                else:
-                                    story.append(Paragraph("None identified", styles['Normal']))
-                                story.append(Spacer(1, 0.2*inch))
-                                
-                                # Missing skills
-                                story.append(Paragraph("<b>⚠️ Skills to Add:</b>", styles['Heading2']))
-                                if suggestions["missing_skills"]:
-                                    skills_text = ", ".join(suggestions["missing_skills"])
-                                    story.append(Paragraph(skills_text, styles['Normal']))
-                                else:
-                                    story.append(Paragraph("All skills present!", styles['Normal']))
-                                story.append(Spacer(1, 0.2*inch))
-                                
-                                # Action items
-                                story.append(Paragraph("<b>💡 Action Items:</b>", styles['Heading2']))
-                                recommendations = [
-                                    "• Add missing skills with concrete project examples",
-                                    "• Quantify achievements (e.g., 'increased efficiency by 30%')",
-                                    "• Include relevant certifications and courses",
-                                    "• Optimize keywords for ATS compatibility",
-                                    "• Use strong action verbs (achieved, implemented, led)",
-                                    "• Ensure clear formatting and structure"
-                                ]
-                                for rec in recommendations:
-                                    story.append(Paragraph(rec, styles['Normal']))
-                                story.append(Spacer(1, 0.2*inch))
-                                
-                                # Top job matches
-                                story.append(Paragraph("<b>🎯 Top 5 Job Matches:</b>", styles['Heading2']))
-                                for i, job in enumerate(matched_jobs[:5], 1):
-                                    story.append(Paragraph(f"{i}. {job['job']} - {job['similarity']}% match", styles['Normal']))
-                                
-                                # Build PDF
-                                doc.build(story)
-                                pdf_data = buffer.getvalue()
-                                buffer.close()
-                                
+                                st.session_state["report_pdf"] = (file_id, report_role, pdf_data)
                                 st.success("✅ PDF Report Generated!")
-                                st.download_button(
-                                    "📥 Download PDF Report",
-                                    pdf_data,
-                                    f"resume_report_{report_role.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf",
-                                    "application/pdf",
-                                    use_container_width=True
-                                )
-                                
                             except Exception as e:
                                 st.error(f"Error generating PDF: {str(e)}")
                     else:
                         st.warning("Please select a role for the report.")
+                
+                # Keep the last report downloadable across reruns
+                report_state = st.session_state.get("report_pdf")
+                if report_state and report_state[0] == file_id and report_state[1] == report_role:
+                    st.download_button(
+                        "📥 Download PDF Report",
+                        report_state[2],
+                        f"resume_report_{report_role.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf",
+                        "application/pdf",
+                        use_container_width=True
+                    )
             
             # ==================== TAB 5: SKILLS CHART ====================
             with tab5:
@@ -315,10 +316,11 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
                 
                 if st.button("📈 Generate Analysis", type="primary", use_container_width=True):
                     try:
-                        role_scores = {}
-                        for role in get_all_job_roles():
-                            suggestions = suggest_improvements(resume_data, role)
-                            role_scores[role] = suggestions.get('match_percentage', 0)
+                        all_suggestions = suggest_improvements_all(resume_data)
+                        role_scores = {
+                            role: all_suggestions[role]['match_percentage'] if role in all_suggestions else 0
+                            for role in get_all_job_roles()
+                        }
                         
                         sorted_roles = sorted(role_scores.items(), key=lambda x: x[1], reverse=True)
                         
@@ -537,6 +539,59 @@ if st.session_state.get("logged_in") and RESUME_AI_OK:
         
         else:
             st.error("Could not extract text from the PDF. Please try again with a different file.")
+    
+    # ===================== CANDIDATE SEARCH =====================
+    resume_store = get_resume_store()
+    if resume_store is not None:
+        st.markdown("---")
+        with st.expander(f"🔎 Candidate Search ({len(resume_store)} stored resumes)"):
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                search_role = st.selectbox("Role", get_all_job_roles(), key="search_role")
+            with col2:
+                search_limit = st.number_input("Candidates", 1, 500, 50, key="search_limit")
+            with col3:
+                search_by = st.radio("Rank by", ["similarity", "skill_match"], key="search_by",
+                                     format_func=lambda by: {"similarity": "Similarity", "skill_match": "Skill match"}[by])
+            
+            candidates = resume_store.top_candidates(search_role, int(search_limit), search_by)
+            if candidates:
+                st.dataframe(
+                    [
+                        {
+                            "Candidate": candidate["name"] or f"Resume #{candidate['id']}",
+                            "Similarity %": candidate["similarity"],
+                            "Skill Match %": candidate["skill_match"],
+                            "ATS Base": candidate["ats_score"],
+                        }
+                        for candidate in candidates
+                    ],
+                    use_container_width=True
+                )
+            else:
+                st.info(f"No stored resumes match {search_role} yet.")
+            
+            # Reverse matching: rank every stored resume against a pasted job description
+            job_description = st.text_area("Or paste a job description", key="search_job_description", height=150)
+            if job_description.strip() and st.button("🔍 Find Candidates", key="search_jd"):
+                try:
+                    ranked = rank_candidates(job_description=job_description, k=int(search_limit), store=resume_store)
+                    if ranked:
+                        st.dataframe(
+                            [
+                                {
+                                    "Candidate": candidate["name"] or f"Resume #{candidate['id']}",
+                                    "Similarity %": candidate["similarity"],
+                                    "ATS Base": candidate["ats_score"],
+                                }
+                                for candidate in ranked
+                            ],
+                            use_container_width=True
+                        )
+                    else:
+                        st.info("No stored resume shares terms with this job description.")
+                except Exception as e:
+                    st.error(f"Error ranking candidates: {str(e)}")
 
 elif not st.session_state.get("logged_in"):
     st.markdown("""
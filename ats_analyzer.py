@@ -0,0 +1,240 @@
+"""
+ATS Compatibility Analysis
+
+Scores how well an extracted resume will survive an applicant tracking
+system: standard section headings, contact fields, formatting, length and
+keyword coverage for a target role. Everything is derived from the text
+alone, so the score is deterministic.
+
+The role-independent profile (sections, contacts, formatting, length and
+every catalog skill mentioned) comes from one scan with a single compiled
+regex plus the tokenization already used for skill matching, and is memoized
+per resume hash in the shared analysis cache. Scoring a role on top of it
+is a dictionary lookup per required skill.
+
+Score breakdown (100 points):
+    sections    30  Experience, Education, Skills, Summary, ...
+    contact     15  Email, phone, LinkedIn/GitHub/portfolio link
+    formatting  15  Bullets, quantified results, line lengths, odd glyphs
+    length       5  Word count
+    keywords    35  Share of the role's skills present in the resume
+"""
+import re
+import hashlib
+
+from resume_ai import get_job_catalog, get_analysis_cache
+from resume_parser import SECTION_HEADINGS
+from instrumentation import timer, increment
+
+# Bump when scoring changes so memoized profiles are recomputed
+ATS_VERSION = 1
+
+SECTION_WEIGHTS = {
+    "experience": 8,
+    "education": 7,
+    "skills": 8,
+    "summary": 3,
+    "projects": 2,
+    "certifications": 1,
+    "achievements": 1,
+}
+
+# One alternation for everything the scan looks for; each alternative is a named group
+_SCAN = re.compile(
+    "|".join(
+        [rf"(?P<{name}>^[ \t]*(?:{pattern})[ \t]*:?[ \t]*$)" for name, pattern in SECTION_HEADINGS.items()] + [
+            r"(?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)+)",
+            r"(?P<linkedin>(?:https?://)?(?:[\w-]+\.)?linkedin\.com/in/[\w%-]+)",
+            r"(?P<github>(?:https?://)?(?:www\.)?github\.com/[\w-]+)",
+            r"(?P<url>https?://[^\s|,;]+|www\.[^\s|,;]+)",
+            r"(?P<phone>(?<![\w.])\+?\(?\d[\d ().-]{7,}\d(?![\w.]))",
+            r"(?P<bullet>^[ \t]*[•●▪◦‣∙○■□➢►✓\-\*–][ \t]+)",
+            r"(?P<metric>\d+(?:\.\d+)?[ \t]?%|[$€£][ \t]?\d[\d,]*(?:\.\d+)?[ \t]?[kKmMbB]?\b)",
+            r"(?P<glyph>[\ue000-\uf8ff\ufffd]|[\u2500-\u257f])",
+        ]
+    ),
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Group names of _SCAN in order, so matches dispatch on lastindex without lookups by name
+_GROUPS = [None] + [name for name, _ in sorted(_SCAN.groupindex.items(), key=lambda item: item[1])]
+
+# Lines longer than this usually come from multi-column layouts or tables
+LONG_LINE_CHARS = 160
+
+def _scan(resume_text):
+    """Count every section heading, contact field and formatting marker in one pass"""
+    counts = dict.fromkeys(_GROUPS[1:], 0)
+    for match in _SCAN.finditer(resume_text):
+        name = _GROUPS[match.lastindex]
+        if name == "phone" and sum(ch.isdigit() for ch in match.group()) < 10:
+            # Date ranges and IDs look like phone numbers but have fewer digits
+            continue
+        counts[name] += 1
+    return counts
+
+def _length_points(words):
+    if 350 <= words <= 1100:
+        return 5
+    if 200 <= words <= 1600:
+        return 3
+    return 1 if words >= 50 else 0
+
+def _build_profile(resume_text):
+    """Compute the role-independent part of the ATS analysis"""
+    counts = _scan(resume_text)
+    lines = [line for line in resume_text.splitlines() if line.strip()]
+    long_lines = sum(1 for line in lines if len(line) > LONG_LINE_CHARS)
+
+    skill_index = get_job_catalog().skill_index
+    tokens = skill_index.tokenize(resume_text)
+    words = len(tokens)
+    skill_counts = skill_index.count_tokens(tokens)
+
+    sections = {name: counts[name] > 0 for name in SECTION_WEIGHTS}
+    contact = {
+        "email": counts["email"] > 0,
+        "phone": counts["phone"] > 0,
+        "linkedin": counts["linkedin"] > 0,
+        "github": counts["github"] > 0,
+        "website": counts["url"] > 0,
+    }
+    formatting = {
+        "lines": len(lines),
+        "bullets": counts["bullet"],
+        "quantified_results": counts["metric"],
+        "long_lines": long_lines,
+        "unusual_characters": counts["glyph"],
+    }
+
+    breakdown = {
+        "sections": sum(weight for name, weight in SECTION_WEIGHTS.items() if sections[name]),
+        "contact": (
+            (6 if contact["email"] else 0)
+            + (5 if contact["phone"] else 0)
+            + (4 if contact["linkedin"] or contact["github"] or contact["website"] else 0)
+        ),
+        "formatting": (
+            (5 if formatting["bullets"] >= 3 else 2 if formatting["bullets"] else 0)
+            + (4 if formatting["quantified_results"] >= 2 else 2 if formatting["quantified_results"] else 0)
+            + (3 if long_lines <= max(1, len(lines) // 10) else 0)
+            + (3 if not formatting["unusual_characters"] else 0)
+        ),
+        "length": _length_points(words),
+    }
+
+    issues = []
+    for name in ("experience", "education", "skills", "summary"):
+        if not sections[name]:
+            issues.append(f"Add a clear '{name.title()}' section heading")
+    if not contact["email"]:
+        issues.append("Add an email address")
+    if not contact["phone"]:
+        issues.append("Add a phone number")
+    if not (contact["linkedin"] or contact["github"] or contact["website"]):
+        issues.append("Add a LinkedIn, GitHub or portfolio link")
+    if formatting["bullets"] < 3:
+        issues.append("Use bullet points to list responsibilities and achievements")
+    if formatting["quantified_results"] < 2:
+        issues.append("Quantify achievements with numbers (%, $, counts)")
+    if long_lines > max(1, len(lines) // 10):
+        issues.append("Avoid multi-column layouts and tables; many lines run together")
+    if formatting["unusual_characters"]:
+        issues.append("Remove icons, symbols or table borders that ATS parsers cannot read")
+    if words < 350:
+        issues.append(f"Resume is short ({words} words); aim for 350-1100")
+    elif words > 1100:
+        issues.append(f"Resume is long ({words} words); aim for 350-1100")
+
+    return {
+        "sections": sections,
+        "contact": contact,
+        "formatting": formatting,
+        "words": words,
+        "skill_counts": dict(skill_counts),
+        "breakdown": breakdown,
+        "base_score": sum(breakdown.values()),
+        "issues": issues,
+    }
+
+def ats_profile(resume_text):
+    """
+    Return the role-independent ATS profile of a resume, memoized per resume hash
+
+    Returns:
+        dict: sections, contact, formatting, words, skill_counts, breakdown,
+        base_score (out of 65) and issues
+    """
+    catalog = get_job_catalog()
+    cache = get_analysis_cache()
+    key = None
+    if cache is not None:
+        digest = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+        key = f"{digest}-{catalog.fingerprint}-v{ATS_VERSION}.ats"
+        profile = cache.get(key)
+        if profile is not None:
+            return profile
+
+    with timer("ats.profile"):
+        profile = _build_profile(resume_text)
+    increment("ats.profiles")
+
+    if key is not None:
+        cache.put(key, profile)
+    return profile
+
+def score_role(profile, target_role):
+    """
+    Score a precomputed profile against one role
+
+    Returns:
+        dict: score (0-100), keyword_coverage (%), keyword_density (skill
+        mentions per 100 words), matched_keywords and missing_keywords, or
+        None if the role has no skill data
+    """
+    skill_index = get_job_catalog().skill_index
+    role_skills = skill_index.role_skills.get(target_role)
+    if not role_skills:
+        return None
+
+    skill_counts = profile["skill_counts"]
+    matched, missing = skill_index.split_skills(target_role, skill_counts.keys())
+    mentions = sum(skill_counts.get(key, 0) for key in {key for _, key in role_skills if key})
+    coverage = len(matched) / len(role_skills)
+
+    return {
+        "score": int(round(profile["base_score"] + 35 * coverage)),
+        "keyword_coverage": round(coverage * 100, 2),
+        "keyword_density": round(mentions / profile["words"] * 100, 2) if profile["words"] else 0.0,
+        "matched_keywords": matched,
+        "missing_keywords": missing,
+    }
+
+def analyze_ats(resume_text, target_roles=()):
+    """
+    Full ATS analysis of a resume, optionally scored against target roles
+
+    Args:
+        resume_text (str): Extracted resume text
+        target_roles (iterable): Roles to compute keyword scores for
+
+    Returns:
+        dict: The ats_profile fields plus {"roles": {role: score_role result}}
+    """
+    profile = ats_profile(resume_text)
+    roles = {}
+    for role in target_roles:
+        result = score_role(profile, role)
+        if result is not None:
+            roles[role] = result
+    return dict(profile, roles=roles)
+
+def ats_scores(resume_text, target_roles):
+    """Return {role: ATS score (0-100)} for each role with skill data"""
+    profile = ats_profile(resume_text)
+    scores = {}
+    for role in target_roles:
+        result = score_role(profile, role)
+        if result is not None:
+            scores[role] = result["score"]
+    return scores
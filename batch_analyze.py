@@ -0,0 +1,206 @@
+"""
+Command-Line Batch Resume Analyzer
+
+Walks directories, files or glob patterns of PDF resumes, extracts and scores
+them in parallel and appends one JSON record per resume to a JSONL file:
+
+    {"path": ..., "status": "ok", "characters": ..., "top_roles": [...],
+     "skill_gaps": {role: {"match_percentage", "present_skills", "missing_skills"}},
+     "ats": {"base_score", "issues", "scores": {role: score}}}
+
+Resumes already recorded successfully in the output file are skipped, so an
+interrupted run picks up where it stopped when started again with the same
+arguments. Resumes recorded with "status": "error" are retried, and the
+newest record for a path is the one that counts.
+With --store (or RESUME_AI_STORE) every resume is also added to the SQLite
+resume store for recruiter search (see resume_store.py).
+
+Usage:
+    python batch_analyze.py resumes/ "inbox/**/*.pdf" -o results.jsonl --workers 8
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+from resume_ai import analyze_resumes, suggest_improvements_all, SCORING_MODES, DEFAULT_SCORING
+from ats_analyzer import ats_profile, score_role
+from resume_store import get_resume_store, set_resume_store
+
+def find_pdfs(inputs):
+    """Expand directories, files and glob patterns into a sorted list of PDF paths"""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.update(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+        elif os.path.isfile(item):
+            paths.add(item)
+        else:
+            paths.update(path for path in glob.glob(item, recursive=True) if os.path.isfile(path))
+    return sorted(os.path.abspath(path) for path in paths)
+
+def load_completed(output_path):
+    """Return the set of resume paths already analyzed successfully in a JSONL output file"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                path = record["path"]
+            except (ValueError, KeyError, TypeError):
+                # Partial line from an interrupted run
+                continue
+            if record.get("status") == "ok":
+                completed.add(path)
+    return completed
+
+def _ends_with_newline(path):
+    """Return True if the file is empty or its last byte is a newline"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def build_record(path, resume_text, job_matches, gap_roles):
+    """Build the JSONL record for one analyzed resume"""
+    if not resume_text or resume_text.startswith("ERROR"):
+        return {"path": path, "status": "error", "error": resume_text or "ERROR: No text found in PDF"}
+
+    gaps = suggest_improvements_all(resume_text)
+    skill_gaps = {}
+    for job in job_matches[:gap_roles]:
+        gap = gaps.get(job["job"])
+        if gap is not None:
+            skill_gaps[job["job"]] = {
+                "match_percentage": gap["match_percentage"],
+                "present_skills": gap["present_skills"],
+                "missing_skills": gap["missing_skills"],
+            }
+
+    profile = ats_profile(resume_text)
+    ats_scores = {}
+    for job in job_matches[:gap_roles]:
+        result = score_role(profile, job["job"])
+        if result is not None:
+            ats_scores[job["job"]] = result["score"]
+
+    return {
+        "path": path,
+        "status": "ok",
+        "characters": len(resume_text),
+        "top_roles": job_matches,
+        "skill_gaps": skill_gaps,
+        "ats": {"base_score": profile["base_score"], "issues": profile["issues"], "scores": ats_scores},
+    }
+
+def run(inputs, output_path, workers=None, top_k=5, gap_roles=3, batch_size=64,
+        max_pages=None, max_chars=None, restart=False, scoring=None, update_corpus=False, store_path=None):
+    """
+    Analyze every resume under `inputs` and append the results to `output_path`
+
+    Returns:
+        dict: Throughput summary for the run
+    """
+    started = time.perf_counter()
+    paths = find_pdfs(inputs)
+
+    if restart and os.path.exists(output_path):
+        os.remove(output_path)
+    completed = load_completed(output_path)
+    pending = [path for path in paths if path not in completed]
+
+    store = set_resume_store(store_path, scoring) if store_path else get_resume_store()
+
+    processed = errors = characters = 0
+    print(f"Found {len(paths)} resumes, {len(paths) - len(pending)} already done, {len(pending)} to process",
+          file=sys.stderr)
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        # Terminate a partial last line left by an interrupted run
+        if not _ends_with_newline(output_path):
+            out.write("\n")
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            results = analyze_resumes(batch, top_k=top_k, workers=workers, max_pages=max_pages, max_chars=max_chars,
+                                      scoring=scoring, update_corpus=update_corpus)
+
+            for path, (resume_text, job_matches) in zip(batch, results):
+                record = build_record(path, resume_text, job_matches, gap_roles)
+                if store is not None and record["status"] == "ok":
+                    store.add_resume(resume_text, name=os.path.basename(path), source=path)
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                processed += 1
+                if record["status"] == "error":
+                    errors += 1
+                else:
+                    characters += record["characters"]
+
+            # Make progress durable before starting the next batch
+            out.flush()
+            os.fsync(out.fileno())
+
+            elapsed = time.perf_counter() - started
+            print(f"Processed {processed}/{len(pending)} resumes ({processed / elapsed:.1f}/s)", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "found": len(paths),
+        "skipped": len(paths) - len(pending),
+        "processed": processed,
+        "errors": errors,
+        "characters": characters,
+        "seconds": round(elapsed, 3),
+        "resumes_per_second": round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze directories of PDF resumes into a JSONL file")
+    parser.add_argument("inputs", nargs="+", help="Directories, PDF files or glob patterns")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL output file (default: results.jsonl)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Extraction worker processes")
+    parser.add_argument("-k", "--top-k", type=int, default=5, help="Top roles recorded per resume")
+    parser.add_argument("--gaps", type=int, default=3, help="Top roles to include skill gaps and ATS scores for")
+    parser.add_argument("--batch-size", type=int, default=64, help="Resumes scored per batch")
+    parser.add_argument("--max-pages", type=int, default=20, help="Pages extracted per resume at most")
+    parser.add_argument("--max-chars", type=int, default=100_000, help="Characters kept per resume at most")
+    parser.add_argument("--restart", action="store_true", help="Discard existing output instead of resuming")
+    parser.add_argument("--scoring", choices=SCORING_MODES, default=DEFAULT_SCORING, help="Role scoring engine")
+    parser.add_argument("--update-corpus", action="store_true",
+                        help="Add each batch to the TF-IDF/BM25 document frequencies before scoring it")
+    parser.add_argument("--store", help="Also add every resume to this SQLite resume store")
+    args = parser.parse_args(argv)
+
+    summary = run(
+        args.inputs,
+        args.output,
+        workers=args.workers,
+        top_k=args.top_k,
+        gap_roles=args.gaps,
+        batch_size=max(1, args.batch_size),
+        max_pages=args.max_pages,
+        max_chars=args.max_chars,
+        restart=args.restart,
+        scoring=args.scoring,
+        update_corpus=args.update_corpus,
+        store_path=args.store,
+    )
+
+    print(
+        f"✅ Processed {summary['processed']} resumes ({summary['errors']} errors, {summary['skipped']} skipped) "
+        f"in {summary['seconds']}s — {summary['resumes_per_second']} resumes/s",
+        file=sys.stderr
+    )
+    print(json.dumps(summary))
+    return 1 if summary["errors"] and summary["errors"] == summary["processed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Benchmark Suite for Extraction, Matching, Gap Analysis and Report Generation
+
+Generates synthetic resumes, resume PDFs and job catalogs of increasing size
+locally (no network or sample data needed), times each pipeline stage and
+writes the results as JSON so runs can be compared across commits.
+
+Usage:
+    python benchmark.py --output bench.json
+    python benchmark.py --sizes 10,1000,50000 --resumes 200 --output new.json --compare bench.json
+
+Every stage reports latency percentiles (p50/p90/p99), throughput and the
+peak Python heap allocated while it runs (tracemalloc, measured in a separate
+pass so it does not distort the timings).
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from datetime import datetime, timezone
+
+from resume_ai import (
+    configure_cache, set_catalog_path, extract_text_from_pdf, analyze_resume, suggest_improvements,
+    suggest_improvements_all
+)
+from pdf_generator import generate_enhanced_resume
+from compiled_catalog import write_compiled_catalog
+
+SEED = 1234
+DEFAULT_SIZES = [10, 100, 1000, 10000, 50000]
+
+BASE_SKILLS = [
+    "python", "java", "javascript", "typescript", "sql", "git", "docker", "kubernetes", "aws", "azure",
+    "gcp", "react", "angular", "vue", "node.js", "django", "flask", "spring boot", "rest api", "graphql",
+    "machine learning", "deep learning", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch",
+    "tableau", "statistics", "spark", "hadoop", "linux", "bash", "terraform", "ansible", "jenkins",
+    "ci/cd", "mongodb", "postgresql", "mysql", "redis", "kafka", "microservices", "agile", "scrum",
+    "html", "css", "sass", "redux", "next.js", "swift", "kotlin", "flutter", "react native", "c++", "go"
+]
+
+FILLER = (
+    "led built designed delivered improved reduced increased managed developed implemented "
+    "team project customers platform service pipeline latency revenue stakeholders product "
+    "architecture quality reliability performance launch migration analysis reporting"
+).split()
+
+def make_skill_vocabulary(size, rng):
+    """Return BASE_SKILLS plus synthetic multi-word skills up to `size` entries"""
+    skills = list(BASE_SKILLS)
+    while len(skills) < size:
+        words = rng.sample(FILLER, rng.choice((1, 2)))
+        skills.append(" ".join(words) + f" {len(skills)}")
+    return skills
+
+def make_catalog(n_roles, rng, skills_per_role=16):
+    """Return a synthetic JOB_DATA dict with n_roles roles"""
+    vocabulary = make_skill_vocabulary(max(200, n_roles // 5), rng)
+    return {
+        f"Role {i:06d}": rng.sample(vocabulary, skills_per_role)
+        for i in range(n_roles)
+    }
+
+def make_resume_text(rng, n_words=450):
+    """Return a synthetic resume mixing real skills with filler text"""
+    lines = [
+        "Alex Candidate",
+        "alex@example.com | +1 555 010 0000",
+        "SUMMARY",
+    ]
+    for section in ("EXPERIENCE", "PROJECTS", "EDUCATION", "SKILLS"):
+        lines.append(section)
+        for _ in range(n_words // 40):
+            words = rng.sample(FILLER, 6) + rng.sample(BASE_SKILLS, 2)
+            rng.shuffle(words)
+            lines.append("- " + " ".join(words).capitalize() + ".")
+    return "\n".join(lines)
+
+def make_resume_pdf(text, pages=2):
+    """Render resume text onto a PDF with PyMuPDF and return the bytes"""
+    import fitz
+
+    doc = fitz.open()
+    lines = text.splitlines()
+    per_page = max(1, -(-len(lines) // pages))
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 560, 790), "\n".join(lines[start:start + per_page]), fontsize=9)
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def measure(func, inputs, memory_sample=10):
+    """
+    Time func over every input, then measure peak heap on a small sample
+
+    Returns:
+        dict: Count, latency percentiles (ms), throughput and peak memory
+    """
+    latencies = []
+    started = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+
+    tracemalloc.start()
+    for item in inputs[:memory_sample]:
+        func(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(total / max(1, len(latencies)) * 1000, 3),
+        "throughput_per_s": round(len(latencies) / total, 2) if total > 0 else 0.0,
+        "peak_memory_mb": round(peak / (1024 * 1024), 3),
+    }
+
+def git_commit():
+    """Return the current git commit hash, or None outside a checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(sizes=DEFAULT_SIZES, n_resumes=50, n_pdfs=20, n_reports=20, compiled=False):
+    """Run every stage and return the results dict"""
+    rng = random.Random(SEED)
+    configure_cache(0)
+
+    resumes = [make_resume_text(rng) for _ in range(n_resumes)]
+    pdfs = [make_resume_pdf(text, pages=1 + i % 3) for i, text in enumerate(resumes[:n_pdfs])]
+
+    stages = {
+        "extract_text_from_pdf": measure(extract_text_from_pdf, pdfs),
+        "generate_enhanced_resume": measure(
+            lambda text: generate_enhanced_resume(text, BASE_SKILLS[:8], BASE_SKILLS[8:16], "Role", "Alex", use_cache=False),
+            resumes[:n_reports]
+        ),
+    }
+    print(f"extraction p50 {stages['extract_text_from_pdf']['p50_ms']} ms, "
+          f"report p50 {stages['generate_enhanced_resume']['p50_ms']} ms", file=sys.stderr)
+
+    catalogs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            job_data = make_catalog(size, random.Random(SEED + size))
+            path = os.path.join(tmp, f"catalog_{size}.{'catalog' if compiled else 'json'}")
+            if compiled:
+                write_compiled_catalog(job_data, path)
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(job_data, f)
+
+            # Route the module-level API through this catalog
+            t0 = time.perf_counter()
+            catalog = set_catalog_path(path, reload_interval=float("inf"))
+            catalog.data
+            load_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            matcher = catalog.matcher
+            matcher_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            catalog.skill_index
+            index_s = time.perf_counter() - t0
+
+            first_role = next(iter(job_data))
+
+            results = {
+                "load_s": round(load_s, 4),
+                "build_matcher_s": round(matcher_s, 4),
+                "build_skill_index_s": round(index_s, 4),
+                "suggest_improvements": measure(lambda text: suggest_improvements(text, first_role), resumes),
+                "suggest_improvements_all": measure(suggest_improvements_all, resumes),
+                # End to end per resume: extraction plus scoring against every role (cache disabled)
+                "analyze_resume": measure(analyze_resume, pdfs),
+            }
+            if matcher is not None:
+                results["match"] = measure(matcher.match, resumes)
+                results["match_many"] = measure(lambda batch: matcher.match_many(batch, top_k=5), [resumes])
+                results["top_k"] = measure(lambda text: matcher.top_k(text, 5), resumes)
+                for scoring in ("tfidf", "bm25"):
+                    results[f"match_{scoring}"] = measure(lambda text: matcher.match(text, scoring), resumes)
+
+            catalogs[str(size)] = results
+            print(f"{size} roles: match p50 {results.get('match', {}).get('p50_ms')} ms, "
+                  f"analyze p50 {results['analyze_resume']['p50_ms']} ms, "
+                  f"gap-all p50 {results['suggest_improvements_all']['p50_ms']} ms", file=sys.stderr)
+
+    set_catalog_path(None)
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "sizes": list(sizes), "resumes": n_resumes, "pdfs": n_pdfs,
+            "reports": n_reports, "compiled_catalog": compiled, "seed": SEED
+        },
+        "stages": stages,
+        "catalogs": catalogs,
+    }
+
+def compare(current, baseline):
+    """Print p50 changes of every stage against a baseline results file"""
+    def rows(results):
+        for stage, stats in results["stages"].items():
+            yield stage, stats
+        for size, stats in results["catalogs"].items():
+            for stage, value in stats.items():
+                if isinstance(value, dict):
+                    yield f"{stage}@{size}", value
+
+    before = dict(rows(baseline))
+    print(f"{'stage':40} {'base p50':>10} {'new p50':>10} {'change':>8}")
+    for stage, stats in rows(current):
+        if stage not in before:
+            continue
+        old, new = before[stage]["p50_ms"], stats["p50_ms"]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{stage:40} {old:10.3f} {new:10.3f} {change:>8}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated catalog sizes")
+    parser.add_argument("--resumes", type=int, default=50, help="Synthetic resumes per matching stage")
+    parser.add_argument("--pdfs", type=int, default=20, help="Synthetic PDFs for the extraction stage")
+    parser.add_argument("--reports", type=int, default=20, help="Reports for the report stage")
+    parser.add_argument("--compiled", action="store_true", help="Load catalogs from the compiled binary format")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = run_benchmarks(sizes, args.resumes, min(args.pdfs, args.resumes), min(args.reports, args.resumes),
+                             args.compiled)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
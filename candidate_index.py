@@ -0,0 +1,419 @@
+"""
+Reverse Matching: Rank Stored Candidates for a Role or Job Description
+
+Resume matching in resume_ai goes from one resume to every role. This
+module goes the other way: given a catalog role or a pasted job
+description, it returns the best candidates from the resume store.
+
+The stored resumes are compiled into one sparse candidate x term matrix:
+tokens are alias-normalized like everywhere else, hashed into a fixed
+feature space (HashingVectorizer, so no vocabulary has to be kept in
+memory), weighted by sublinear TF x smoothed IDF and L2-normalized per
+candidate. The matrix is saved in CSC layout as plain .npy arrays and
+memory-mapped on load, so opening an index of 100k resumes costs almost
+nothing and only the columns of the query's terms are ever paged in.
+Scoring a query gathers those columns and sums them with one bincount,
+which gives the cosine similarity of every candidate at once.
+
+Usage:
+    rank_candidates(role="Data Scientist", k=20)
+    rank_candidates(job_description=pasted_text, k=50)
+
+    python candidate_index.py --store resumes.db --role "Data Scientist" -k 20
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+import threading
+
+from resume_ai import get_job_catalog, HAS_SKLEARN
+from resume_store import get_resume_store, ResumeStore
+from instrumentation import timer, increment
+
+if HAS_SKLEARN:
+    import numpy as np
+    from scipy import sparse
+    from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+    from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout or weighting changes so old indexes are rebuilt
+INDEX_VERSION = 1
+
+# Hashed feature space; collisions are negligible at resume vocabulary sizes
+DEFAULT_N_FEATURES = 2 ** 20
+
+# Arrays making up an index directory, next to meta.json
+_ARRAYS = ("data", "indices", "indptr", "ids", "idf")
+
+# Resumes added or removed since the last build that are tolerated before a
+# rebuild: at least this many, or this share of the index
+REBUILD_MIN_CHANGES = 1000
+REBUILD_FRACTION = 0.05
+
+# Small indexes are rebuilt sooner: once the changes exceed this share of the
+# resumes indexed at build time, the built IDF no longer describes the pool
+REBUILD_GROWTH = 0.25
+
+def _make_vectorizer(normalizer, n_features):
+    """HashingVectorizer producing raw counts of alias-normalized matcher tokens"""
+    analyzer = CountVectorizer().build_analyzer()
+    if normalizer:
+        analyzer = normalizer.for_tokenizer(analyzer)
+    return HashingVectorizer(analyzer=analyzer, n_features=n_features, alternate_sign=False, norm=None)
+
+class CandidateIndex:
+    """
+    Memory-mapped, L2-normalized candidate x term matrix (CSC)
+
+    Resumes stored after the build are kept in a small in-memory delta
+    (see add_documents), weighted with the built IDF, until the next rebuild.
+
+    Attributes:
+        ids: Resume store id of each candidate row
+        meta (dict): Build parameters and the store state it was built from
+    """
+
+    def __init__(self, data, indices, indptr, ids, idf, meta, normalizer=None):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.ids = ids
+        self.idf = idf
+        self.meta = meta
+        self.vectorizer = _make_vectorizer(normalizer, meta["n_features"])
+        # (delta rows, their resume ids), replaced as one tuple so readers
+        # never see rows and ids of different lengths
+        self._delta = (None, ())
+        self.max_id = max((meta.get("store_state") or (0, 0))[1], int(ids[-1]) if len(ids) else 0)
+
+    @classmethod
+    def build(cls, documents, directory, normalizer=None, n_features=DEFAULT_N_FEATURES, batch_size=5000,
+              store_state=None):
+        """
+        Compile (id, text) pairs into an index directory and return the loaded index
+
+        Args:
+            documents (iterable): (resume id, resume text) pairs
+            directory (str): Where the .npy arrays and meta.json are written
+            normalizer (SkillNormalizer): Alias table applied to the tokens
+            n_features (int): Size of the hashed feature space
+            batch_size (int): Resumes hashed at a time
+            store_state (tuple): ResumeStore.state() the documents came from
+        """
+        vectorizer = _make_vectorizer(normalizer, n_features)
+        ids, blocks, batch = [], [], []
+
+        def flush():
+            blocks.append(vectorizer.transform([text for _, text in batch]).astype(np.float32))
+            ids.extend(resume_id for resume_id, _ in batch)
+            batch.clear()
+
+        with timer("candidates.build"):
+            for item in documents:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+
+            matrix = sparse.vstack(blocks, format="csr") if blocks else sparse.csr_matrix((0, n_features), dtype=np.float32)
+            n_candidates = matrix.shape[0]
+            doc_freq = np.bincount(matrix.indices, minlength=n_features)
+            idf = (np.log((1.0 + n_candidates) / (1.0 + doc_freq)) + 1.0).astype(np.float32)
+
+            # Sublinear TF damps keyword stuffing; rows are unit length so scores are cosines
+            np.log(matrix.data, out=matrix.data)
+            matrix.data += 1.0
+            matrix.data *= idf[matrix.indices]
+            if n_candidates:
+                matrix = normalize(matrix, norm="l2", copy=False)
+            matrix = matrix.tocsc()
+
+            os.makedirs(directory, exist_ok=True)
+            arrays = {
+                "data": matrix.data.astype(np.float32),
+                "indices": matrix.indices.astype(np.int32),
+                "indptr": matrix.indptr.astype(np.int64),
+                "ids": np.asarray(ids, dtype=np.int64),
+                "idf": idf,
+            }
+            for name, array in arrays.items():
+                tmp_path = os.path.join(directory, f"{name}.tmp.npy")
+                np.save(tmp_path, array)
+                os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+
+            meta = {
+                "version": INDEX_VERSION,
+                "n_features": n_features,
+                "candidates": n_candidates,
+                "nnz": int(matrix.nnz),
+                "alias_fingerprint": normalizer.fingerprint if normalizer else "",
+                "store_state": list(store_state) if store_state is not None else None,
+            }
+            # meta.json is written last, so a directory with it holds a complete index
+            tmp_path = os.path.join(directory, "meta.json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+        logger.info("Built candidate index of %d resumes (%d nonzeros)", n_candidates, matrix.nnz)
+        return cls.load(directory, normalizer)
+
+    @classmethod
+    def load(cls, directory, normalizer=None):
+        """Memory-map an index directory; returns None if there is no complete index in it"""
+        try:
+            with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+        except (OSError, ValueError) as e:
+            logger.debug("No candidate index in %s: %s", directory, e)
+            return None
+        if meta.get("version") != INDEX_VERSION:
+            return None
+        return cls(meta=meta, normalizer=normalizer, **arrays)
+
+    @property
+    def pending_ids(self):
+        """Resume ids in the delta, in insertion order"""
+        return self._delta[1]
+
+    def __len__(self):
+        return len(self.ids) + len(self.pending_ids)
+
+    def _weight(self, counts):
+        """Apply sublinear TF x IDF and L2 normalization to raw count rows in place"""
+        counts.data = (1.0 + np.log(counts.data)) * self.idf[counts.indices]
+        return normalize(counts, norm="l2", copy=False)
+
+    def add_documents(self, documents):
+        """
+        Add (id, text) pairs stored after the build to the in-memory delta
+
+        Calls must be serialized (get_candidate_index holds a lock); searches
+        may run concurrently.
+        """
+        documents = list(documents)
+        if not documents:
+            return
+        rows = self._weight(self.vectorizer.transform([text for _, text in documents]).astype(np.float64))
+        pending, pending_ids = self._delta
+        if pending is not None:
+            rows = sparse.vstack([pending, rows], format="csr")
+        self._delta = (rows, pending_ids + tuple(resume_id for resume_id, _ in documents))
+        self.max_id = max(self.max_id, max(resume_id for resume_id, _ in documents))
+
+    def needs_rebuild(self, store_state, normalizer=None):
+        """
+        Return True if the index no longer fits the store
+
+        That is when the alias table changed, ids went backwards (a new
+        database), or too many resumes were added or removed since the build:
+        any change to an index built empty, more than REBUILD_GROWTH of the
+        resumes it was built from, or more than the larger of
+        REBUILD_MIN_CHANGES and REBUILD_FRACTION of them.
+        """
+        meta = self.meta
+        if meta["alias_fingerprint"] != (normalizer.fingerprint if normalizer else "") or not meta["store_state"]:
+            return True
+        count, max_id = store_state
+        if max_id < self.max_id:
+            return True
+        built = len(self.ids)
+        changes = len(self.pending_ids) + max(0, built + len(self.pending_ids) - count)
+        if changes > built * REBUILD_GROWTH:
+            return True
+        return changes > max(REBUILD_MIN_CHANGES, built * REBUILD_FRACTION)
+
+    def query_vector(self, text):
+        """Return (hashed term ids, weights) of a query, weighted and normalized like the candidates"""
+        vector = self._weight(self.vectorizer.transform([text]).astype(np.float64))
+        return vector.indices, vector.data
+
+    def scores(self, text):
+        """Return the cosine similarity (0-1) of every candidate (built rows, then the delta) to a query text"""
+        return self._scores(text, self._delta[0])
+
+    def _scores(self, text, pending):
+        terms, weights = self.query_vector(text)
+        indptr, indices, data = self.indptr, self.indices, self.data
+        rows, values = [], []
+        with timer("candidates.score"):
+            # Only the query's columns are read from the memory map
+            for term, weight in zip(terms, weights):
+                start, stop = indptr[term], indptr[term + 1]
+                if start != stop:
+                    rows.append(indices[start:stop])
+                    values.append(data[start:stop] * weight)
+            if rows:
+                scores = np.bincount(np.concatenate(rows), weights=np.concatenate(values), minlength=len(self.ids))
+            else:
+                scores = np.zeros(len(self.ids))
+            if pending is not None:
+                scores = np.concatenate([scores, pending[:, terms] @ weights])
+            return scores
+
+    def top_k(self, text, k=50):
+        """
+        Return the k best candidates for a query as (resume id, similarity) pairs
+
+        Candidates with no term in common with the query are left out; ties
+        keep index (insertion) order.
+        """
+        pending, pending_ids = self._delta
+        scores = self._scores(text, pending)
+        candidates = np.flatnonzero(scores > 0)
+        if k < len(candidates):
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        order = np.lexsort((candidates, -scores[candidates]))
+        built = len(self.ids)
+        return [
+            (int(self.ids[i]) if i < built else pending_ids[i - built], float(scores[i]))
+            for i in candidates[order]
+        ]
+
+def role_description(role):
+    """Return the text a catalog role is queried with, or None for unknown roles"""
+    skills = get_job_catalog().data.get(role)
+    if not skills:
+        return None
+    return " ".join(skills).lower()
+
+def default_index_directory(store):
+    """Directory an index of `store` is kept in (RESUME_AI_CANDIDATE_INDEX, else next to the database)"""
+    directory = os.environ.get("RESUME_AI_CANDIDATE_INDEX")
+    if directory:
+        return directory
+    if store.path == ":memory:":
+        return None
+    return f"{store.path}.candidates"
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_candidate_index(store=None, directory=None, rebuild=False):
+    """
+    Return a CandidateIndex current with the store, building or rebuilding it when needed
+
+    The index stays open between calls. Resumes stored since the build are
+    added to its in-memory delta; it is rebuilt once many resumes were
+    added or removed (see CandidateIndex.needs_rebuild) or the alias table changed.
+
+    Args:
+        store (ResumeStore): Resume store (the shared one if omitted)
+        directory (str): Index directory (see default_index_directory)
+        rebuild (bool): Rebuild even if the index looks current
+
+    Returns:
+        CandidateIndex, or None without scikit-learn or a resume store
+    """
+    if not HAS_SKLEARN:
+        return None
+    if store is None:
+        store = get_resume_store()
+    if store is None:
+        return None
+    directory = directory or default_index_directory(store)
+    if directory is None:
+        raise ValueError("An index directory is required for in-memory resume stores")
+
+    normalizer = get_job_catalog().normalizer
+    state = store.state()
+    with _indexes_lock:
+        index = _indexes.get(directory)
+        if index is None and not rebuild:
+            index = CandidateIndex.load(directory, normalizer)
+        if index is not None and not rebuild and state[1] > index.max_id:
+            index.add_documents(store.iter_texts(after_id=index.max_id))
+        if rebuild or index is None or index.needs_rebuild(state, normalizer):
+            index = CandidateIndex.build(store.iter_texts(), directory, normalizer, store_state=state)
+            increment("candidates.builds")
+        _indexes[directory] = index
+    return index
+
+def rank_candidates(role=None, job_description=None, k=50, store=None, directory=None):
+    """
+    Rank stored resumes against a catalog role and/or a job description
+
+    Args:
+        role (str): Job role from the catalog
+        job_description (str): Free-text job description (combined with the role if both are given)
+        k (int): Candidates returned at most
+        store (ResumeStore): Resume store (the shared one if omitted)
+        directory (str): Candidate index directory (see default_index_directory)
+
+    Returns:
+        list: Dicts with id, name, source, ats_score and similarity (%), best first
+    """
+    if not role and not job_description:
+        raise ValueError("Provide a role or a job description")
+    query = []
+    if role:
+        description = role_description(role)
+        if description is None:
+            raise ValueError(f"No skill data available for role: {role}")
+        query.append(description)
+    if job_description:
+        query.append(job_description)
+
+    if store is None:
+        store = get_resume_store()
+    index = get_candidate_index(store, directory)
+    if index is None or k <= 0:
+        return []
+
+    # Removed resumes stay in the index until the next rebuild and are dropped below
+    removed = max(0, len(index) - len(store))
+    with timer("candidates.rank"):
+        ranked = index.top_k("\n".join(query), k + removed)
+    stored = store.describe(resume_id for resume_id, _ in ranked)
+    return [
+        dict(stored[resume_id], similarity=round(score * 100, 2))
+        for resume_id, score in ranked
+        if resume_id in stored
+    ][:k]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank stored resumes for a role or job description")
+    parser.add_argument("--store", default=os.environ.get("RESUME_AI_STORE"), help="Resume store database")
+    parser.add_argument("--index", help="Candidate index directory (default: next to the store)")
+    parser.add_argument("--role", help="Job role from the catalog")
+    parser.add_argument("--job-description", help="File with a job description ('-' for stdin)")
+    parser.add_argument("-k", "--top-k", type=int, default=20, help="Candidates to return")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index even if it is current")
+    args = parser.parse_args(argv)
+
+    if not args.store:
+        parser.error("--store (or RESUME_AI_STORE) is required")
+    if not HAS_SKLEARN:
+        print("ERROR: scikit-learn not installed. Install with: pip install scikit-learn", file=sys.stderr)
+        return 1
+
+    store = ResumeStore(args.store)
+    index = get_candidate_index(store, args.index, rebuild=args.rebuild)
+    print(f"Candidate index: {len(index)} resumes", file=sys.stderr)
+    if not args.role and not args.job_description:
+        return 0
+
+    job_description = None
+    if args.job_description:
+        if args.job_description == "-":
+            job_description = sys.stdin.read()
+        else:
+            with open(args.job_description, "r", encoding="utf-8") as f:
+                job_description = f.read()
+
+    try:
+        candidates = rank_candidates(args.role, job_description, args.top_k, store, args.index)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(candidates, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Compact Binary Job Catalog Format
+
+A compiled catalog stores the same role -> skills data as data/job_roles.json
+in a single memory-mappable file:
+
+    header          magic, counts and section offsets
+    role names      uint32 offsets + UTF-8 blob, in catalog order
+    role order      uint32 role ids sorted by name, for binary-search lookups
+    role skills     uint32 offsets into the skill id array (CSR layout)
+    skill ids       uint32 interned skill ids
+    skill names     uint32 offsets + UTF-8 blob (the shared skill vocabulary)
+
+Nothing is decoded on load; strings are materialized only when a role is
+accessed, and every process that maps the file shares the same pages.
+
+Usage:
+    python compiled_catalog.py data/job_roles.json data/job_roles.catalog
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+import logging
+from array import array
+from collections.abc import ItemsView, Mapping
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SRCATv1\x00"
+
+# magic, role count, skill count, skill id count, then seven section offsets
+_HEADER = struct.Struct("<8s3I4x7Q")
+
+# Array typecode with a 4-byte item size on this platform
+_U32 = "I" if array("I").itemsize == 4 else "L"
+
+CATALOG_SUFFIX = ".catalog"
+
+def is_compiled_catalog(buffer):
+    """Return True if the buffer starts with the compiled catalog magic"""
+    return bytes(buffer[:len(MAGIC)]) == MAGIC
+
+def _pack_strings(strings):
+    """Encode strings into (offsets array, UTF-8 blob)"""
+    offsets = array(_U32, [0])
+    blob = bytearray()
+    for string in strings:
+        blob += string.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+def _le_bytes(values):
+    """Return a uint32 array as little-endian bytes"""
+    if sys.byteorder == "big":
+        values = array(_U32, values)
+        values.byteswap()
+    return values.tobytes()
+
+def write_compiled_catalog(job_data, output_path):
+    """
+    Write job data in the compiled catalog format
+
+    Args:
+        job_data (dict): Mapping of role -> list of skill strings
+        output_path (str): Destination file
+
+    Returns:
+        dict: Role, distinct skill and skill reference counts
+    """
+    roles = list(job_data.keys())
+
+    # Intern skills into a sorted vocabulary shared by all roles
+    vocabulary = sorted({skill for skills in job_data.values() for skill in skills})
+    skill_id = {skill: i for i, skill in enumerate(vocabulary)}
+
+    role_skill_offsets = array(_U32, [0])
+    skill_ids = array(_U32)
+    for role in roles:
+        skill_ids.extend(skill_id[skill] for skill in job_data[role])
+        role_skill_offsets.append(len(skill_ids))
+
+    role_order = array(_U32, sorted(range(len(roles)), key=lambda i: roles[i].encode("utf-8")))
+    role_name_offsets, role_names = _pack_strings(roles)
+    skill_name_offsets, skill_names = _pack_strings(vocabulary)
+
+    sections = [
+        _le_bytes(role_name_offsets),
+        _le_bytes(role_skill_offsets),
+        _le_bytes(skill_ids),
+        _le_bytes(role_order),
+        _le_bytes(skill_name_offsets),
+        role_names,
+        skill_names,
+    ]
+
+    # Lay sections out after the header, each aligned to 8 bytes
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section) + (-len(section) % 8)
+
+    header = _HEADER.pack(MAGIC, len(roles), len(vocabulary), len(skill_ids), *offsets)
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+            f.write(b"\x00" * (-len(section) % 8))
+    os.replace(tmp_path, output_path)
+
+    return {"roles": len(roles), "skills": len(vocabulary), "skill_refs": len(skill_ids)}
+
+def compile_catalog(json_path, output_path=None):
+    """
+    Convert a JSON job catalog into the compiled format
+
+    Args:
+        json_path (str): Source job_roles.json
+        output_path (str): Destination (defaults to json_path with .catalog suffix)
+
+    Returns:
+        str: Path of the compiled catalog
+    """
+    if output_path is None:
+        output_path = os.path.splitext(json_path)[0] + CATALOG_SUFFIX
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        job_data = json.load(f)
+
+    stats = write_compiled_catalog(job_data, output_path)
+    logger.info("Compiled %d job roles (%d distinct skills) to %s", stats["roles"], stats["skills"], output_path)
+    return output_path
+
+class _CatalogItems(ItemsView):
+    """ItemsView of a CompiledCatalog that iterates in one pass over role ids"""
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+class CompiledCatalog(Mapping):
+    """
+    Read-only, memory-mapped view of a compiled catalog
+
+    Behaves like the JOB_DATA dict (role -> list of skills, in catalog order)
+    while keeping all data in the mapped file. `role_skill_ids` exposes the
+    interned ids without decoding any strings.
+    """
+
+    def __init__(self, buffer):
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self._view = memoryview(buffer)
+
+        if not is_compiled_catalog(self._view):
+            raise ValueError("Not a compiled job catalog")
+
+        (_, self.role_count, self.skill_count, skill_ref_count,
+         role_name_at, role_skill_at, skill_ids_at, role_order_at,
+         skill_name_at, role_names_at, skill_names_at) = _HEADER.unpack_from(self._view)
+
+        self._role_name_offsets = self._u32(role_name_at, self.role_count + 1)
+        self._role_skill_offsets = self._u32(role_skill_at, self.role_count + 1)
+        self._skill_ids = self._u32(skill_ids_at, skill_ref_count)
+        self._role_order = self._u32(role_order_at, self.role_count)
+        self._skill_name_offsets = self._u32(skill_name_at, self.skill_count + 1)
+        self._role_names = self._view[role_names_at:role_names_at + self._role_name_offsets[-1]]
+        self._skill_names = self._view[skill_names_at:skill_names_at + self._skill_name_offsets[-1]]
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a compiled catalog file"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def _u32(self, offset, count):
+        """Return a zero-copy uint32 view of a section"""
+        section = self._view[offset:offset + 4 * count]
+        if sys.byteorder == "big":
+            values = array(_U32, section)
+            values.byteswap()
+            return values
+        return section.cast(_U32)
+
+    def role_name(self, role_id):
+        """Return the name of a role by id"""
+        return str(self._role_names[self._role_name_offsets[role_id]:self._role_name_offsets[role_id + 1]], "utf-8")
+
+    def skill_name(self, skill_id):
+        """Return the skill string for an interned skill id"""
+        return str(self._skill_names[self._skill_name_offsets[skill_id]:self._skill_name_offsets[skill_id + 1]], "utf-8")
+
+    def role_id(self, role):
+        """Return the id of a role by name (binary search), or None"""
+        target = role.encode("utf-8")
+        low, high = 0, self.role_count
+        while low < high:
+            middle = (low + high) // 2
+            role_id = self._role_order[middle]
+            name = bytes(self._role_names[self._role_name_offsets[role_id]:self._role_name_offsets[role_id + 1]])
+            if name < target:
+                low = middle + 1
+            elif name > target:
+                high = middle
+            else:
+                return role_id
+        return None
+
+    def role_skill_ids(self, role_id):
+        """Return the interned skill ids of a role as a zero-copy view"""
+        return self._skill_ids[self._role_skill_offsets[role_id]:self._role_skill_offsets[role_id + 1]]
+
+    @property
+    def vocabulary(self):
+        """All distinct skills, indexed by skill id"""
+        return [self.skill_name(i) for i in range(self.skill_count)]
+
+    def __getitem__(self, role):
+        role_id = self.role_id(role) if isinstance(role, str) else None
+        if role_id is None:
+            raise KeyError(role)
+        return [self.skill_name(skill_id) for skill_id in self.role_skill_ids(role_id)]
+
+    def __iter__(self):
+        for role_id in range(self.role_count):
+            yield self.role_name(role_id)
+
+    def __len__(self):
+        return self.role_count
+
+    def __contains__(self, role):
+        return isinstance(role, str) and self.role_id(role) is not None
+
+    def _iter_items(self):
+        """Yield (role, skills) pairs in catalog order without name lookups"""
+        for role_id in range(self.role_count):
+            yield self.role_name(role_id), [self.skill_name(i) for i in self.role_skill_ids(role_id)]
+
+    def items(self):
+        """Return a view of (role, skills) pairs; iterating it decodes roles by id, not by name lookup"""
+        return _CatalogItems(self)
+
+    def to_dict(self):
+        """Decode the whole catalog into a plain JOB_DATA dict"""
+        return dict(self._iter_items())
+
+    def close(self):
+        """Release the views and unmap the file"""
+        for name in ("_role_name_offsets", "_role_skill_offsets", "_skill_ids",
+                     "_role_order", "_skill_name_offsets", "_role_names", "_skill_names"):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile a JSON job catalog into the binary format")
+    parser.add_argument("json_path", help="Source job_roles.json")
+    parser.add_argument("output_path", nargs="?", help="Destination file (default: <json_path>.catalog)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    compile_catalog(args.json_path, args.output_path)
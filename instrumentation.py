@@ -0,0 +1,268 @@
+"""
+Timing and Counter Instrumentation
+
+Pipeline stages are wrapped in named timers and counters:
+
+    with timer("pdf.open"):
+        doc = fitz.open(...)
+    increment("pdf.pages")
+
+Measurements go to pluggable sinks: log lines (LoggingSink), an in-memory
+histogram (HistogramSink) that can be exported in the Prometheus text format,
+or any object with `observe(name, seconds)` and `increment(name, value)`.
+With no sink registered `timer()` returns a shared no-op context manager and
+`increment()` returns immediately, so instrumented code costs one check.
+
+Sinks can also be enabled through the RESUME_AI_METRICS environment variable,
+a comma-separated list of "log" and "histogram".
+"""
+import os
+import re
+import bisect
+import logging
+import threading
+from functools import wraps
+from time import perf_counter
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Registered sinks; replaced as a whole so readers never need a lock
+_sinks = ()
+_sinks_lock = threading.Lock()
+
+class _NullTimer:
+    """Timer used while instrumentation is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    """Context manager reporting its elapsed time to every sink"""
+    __slots__ = ("name", "sinks", "start")
+
+    def __init__(self, name, sinks):
+        self.name = name
+        self.sinks = sinks
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.start
+        for sink in self.sinks:
+            sink.observe(self.name, elapsed)
+        return False
+
+def timer(name):
+    """Return a context manager timing the enclosed block as stage `name`"""
+    sinks = _sinks
+    if not sinks:
+        return _NULL_TIMER
+    return _Timer(name, sinks)
+
+def timed(name):
+    """Decorator timing every call of a function as stage `name`"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return func(*args, **kwargs)
+            with _Timer(name, _sinks):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def observe(name, seconds):
+    """Record a duration measured elsewhere"""
+    for sink in _sinks:
+        sink.observe(name, seconds)
+
+def increment(name, value=1):
+    """Add `value` to counter `name`"""
+    for sink in _sinks:
+        sink.increment(name, value)
+
+def enabled():
+    """Return True if at least one sink is registered"""
+    return bool(_sinks)
+
+def add_sink(sink):
+    """Register a sink and return it"""
+    global _sinks
+    with _sinks_lock:
+        if sink not in _sinks:
+            _sinks = _sinks + (sink,)
+    return sink
+
+def remove_sink(sink):
+    """Unregister a sink (ignored if it is not registered)"""
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+
+def clear_sinks():
+    """Unregister every sink, disabling instrumentation"""
+    global _sinks
+    with _sinks_lock:
+        _sinks = ()
+
+def get_sinks():
+    """Return the registered sinks"""
+    return _sinks
+
+def get_histogram():
+    """Return the first registered HistogramSink, or None"""
+    for sink in _sinks:
+        if isinstance(sink, HistogramSink):
+            return sink
+    return None
+
+class LoggingSink:
+    """Write every measurement as a log line"""
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger("resume_ai.metrics")
+        self.level = level
+
+    def observe(self, name, seconds):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s took %.2f ms", name, seconds * 1000)
+
+    def increment(self, name, value=1):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s += %s", name, value)
+
+class HistogramSink:
+    """
+    In-memory latency histograms and counters
+
+    Each stage keeps a fixed set of bucket counts plus the running sum, count
+    and maximum, so memory does not grow with the number of observations.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        position = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                # Bucket counts (last one is +Inf), sum, count, max
+                histogram = self._histograms[name] = [[0] * (len(self.buckets) + 1), 0.0, 0, 0.0]
+            histogram[0][position] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+            if seconds > histogram[3]:
+                histogram[3] = seconds
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def quantile(self, name, fraction):
+        """Estimate a latency quantile (seconds) from the bucket counts"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                return None
+            counts, _, count, maximum = histogram
+            counts = list(counts)
+
+        rank = fraction * count
+        seen = 0
+        for position, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                # Interpolate inside the bucket; the overflow bucket ends at the max seen
+                lower = self.buckets[position - 1] if position > 0 else 0.0
+                upper = self.buckets[position] if position < len(self.buckets) else maximum
+                return min(maximum, lower + (upper - lower) * (rank - seen) / bucket_count)
+            seen += bucket_count
+        return maximum
+
+    def snapshot(self):
+        """
+        Return the current measurements
+
+        Returns:
+            dict: {"timers": {name: {"count", "sum", "mean", "max", "p50", "p90", "p99"}},
+                   "counters": {name: value}}
+        """
+        with self._lock:
+            totals = {name: tuple(h[1:]) for name, h in self._histograms.items()}
+            counters = dict(self._counters)
+
+        timers = {}
+        for name, (total, count, maximum) in totals.items():
+            timers[name] = {
+                "count": count,
+                "sum": total,
+                "mean": total / count if count else 0.0,
+                "max": maximum,
+                "p50": self.quantile(name, 0.50),
+                "p90": self.quantile(name, 0.90),
+                "p99": self.quantile(name, 0.99),
+            }
+        return {"timers": timers, "counters": counters}
+
+    def reset(self):
+        """Drop every measurement"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def prometheus_text(self, prefix="resume_ai"):
+        """Export the measurements in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = {name: (list(h[0]), h[1], h[2]) for name, h in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        for name in sorted(histograms):
+            counts, total, count = histograms[name]
+            metric = _metric_name(prefix, name) + "_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {count}')
+            lines.append(f"{metric}_sum {total:.9g}")
+            lines.append(f"{metric}_count {count}")
+
+        for name in sorted(counters):
+            metric = _metric_name(prefix, name) + "_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {counters[name]}")
+
+        return "\n".join(lines) + "\n"
+
+_METRIC_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+def _metric_name(prefix, name):
+    """Turn a dotted stage name into a valid Prometheus metric name"""
+    return _METRIC_INVALID.sub("_", f"{prefix}_{name}" if prefix else name)
+
+def configure_from_env(value=None):
+    """Register the sinks named in RESUME_AI_METRICS (or `value`)"""
+    value = os.environ.get("RESUME_AI_METRICS", "") if value is None else value
+    for name in (part.strip().lower() for part in value.split(",")):
+        if name == "log":
+            add_sink(LoggingSink())
+        elif name == "histogram" and get_histogram() is None:
+            add_sink(HistogramSink())
+
+configure_from_env()
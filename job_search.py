@@ -0,0 +1,352 @@
+"""
+Job Board Search
+
+Finds live openings for job roles on the major job boards. Searches go
+through a pluggable backend (DuckDuckGo site searches by default, a local
+fake backend for tests and offline use); every board of every role is
+queried concurrently on one event loop, each board under its own rate limit,
+and results are kept in a TTL cache keyed by (title, location). Listing the
+openings for the top five matched roles therefore costs one parallel round
+trip, and nothing at all while the cache is warm.
+
+Usage:
+    openings = search_openings(["Data Scientist", "Backend Developer"], "Berlin")
+    # {"Data Scientist": {"LinkedIn": [{"title", "url", "snippet", "board"}, ...], ...}, ...}
+"""
+import os
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_plus
+
+from instrumentation import timer, increment
+
+try:
+    from duckduckgo_search import DDGS
+    HAS_DDGS = True
+except ImportError:
+    HAS_DDGS = False
+
+logger = logging.getLogger(__name__)
+
+# Board name -> site searched for live openings
+JOB_BOARDS = {
+    "LinkedIn": "linkedin.com/jobs",
+    "Indeed": "indeed.com",
+    "Glassdoor": "glassdoor.com",
+    "Monster": "monster.com",
+    "ZipRecruiter": "ziprecruiter.com",
+}
+
+# Board name -> search page URL template
+JOB_BOARD_URLS = {
+    "LinkedIn": "https://www.linkedin.com/jobs/search/?keywords={title}&location={location}",
+    "Indeed": "https://www.indeed.com/jobs?q={title}&l={location}",
+    "Glassdoor": "https://www.glassdoor.com/Job/jobs.htm?sc.keyword={title}",
+    "Monster": "https://www.monster.com/jobs/search/?q={title}",
+    "ZipRecruiter": "https://www.ziprecruiter.com/Jobs/{title}",
+    "Google Jobs": "https://www.google.com/search?q={title}+jobs&ibp=htl;jobs",
+}
+
+# Requests per second and burst size allowed against each board; the burst
+# lets the top five roles go out at once
+DEFAULT_RATE_LIMIT = (2.0, 5)
+
+# Seconds a role's openings stay cached
+DEFAULT_TTL = float(os.environ.get("RESUME_AI_JOB_CACHE_TTL", 900))
+
+# Seconds results missing a failed board stay cached before it is retried
+FAILURE_TTL = 60.0
+
+def job_board_links(job_title, location=""):
+    """Return {board: search page URL} for a job title"""
+    title, location = quote_plus(job_title), quote_plus(location)
+    return {board: url.format(title=title, location=location) for board, url in JOB_BOARD_URLS.items()}
+
+class JobBackend(ABC):
+    """
+    Interface for job search backends
+
+    `search` returns a list of postings, each a dict with "title", "url",
+    "snippet" and "board". Backends are created once and reused, so they
+    should hold on to their HTTP clients.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def search(self, board, site, job_title, location="", limit=5):
+        """Return up to `limit` postings for a job title on one board"""
+
+    def close(self):
+        """Release clients and threads held by the backend"""
+
+class FakeJobBackend(JobBackend):
+    """
+    Deterministic local backend for tests and offline use
+
+    Returns `limit` synthetic postings per board after an optional delay and
+    records every call in `calls`. Boards listed in `failing_boards` raise.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency=0.0, failing_boards=()):
+        self.latency = latency
+        self.failing_boards = set(failing_boards)
+        self.calls = []
+
+    async def search(self, board, site, job_title, location="", limit=5):
+        self.calls.append((board, job_title, location))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if board in self.failing_boards:
+            raise ConnectionError(f"{board} is unavailable")
+
+        where = f" in {location}" if location else ""
+        return [
+            {
+                "title": f"{job_title} #{i + 1}{where}",
+                "url": f"https://{site}/{quote_plus(job_title)}/{i + 1}",
+                "snippet": f"{job_title} opening {i + 1} listed on {board}{where}",
+                "board": board,
+            }
+            for i in range(limit)
+        ]
+
+class DuckDuckGoBackend(JobBackend):
+    """
+    Site-restricted DuckDuckGo searches ("site:indeed.com Data Scientist jobs")
+
+    One DDGS client (and its pooled HTTP connections) is shared by every
+    search; the blocking calls run on a small dedicated thread pool so the
+    event loop keeps fanning out requests.
+    """
+
+    name = "duckduckgo"
+
+    def __init__(self, max_workers=8, timeout=10, region="wt-wt"):
+        if not HAS_DDGS:
+            raise RuntimeError("duckduckgo-search not installed. Install with: pip install duckduckgo-search")
+        self.region = region
+        self._client = DDGS(timeout=timeout)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-search")
+
+    def _search(self, query, limit):
+        return self._client.text(query, region=self.region, max_results=limit) or []
+
+    async def search(self, board, site, job_title, location="", limit=5):
+        query = f"site:{site} {job_title} jobs {location}".strip()
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(self._executor, self._search, query, limit)
+        return [
+            {"title": result.get("title", ""), "url": result.get("href", ""), "snippet": result.get("body", ""),
+             "board": board}
+            for result in results[:limit]
+        ]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+class RateLimiter:
+    """
+    Token bucket spacing out requests to one board
+
+    `reserve()` books the next free slot and returns how long the caller must
+    wait for it, so limiters can be shared by threads and event loops.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.interval = 1.0 / rate
+        self.burst = max(1, burst)
+        self._next_free = time.monotonic() - self.burst * self.interval
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Book the next request slot and return the seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            # Unused capacity accrues up to `burst` requests
+            slot = max(self._next_free, now - (self.burst - 1) * self.interval)
+            self._next_free = slot + self.interval
+            return max(0.0, slot - now)
+
+    async def wait(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+class TTLCache:
+    """Small thread-safe LRU mapping whose entries expire after `ttl` seconds"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class JobSearch:
+    """
+    Concurrent, rate-limited, cached job search over several boards
+
+    Args:
+        backend (JobBackend): Search backend (DuckDuckGoBackend if omitted)
+        boards (dict): Board name -> site to search (defaults to JOB_BOARDS)
+        rate_limits (dict): Board name -> (requests per second, burst)
+        ttl (float): Seconds results stay cached
+        failure_ttl (float): Seconds results with a failed board stay cached
+        limit (int): Postings kept per board
+        timeout (float): Seconds to wait for one board before giving up on it
+    """
+
+    def __init__(self, backend=None, boards=None, rate_limits=None, ttl=DEFAULT_TTL, failure_ttl=FAILURE_TTL,
+                 max_entries=512, limit=5, timeout=15.0):
+        self.backend = backend if backend is not None else DuckDuckGoBackend()
+        self.boards = dict(boards or JOB_BOARDS)
+        rate_limits = rate_limits or {}
+        self._limiters = {
+            board: RateLimiter(*rate_limits.get(board, DEFAULT_RATE_LIMIT)) for board in self.boards
+        }
+        self.cache = TTLCache(ttl, max_entries)
+        self.failure_ttl = failure_ttl
+        self.limit = limit
+        self.timeout = timeout
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(job_title, location=""):
+        return (job_title.strip().lower(), location.strip().lower())
+
+    async def _search_board(self, board, job_title, location):
+        """Search one board, returning [] (and logging) on failure"""
+        await self._limiters[board].wait()
+        try:
+            postings = await asyncio.wait_for(
+                self.backend.search(board, self.boards[board], job_title, location, self.limit), self.timeout
+            )
+        except Exception as e:
+            logger.warning("Job search on %s for %r failed: %s", board, job_title, e)
+            increment("jobs.search_errors")
+            return [], False
+        return postings, True
+
+    async def search_role(self, job_title, location=""):
+        """
+        Return {board: postings} for one role, querying all boards concurrently
+
+        Results where a board failed are cached for `failure_ttl` only, so
+        the board is retried soon without every call paying for the failure.
+        """
+        key = self.cache_key(job_title, location)
+        cached = self.cache.get(key)
+        if cached is not None:
+            increment("jobs.cache_hits")
+            return cached
+        increment("jobs.cache_misses")
+
+        boards = list(self.boards)
+        results = await asyncio.gather(*(self._search_board(board, job_title, location) for board in boards))
+        openings = {board: postings for board, (postings, _) in zip(boards, results)}
+        self.cache.put(key, openings, None if all(ok for _, ok in results) else self.failure_ttl)
+        return openings
+
+    async def search_roles(self, job_titles, location=""):
+        """Return {title: {board: postings}} for many roles in one concurrent fan-out"""
+        job_titles = list(dict.fromkeys(job_titles))
+        with timer("jobs.search"):
+            results = await asyncio.gather(*(self.search_role(title, location) for title in job_titles))
+        return dict(zip(job_titles, results))
+
+    def _get_loop(self):
+        """Return the background event loop all searches run on, starting it on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="job-search-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def search_roles_sync(self, job_titles, location="", timeout=None):
+        """
+        Blocking variant of search_roles for synchronous callers (e.g. Streamlit)
+
+        Runs on a background event loop owned by this instance, so the backend
+        and its connections are reused across calls and threads.
+        """
+        future = asyncio.run_coroutine_threadsafe(self.search_roles(job_titles, location), self._get_loop())
+        return future.result(timeout if timeout is not None else self.timeout * 2)
+
+    def close(self):
+        """Stop the background loop and release the backend"""
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+        self.backend.close()
+
+_job_search = None
+_job_search_lock = threading.Lock()
+
+def get_job_search():
+    """
+    Return the shared JobSearch, creating it on first use
+
+    RESUME_AI_JOB_BACKEND selects "duckduckgo" (default) or "fake". Returns
+    None when the selected backend is unavailable.
+    """
+    global _job_search
+    if _job_search is None:
+        with _job_search_lock:
+            if _job_search is None:
+                backend_name = os.environ.get("RESUME_AI_JOB_BACKEND", "duckduckgo")
+                if backend_name == "fake":
+                    backend = FakeJobBackend()
+                elif HAS_DDGS:
+                    backend = DuckDuckGoBackend()
+                else:
+                    return None
+                _job_search = JobSearch(backend)
+    return _job_search
+
+def search_openings(job_titles, location=""):
+    """
+    List live openings for several roles in one parallel round trip
+
+    Returns:
+        dict: {title: {board: [posting dicts]}}, or {} if no backend is available
+    """
+    job_search = get_job_search()
+    if job_search is None:
+        return {}
+    return job_search.search_roles_sync(job_titles, location)
@@ -7,160 +7,423 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib import colors
 import io
+import re
+import copy
+import json
+import hashlib
+import logging
+import threading
+import zipfile
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from xml.sax.saxutils import escape
 
-def generate_enhanced_resume(original_text, missing_skills, present_skills, target_role, username):
+from instrumentation import timer, increment
+
+logger = logging.getLogger(__name__)
+
+ACTION_PLAN = [
+    "<b>1. Skill Development:</b> Focus on adding the recommended skills through online courses, certifications, or hands-on projects.",
+    "<b>2. Project Portfolio:</b> Build 2-3 projects demonstrating {target_role} expertise using the recommended technologies.",
+    "<b>3. Quantify Achievements:</b> Add metrics and numbers to your experience (e.g., 'Increased efficiency by 40%').",
+    "<b>4. Certifications:</b> Consider relevant certifications for missing skills to strengthen your credentials.",
+    "<b>5. Tailor Resume:</b> Customize your resume for each application, emphasizing relevant skills and experience.",
+    "<b>6. Keywords:</b> Use industry-standard terminology and keywords from job descriptions.",
+    "<b>7. ATS Optimization:</b> Ensure your resume uses standard formatting with clear headers and bullet points."
+]
+
+NEXT_STEPS = """
+    <b>Immediate Actions:</b><br/>
+    • Review the recommended skills and prioritize which to learn first<br/>
+    • Update your LinkedIn profile with current skills<br/>
+    • Start a GitHub portfolio project using target technologies<br/>
+    • Network with professionals in the {target_role} field<br/>
+    • Apply to positions that match your current skill level
+    """
+
+FOOTER = """
+    <i>This enhanced resume report was generated using AI-powered analysis to optimize your profile for
+    the role: <b>{target_role}</b>. The recommendations are based on skill gap analysis, industry
+    standards, and current job market requirements. Generated on {date}
+    by the Smart Resume Enhancement System.</i>
+    """
+
+class _LRU:
+    """Small thread-safe LRU mapping"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class ReportRenderer:
+    """
+    Enhanced resume report renderer with cached templates
+
+    The style sheet and every flowable that does not depend on the candidate
+    (title, headings, action plan, next steps, footer) are built once and
+    reused; role- and date-dependent sections are cached per role. Each
+    render only parses the candidate's own paragraphs and copies the cached
+    flowables, since reportlab stores layout state on the instances.
+    Optionally, the finished PDF bytes are cached keyed by the report inputs.
+    """
+
+    def __init__(self, role_cache_size=256, pdf_cache_size=64):
+        self.styles = getSampleStyleSheet()
+        self._role_sections = _LRU(role_cache_size)
+        self._pdf_cache = _LRU(pdf_cache_size)
+
+        styles = self.styles
+        self._title = [
+            Paragraph("<b>ENHANCED RESUME REPORT</b>", styles['Title']),
+            Spacer(1, 0.2*inch)
+        ]
+        self._present_heading = Paragraph("<b>✓ CURRENT SKILLS</b>", styles['Heading2'])
+        self._missing_heading = [
+            Paragraph("<b>+ RECOMMENDED SKILLS TO ADD</b>", styles['Heading2']),
+            Paragraph("<i>(Adding these will strengthen your profile)</i>", styles['Normal']),
+            Spacer(1, 0.1*inch)
+        ]
+        self._summary_heading = Paragraph("<b>RESUME SUMMARY</b>", styles['Heading2'])
+        self._matches_heading = Paragraph("<b>TOP JOB MATCHES</b>", styles['Heading2'])
+        self._plan_heading = Paragraph("<b>ENHANCEMENT ACTION PLAN</b>", styles['Heading2'])
+        self._static_plan = {
+            i: Paragraph(rec, styles['Normal'])
+            for i, rec in enumerate(ACTION_PLAN)
+            if "{target_role}" not in rec
+        }
+        self._next_heading = Paragraph("<b>NEXT STEPS</b>", styles['Heading2'])
+
+    def _sections_for_role(self, target_role, date):
+        """Return (action plan, next steps + footer) flowables for a role, cached"""
+        key = (target_role, date)
+        sections = self._role_sections.get(key)
+        if sections is not None:
+            return sections
+
+        styles = self.styles
+        # Paragraph text is markup; role names are shown literally
+        target_role = escape(target_role)
+        plan = []
+        for i, rec in enumerate(ACTION_PLAN):
+            plan.append(self._static_plan.get(i) or Paragraph(rec.format(target_role=target_role), styles['Normal']))
+            plan.append(Spacer(1, 0.05*inch))
+        plan.append(Spacer(1, 0.2*inch))
+
+        closing = [
+            self._next_heading,
+            Paragraph(NEXT_STEPS.format(target_role=target_role), styles['Normal']),
+            Spacer(1, 0.2*inch),
+            Paragraph(FOOTER.format(target_role=target_role, date=date), styles['Normal'])
+        ]
+
+        sections = (plan, closing)
+        self._role_sections.put(key, sections)
+        return sections
+
+    @staticmethod
+    def cache_key(*report_inputs):
+        """Return a hash identifying one report's inputs"""
+        payload = json.dumps(report_inputs, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def render(self, original_text, missing_skills, present_skills, target_role, username, use_cache=True,
+               match_percentage=None, top_matches=None):
+        """Render a report and return the PDF bytes (see generate_enhanced_resume)"""
+        date = datetime.now().strftime('%B %d, %Y')
+
+        key = None
+        if use_cache:
+            key = self.cache_key(
+                original_text, missing_skills, present_skills, target_role, username, date,
+                match_percentage, top_matches
+            )
+            pdf_bytes = self._pdf_cache.get(key)
+            if pdf_bytes is not None:
+                increment("report.cache_hits")
+                return pdf_bytes
+
+        # Create BytesIO buffer for PDF
+        buffer = io.BytesIO()
+
+        # Create PDF document
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=letter,
+            rightMargin=0.75*inch,
+            leftMargin=0.75*inch,
+            topMargin=0.75*inch,
+            bottomMargin=0.75*inch
+        )
+
+        styles = self.styles
+        plan, closing = self._sections_for_role(target_role, date)
+
+        # Paragraph text is markup, so user-supplied text is escaped before it is embedded
+        target_role, username = escape(target_role), escape(str(username))
+
+        # Container for flowable objects
+        elements = list(self._title)
+
+        # Subtitle
+        elements.append(Paragraph(f"<i>Optimized for: {target_role}</i>", styles['Normal']))
+        elements.append(Spacer(1, 0.2*inch))
+
+        # User information
+        info_text = f"""
+    <b>Candidate:</b> {username}<br/>
+    <b>Date Generated:</b> {date}<br/>
+    <b>Target Role:</b> {target_role}
+    """
+        if match_percentage is not None:
+            info_text += f"<br/><b>Match Score:</b> {match_percentage}%"
+        elements.append(Paragraph(info_text, styles['Normal']))
+        elements.append(Spacer(1, 0.3*inch))
+
+        # Current Skills Section
+        if present_skills:
+            elements.append(self._present_heading)
+            elements.append(Paragraph(escape(", ".join(present_skills[:25])), styles['Normal']))
+            elements.append(Spacer(1, 0.2*inch))
+
+        # Recommended Skills Section
+        if missing_skills:
+            elements.extend(self._missing_heading)
+
+            # Limit to top 25 missing skills
+            elements.append(Paragraph(escape(", ".join(missing_skills[:25])), styles['Normal']))
+
+            if len(missing_skills) > 25:
+                more_text = Paragraph(f"<i>...and {len(missing_skills) - 25} more</i>", styles['Normal'])
+                elements.append(more_text)
+
+            elements.append(Spacer(1, 0.2*inch))
+
+        # Resume Summary Section
+        elements.append(self._summary_heading)
+
+        # Summarize from the summary and experience sections rather than the contact header
+        from resume_parser import parse_resume_text
+        summary = parse_resume_text(original_text).summary(200)
+
+        elements.append(Paragraph(escape(summary), styles['Normal']))
+        elements.append(Spacer(1, 0.3*inch))
+
+        # Top Job Matches Section
+        if top_matches:
+            elements.append(self._matches_heading)
+            for i, job in enumerate(top_matches, 1):
+                elements.append(Paragraph(f"{i}. {escape(job['job'])} - {job['similarity']}% match", styles['Normal']))
+            elements.append(Spacer(1, 0.3*inch))
+
+        # Action Plan, Next Steps and Footer
+        elements.append(self._plan_heading)
+        elements.extend(plan)
+        elements.extend(closing)
+
+        # reportlab keeps layout state on flowables, so cached ones are copied per build
+        elements = [copy.copy(element) for element in elements]
+
+        # Build the PDF
+        try:
+            with timer("report.build"):
+                doc.build(elements)
+            pdf_bytes = buffer.getvalue()
+            buffer.close()
+        except Exception as e:
+            logger.error("Error generating PDF: %s", e)
+            buffer.close()
+            raise
+
+        if key is not None:
+            self._pdf_cache.put(key, pdf_bytes)
+        return pdf_bytes
+
+    def clear_cache(self):
+        """Drop cached role sections and PDF bytes"""
+        self._role_sections.clear()
+        self._pdf_cache.clear()
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+def get_report_renderer():
+    """Return the shared ReportRenderer, building styles and templates on first use"""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = ReportRenderer()
+    return _renderer
+
+def generate_enhanced_resume(original_text, missing_skills, present_skills, target_role, username, use_cache=True,
+                             match_percentage=None, top_matches=None):
     """
     Generate an enhanced resume PDF with skill recommendations
-    
+
     Args:
         original_text (str): Original resume text
         missing_skills (list): Skills to add
         present_skills (list): Skills already present
         target_role (str): Target job role
         username (str): User's name
-    
+        use_cache (bool): Reuse the PDF bytes of an identical earlier report
+        match_percentage (float): Skill match score for the role (optional)
+        top_matches (list): Job match dicts to list in the report (optional)
+
     Returns:
         bytes: PDF file as bytes
     """
-    # Create BytesIO buffer for PDF
-    buffer = io.BytesIO()
-    
-    # Create PDF document
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=letter,
-        rightMargin=0.75*inch,
-        leftMargin=0.75*inch,
-        topMargin=0.75*inch,
-        bottomMargin=0.75*inch
+    return get_report_renderer().render(
+        original_text, missing_skills, present_skills, target_role, username, use_cache=use_cache,
+        match_percentage=match_percentage, top_matches=top_matches
     )
-    
-    # Container for flowable objects
-    elements = []
-    
-    # Get default styles
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title = Paragraph("<b>ENHANCED RESUME REPORT</b>", styles['Title'])
-    elements.append(title)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Subtitle
-    subtitle = Paragraph(f"<i>Optimized for: {target_role}</i>", styles['Normal'])
-    elements.append(subtitle)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # User information
-    info_text = f"""
-    <b>Candidate:</b> {username}<br/>
-    <b>Date Generated:</b> {datetime.now().strftime('%B %d, %Y')}<br/>
-    <b>Target Role:</b> {target_role}
+
+_role_reports = _LRU(64)
+
+def generate_role_report(resume_text, target_role, username, top_matches=None, use_cache=True):
     """
-    info = Paragraph(info_text, styles['Normal'])
-    elements.append(info)
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Current Skills Section
-    if present_skills:
-        heading = Paragraph("<b>✓ CURRENT SKILLS</b>", styles['Heading2'])
-        elements.append(heading)
-        
-        skills_text = ", ".join(present_skills[:25])
-        para = Paragraph(skills_text, styles['Normal'])
-        elements.append(para)
-        elements.append(Spacer(1, 0.2*inch))
-    
-    # Recommended Skills Section
-    if missing_skills:
-        heading = Paragraph("<b>+ RECOMMENDED SKILLS TO ADD</b>", styles['Heading2'])
-        elements.append(heading)
-        
-        rec_text = Paragraph("<i>(Adding these will strengthen your profile)</i>", styles['Normal'])
-        elements.append(rec_text)
-        elements.append(Spacer(1, 0.1*inch))
-        
-        # Limit to top 25 missing skills
-        top_missing = missing_skills[:25]
-        skills_text = ", ".join(top_missing)
-        para = Paragraph(skills_text, styles['Normal'])
-        elements.append(para)
-        
-        if len(missing_skills) > 25:
-            more_text = Paragraph(f"<i>...and {len(missing_skills) - 25} more</i>", styles['Normal'])
-            elements.append(more_text)
-        
-        elements.append(Spacer(1, 0.2*inch))
-    
-    # Resume Summary Section
-    summary_heading = Paragraph("<b>RESUME SUMMARY</b>", styles['Heading2'])
-    elements.append(summary_heading)
-    
-    # Extract first 200 words as summary
-    words = original_text.split()[:200]
-    summary = " ".join(words)
-    if len(original_text.split()) > 200:
-        summary += "..."
-    
-    summary_para = Paragraph(summary, styles['Normal'])
-    elements.append(summary_para)
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Action Plan Section
-    rec_heading = Paragraph("<b>ENHANCEMENT ACTION PLAN</b>", styles['Heading2'])
-    elements.append(rec_heading)
-    
-    recommendations = [
-        "<b>1. Skill Development:</b> Focus on adding the recommended skills through online courses, certifications, or hands-on projects.",
-        f"<b>2. Project Portfolio:</b> Build 2-3 projects demonstrating {target_role} expertise using the recommended technologies.",
-        "<b>3. Quantify Achievements:</b> Add metrics and numbers to your experience (e.g., 'Increased efficiency by 40%').",
-        "<b>4. Certifications:</b> Consider relevant certifications for missing skills to strengthen your credentials.",
-        "<b>5. Tailor Resume:</b> Customize your resume for each application, emphasizing relevant skills and experience.",
-        "<b>6. Keywords:</b> Use industry-standard terminology and keywords from job descriptions.",
-        "<b>7. ATS Optimization:</b> Ensure your resume uses standard formatting with clear headers and bullet points."
-    ]
-    
-    for rec in recommendations:
-        para = Paragraph(rec, styles['Normal'])
-        elements.append(para)
-        elements.append(Spacer(1, 0.05*inch))
-    
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Next Steps
-    next_heading = Paragraph("<b>NEXT STEPS</b>", styles['Heading2'])
-    elements.append(next_heading)
-    
-    next_steps = f"""
-    <b>Immediate Actions:</b><br/>
-    • Review the recommended skills and prioritize which to learn first<br/>
-    • Update your LinkedIn profile with current skills<br/>
-    • Start a GitHub portfolio project using target technologies<br/>
-    • Network with professionals in the {target_role} field<br/>
-    • Apply to positions that match your current skill level
+    Analyze skill gaps for a role and render the report, memoized per resume and role
+
+    Repeat requests for the same resume text, role and user on the same day
+    skip both the gap analysis and the reportlab build, as long as the job
+    catalog has not changed since.
+
+    Args:
+        resume_text (str): Extracted resume text
+        target_role (str): Target job role
+        username (str): User's name
+        top_matches (list): Job match dicts to list in the report (optional)
+        use_cache (bool): Reuse an identical earlier report
+
+    Returns:
+        bytes: PDF file as bytes
     """
-    next_para = Paragraph(next_steps, styles['Normal'])
-    elements.append(next_para)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Footer
-    footer_text = f"""
-    <i>This enhanced resume report was generated using AI-powered analysis to optimize your profile for 
-    the role: <b>{target_role}</b>. The recommendations are based on skill gap analysis, industry 
-    standards, and current job market requirements. Generated on {datetime.now().strftime('%B %d, %Y')} 
-    by the Smart Resume Enhancement System.</i>
+    from resume_ai import suggest_improvements, get_job_catalog
+
+    key = None
+    if use_cache:
+        resume_hash = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+        date = datetime.now().strftime('%B %d, %Y')
+        # The catalog fingerprint changes on hot reload, so reports of edited roles are rebuilt
+        key = ReportRenderer.cache_key(
+            resume_hash, target_role, username, date, top_matches, get_job_catalog().fingerprint
+        )
+        pdf_bytes = _role_reports.get(key)
+        if pdf_bytes is not None:
+            increment("report.cache_hits")
+            return pdf_bytes
+
+    suggestions = suggest_improvements(resume_text, target_role)
+    pdf_bytes = generate_enhanced_resume(
+        resume_text,
+        suggestions["missing_skills"],
+        suggestions["present_skills"],
+        target_role,
+        username,
+        use_cache=False,
+        match_percentage=suggestions.get("match_percentage"),
+        top_matches=top_matches
+    )
+
+    if key is not None:
+        _role_reports.put(key, pdf_bytes)
+    return pdf_bytes
+
+def _init_report_worker(catalog_path):
+    """Load the parent's job catalog, skill index and report templates once per worker process"""
+    from resume_ai import set_catalog_path
+    set_catalog_path(catalog_path).skill_index
+    get_report_renderer()
+
+def _render_report_item(item):
+    """Compute the skill gap and render one report (runs in worker processes)"""
+    resume_text, target_role, username = item
+    return generate_role_report(resume_text, target_role, username, use_cache=False)
+
+def _report_filename(index, target_role, username):
+    """Return a safe, unique archive member name for a report"""
+    name = re.sub(r"[^\w.-]+", "_", f"{username}_{target_role}").strip("_")
+    return f"{index + 1:05d}_{name or 'report'}.pdf"
+
+def generate_reports_zip(items, output, workers=None, max_in_flight=None):
     """
-    footer = Paragraph(footer_text, styles['Normal'])
-    elements.append(footer)
-    
-    # Build the PDF
-    try:
-        doc.build(elements)
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
-        return pdf_bytes
-    except Exception as e:
-        print(f"Error generating PDF: {e}")
-        buffer.close()
-        raise
+    Render many reports and stream them into a zip archive
+
+    Reports are rendered across a process pool and written to the archive in
+    input order as soon as each is ready. At most `max_in_flight` reports are
+    pending at once, so memory stays bounded however many items are given.
+
+    Args:
+        items (iterable): (resume_text, target_role, username) tuples
+        output: Path or writable binary file object for the zip archive
+        workers (int): Number of worker processes (None or 1 renders in-process)
+        max_in_flight (int): Reports rendered ahead of the writer (default 4 per worker)
+
+    Returns:
+        dict: Number of reports written and a list of (index, error) failures
+    """
+    written = 0
+    errors = []
+
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        def write(index, item, result):
+            nonlocal written
+            try:
+                pdf_bytes = result()
+            except Exception as e:
+                logger.error("Error generating report %d: %s", index + 1, e)
+                errors.append((index, str(e)))
+                return
+            archive.writestr(_report_filename(index, item[1], item[2]), pdf_bytes)
+            written += 1
+
+        if not workers or workers <= 1:
+            for index, item in enumerate(items):
+                write(index, item, lambda: _render_report_item(item))
+        else:
+            from resume_ai import get_job_catalog
+
+            window = max_in_flight or workers * 4
+            pending = deque()
+
+            # Spawned, not forked: callers (the API server, Streamlit) are multithreaded.
+            # Each worker loads the same catalog and warms up the renderer before its first report.
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_report_worker, initargs=(get_job_catalog().path,)
+            ) as pool:
+                for index, item in enumerate(items):
+                    item = tuple(item)
+                    pending.append((index, item, pool.submit(_render_report_item, item)))
+                    if len(pending) >= window:
+                        index, item, future = pending.popleft()
+                        write(index, item, future.result)
+
+                while pending:
+                    index, item, future = pending.popleft()
+                    write(index, item, future.result)
+
+    return {"reports": written, "errors": errors}
@@ -3,7 +3,20 @@ Resume Analysis and Job Matching Module
 """
 import os
 import json
+import atexit
+import hashlib
+import logging
+import math
+import mmap
 import re
+import threading
+import time
+import multiprocessing
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from compiled_catalog import CompiledCatalog, is_compiled_catalog
+from instrumentation import timer, increment
 
 # Import dependencies with error handling
 try:
@@ -13,12 +26,16 @@ except ImportError:
     HAS_PYMUPDF = False
 
 try:
+    import numpy as np
+    from scipy import sparse
     from sklearn.feature_extraction.text import CountVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
+    from sklearn.preprocessing import normalize
     HAS_SKLEARN = True
 except ImportError:
     HAS_SKLEARN = False
 
+logger = logging.getLogger(__name__)
+
 # Default job data (fallback if JSON file not found)
 DEFAULT_JOB_DATA = {
     "Software Engineer": ["Python", "Java", "JavaScript", "SQL", "Git", "Docker", "AWS"],
@@ -28,119 +45,1539 @@ DEFAULT_JOB_DATA = {
     "Full Stack Developer": ["JavaScript", "Python", "React", "Node.js", "SQL", "Docker"]
 }
 
-def load_job_data():
+# Catalog shipped with the package, resolved independently of the CWD
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "job_roles.json")
+
+def load_job_data(path=None):
     """Load job roles from JSON file or use default data"""
+    path = path or DEFAULT_CATALOG_PATH
     try:
         # Try to load from data/job_roles.json
-        if os.path.exists("data/job_roles.json"):
-            with open("data/job_roles.json", "r", encoding="utf-8") as f:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                print(f"✅ Loaded {len(data)} job roles from JSON")
+                logger.info("Loaded %d job roles from JSON", len(data))
                 return data
         
         # Fallback to default
-        print("⚠️ Using default job data")
+        logger.warning("Using default job data")
         return DEFAULT_JOB_DATA
         
     except Exception as e:
-        print(f"⚠️ Error loading job data: {e}")
+        logger.warning("Error loading job data: %s", e)
         return DEFAULT_JOB_DATA
 
-# Load job data on module import
-JOB_DATA = load_job_data()
+# Scoring engines understood by RoleMatcher
+SCORING_MODES = ("cosine", "tfidf", "bm25")
 
-def extract_text_from_pdf(uploaded_file):
-    """Extract text from uploaded PDF file using PyMuPDF"""
-    if not HAS_PYMUPDF:
-        return "ERROR: PyMuPDF not installed. Install with: pip install PyMuPDF"
+# Scoring used when callers do not ask for one
+DEFAULT_SCORING = os.environ.get("RESUME_AI_SCORING", "cosine")
+
+# BM25 term-frequency saturation and role length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Growth of the resume corpus, as a share of the documents (roles + resumes)
+# the current TF-IDF/BM25 weights were derived from, before they are derived
+# again; in between, scoring uses the earlier statistics
+CORPUS_REFRESH_FRACTION = 0.05
+
+# Selection slack (raw score) so roles that tie after rounding to 0.01% are never dropped
+_RANK_MARGIN = 1e-4
+
+class RoleMatcher:
+    """
+    Similarity matcher over all job roles at once.
+
+    One CountVectorizer vocabulary is fitted over every role description and
+    the raw role x term counts are kept, together with per-term document
+    frequencies and role lengths. Each scoring engine derives its role
+    weight matrix from those statistics once, so scoring a resume costs a
+    single tokenization and one sparse matrix-vector product regardless of
+    how many roles are loaded:
+
+        cosine  L2-normalized term counts (the original behaviour)
+        tfidf   L2-normalized counts weighted by smoothed IDF
+        bm25    BM25 role weights with saturated term frequencies, divided by
+                each role's self-score so similarities stay in 0-1
+
+    IDF is computed over the roles plus an optional corpus of resumes that
+    can grow incrementally (see add_documents). Re-deriving the role weights
+    costs one pass over the role x term matrix, so it happens in batches,
+    once the corpus has grown by CORPUS_REFRESH_FRACTION.
+
+    With a SkillNormalizer, aliases in role descriptions and resumes are
+    rewritten to canonical terms inside the analyzer, so "k8s" and
+    "kubernetes" share one column.
+    """
+
+    def __init__(self, job_data, scoring=None, k1=BM25_K1, b=BM25_B, normalizer=None):
+        self.roles = list(job_data.keys())
+        descriptions = [" ".join(skills).lower() for skills in job_data.values()]
+
+        self.vectorizer = CountVectorizer()
+        if normalizer:
+            # Compile the alias table for the vectorizer's own tokenization
+            self.vectorizer = CountVectorizer(analyzer=normalizer.for_tokenizer(self.vectorizer.build_analyzer()))
+        self.role_counts = self.vectorizer.fit_transform(descriptions).astype(np.float64).tocsr()
+        self.vocabulary = self.vectorizer.vocabulary_
+        self._analyzer = self.vectorizer.build_analyzer()
+        self._init_statistics(scoring, k1, b, np.zeros(len(self.vocabulary)), 0)
+
+    def _init_statistics(self, scoring, k1, b, corpus_doc_freq, corpus_size):
+        """Set up scoring parameters and role statistics from role_counts"""
+        self.scoring = _check_scoring(scoring or DEFAULT_SCORING)
+        self.k1 = k1
+        self.b = b
+        self.role_doc_freq = np.bincount(self.role_counts.indices, minlength=len(self.vocabulary)).astype(np.float64)
+        self.role_lengths = np.asarray(self.role_counts.sum(axis=1)).ravel()
+        self.corpus_doc_freq = corpus_doc_freq
+        self.corpus_size = corpus_size
+        # Corpus statistics the IDF-based engines are derived from
+        self._weights_doc_freq = corpus_doc_freq
+        self.weights_corpus_size = corpus_size
+        self.stats_version = 0
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def updated(self, job_data, changed_roles):
+        """
+        Return a matcher for job_data that reuses rows of unchanged roles
+        
+        Only roles in `changed_roles` (or not previously known) are
+        re-tokenized; new terms are appended to the existing vocabulary so
+        unchanged rows keep their column ids. Resume corpus statistics carry
+        over (new terms start with no corpus occurrences). The current
+        matcher is left untouched, so callers holding it keep a consistent
+        view.
+        """
+        vocabulary = dict(self.vocabulary)
+        row_of = {role: i for i, role in enumerate(self.roles)}
+        old = self.role_counts
+        data, indices, indptr = [], [], [0]
+
+        for role, skills in job_data.items():
+            i = row_of.get(role)
+            if i is not None and role not in changed_roles:
+                start, stop = old.indptr[i], old.indptr[i + 1]
+                data.extend(old.data[start:stop])
+                indices.extend(old.indices[start:stop])
+            else:
+                for term, count in Counter(self._analyzer(" ".join(skills).lower())).items():
+                    indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                    data.append(float(count))
+            indptr.append(len(indices))
+
+        matcher = RoleMatcher.__new__(RoleMatcher)
+        matcher.roles = list(job_data.keys())
+        matcher.vectorizer = self.vectorizer
+        matcher.vocabulary = vocabulary
+        matcher._analyzer = self._analyzer
+        matcher.role_counts = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(matcher.roles), len(vocabulary))
+        )
+
+        corpus_doc_freq = np.zeros(len(vocabulary))
+        corpus_doc_freq[:len(self.corpus_doc_freq)] = self.corpus_doc_freq
+        matcher._init_statistics(self.scoring, self.k1, self.b, corpus_doc_freq, self.corpus_size)
+        return matcher
+
+    def add_documents(self, texts):
+        """
+        Count resumes into the document frequencies used by TF-IDF and BM25
+
+        Only the per-term frequencies are updated here, at the cost of
+        tokenizing the texts. Once the corpus has grown by
+        CORPUS_REFRESH_FRACTION of the documents behind the current weights,
+        the TF-IDF/BM25 role weights are dropped and re-derived (one pass over
+        the role x term matrix, no re-tokenization or refit) the next time an
+        IDF-based engine scores. Until then scores, and cached matches keyed
+        by weights_corpus_size, stay valid. With many roles this amortizes
+        the re-derivation over thousands of resumes.
+
+        Returns:
+            int: Number of resumes in the corpus
+        """
+        vocabulary = self.vocabulary
+        columns = []
+        added = 0
+        for text in texts:
+            columns.extend({column for column in map(vocabulary.get, self._analyzer(text)) if column is not None})
+            added += 1
+
+        doc_freq = np.bincount(np.asarray(columns, dtype=np.int64), minlength=len(vocabulary))
+        with self._lock:
+            # Swap in new arrays so concurrent scorers never see a partial update
+            self.corpus_doc_freq = self.corpus_doc_freq + doc_freq
+            self.corpus_size += added
+            growth = self.corpus_size - self.weights_corpus_size
+            if growth >= CORPUS_REFRESH_FRACTION * (len(self.roles) + self.weights_corpus_size):
+                self._refresh_weights()
+        return self.corpus_size
+
+    def refresh_weights(self):
+        """Re-derive the TF-IDF/BM25 weights from the current corpus statistics on next use"""
+        with self._lock:
+            self._refresh_weights()
+
+    def _refresh_weights(self):
+        # Caller holds the lock
+        self._weights_doc_freq = self.corpus_doc_freq
+        self.weights_corpus_size = self.corpus_size
+        self.stats_version += 1
+        self._engines = {"cosine": self._engines["cosine"]} if "cosine" in self._engines else {}
+
+    def idf(self, scoring=None):
+        """Return per-term IDF over the roles plus the resume corpus the weights are derived from"""
+        scoring = _check_scoring(scoring or self.scoring)
+        n_documents = len(self.roles) + self.weights_corpus_size
+        doc_freq = self.role_doc_freq + self._weights_doc_freq
+        if scoring == "bm25":
+            return np.log1p((n_documents - doc_freq + 0.5) / (doc_freq + 0.5))
+        # Smoothed IDF, as in scikit-learn's TfidfTransformer
+        return np.log((1 + n_documents) / (1 + doc_freq)) + 1
+
+    def _engine(self, scoring):
+        """Return the _ScoringEngine for a scoring mode, deriving it on first use"""
+        engine = self._engines.get(scoring)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            engine = self._engines.get(scoring)
+            if engine is not None:
+                return engine
+
+            with timer(f"match.weights.{scoring}"):
+                counts = self.role_counts
+                if scoring == "cosine":
+                    engine = _ScoringEngine(normalize(counts, norm="l2", copy=True).tocsr())
+                elif scoring == "tfidf":
+                    idf = self.idf("tfidf")
+                    weighted = counts.copy()
+                    weighted.data *= idf[weighted.indices]
+                    n_documents = len(self.roles) + self.weights_corpus_size
+                    engine = _ScoringEngine(normalize(weighted, norm="l2", copy=False).tocsr(), idf.tolist(),
+                                            math.log(1 + n_documents) + 1)
+                else:
+                    idf = self.idf("bm25")
+                    weighted = counts.copy()
+                    lengths = np.repeat(self.role_lengths, np.diff(counts.indptr))
+                    average_length = self.role_lengths.mean() if len(self.role_lengths) else 1.0
+                    tf = weighted.data
+                    weighted.data = idf[weighted.indices] * tf * (self.k1 + 1) / (
+                        tf + self.k1 * (1 - self.b + self.b * lengths / average_length)
+                    )
+                    # A resume containing every role term scores exactly 1
+                    self_scores = np.asarray(weighted.sum(axis=1)).ravel()
+                    self_scores[self_scores == 0] = 1.0
+                    weighted.data /= np.repeat(self_scores, np.diff(weighted.indptr))
+                    engine = _ScoringEngine(weighted)
+
+            self._engines[scoring] = engine
+            return engine
+
+    @property
+    def role_matrix(self):
+        """Role x term weights of the default scoring engine"""
+        return self._engine(self.scoring).weights
+
+    def transform(self, texts, scoring=None):
+        """
+        Vectorize resumes into a sparse document x term matrix
+
+        For cosine and TF-IDF, rows are restricted to the role vocabulary but
+        divided by the norm of the *full* resume term weights, which keeps
+        cosine scores identical to a pairwise CountVectorizer fit on
+        [resume, job_description]. For BM25 a row marks which role terms
+        the resume contains.
+        """
+        with timer("match.vectorize"):
+            return self.transform_counts((Counter(self._analyzer(text)) for text in texts), scoring)
+
+    def transform_counts(self, term_counts, scoring=None):
+        """Vectorize precomputed {term: count} mappings (see transform)"""
+        scoring = _check_scoring(scoring or self.scoring)
+        engine = self._engine(scoring)
+        term_weights, oov_weight = engine.term_weights, engine.oov_weight
+        data, indices, indptr = [], [], [0]
+        vocabulary = self.vocabulary
+
+        for counts in term_counts:
+            if scoring == "bm25":
+                for term in counts:
+                    column = vocabulary.get(term)
+                    if column is not None:
+                        indices.append(column)
+                        data.append(1.0)
+            elif term_weights is None:
+                norm = math.sqrt(sum(c * c for c in counts.values()))
+                if norm:
+                    for term, count in counts.items():
+                        column = vocabulary.get(term)
+                        if column is not None:
+                            indices.append(column)
+                            data.append(count / norm)
+            else:
+                weights = {}
+                squares = 0.0
+                for term, count in counts.items():
+                    column = vocabulary.get(term)
+                    weight = count * (term_weights[column] if column is not None else oov_weight)
+                    squares += weight * weight
+                    if column is not None:
+                        weights[column] = weight
+                norm = math.sqrt(squares)
+                if norm:
+                    for column, weight in weights.items():
+                        indices.append(column)
+                        data.append(weight / norm)
+            indptr.append(len(indices))
+
+        return sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self.vocabulary))
+        )
+
+    def score(self, resume_text, scoring=None):
+        """Return similarity (0-1) of one resume against every role"""
+        scoring = _check_scoring(scoring or self.scoring)
+        vector = self.transform([resume_text], scoring)
+        with timer("match.score"):
+            return (vector @ self._engine(scoring).postings).toarray().ravel()
+
+    def accumulator(self, scoring=None):
+        """Return a MatchAccumulator for scoring text that arrives in pieces"""
+        return MatchAccumulator(self, scoring)
+
+    def match(self, resume_text, scoring=None):
+        """Return job matches sorted by similarity percentage (highest first)"""
+        return self.matches_from_scores(self.score(resume_text, scoring))
+
+    def matches_from_scores(self, scores):
+        """Turn a vector of role similarities into sorted job match dicts"""
+        job_matches = [
+            {"job": job_title, "similarity": round(float(similarity) * 100, 2)}
+            for job_title, similarity in zip(self.roles, scores)
+        ]
+        job_matches.sort(key=lambda x: x["similarity"], reverse=True)
+        return job_matches
+
+    def top_k(self, resume_text, k=5, scoring=None):
+        """
+        Return only the k best job matches
+
+        The resume is scored against every role with one sparse product and
+        only the roles that can reach the top k are ranked, instead of
+        sorting the whole catalog. The result is identical to
+        match(resume_text, scoring)[:k].
+
+        A MaxScore-style term-at-a-time walk was measured slower here (about
+        20-26 ms against 4-5 ms per resume at 50k roles, benchmark.py): its
+        threshold checks scan every role, and the sparse product is already
+        proportional to the postings of the resume's terms.
+
+        Args:
+            resume_text (str): Resume text (lowercased like for match)
+            k (int): Number of roles to return
+            scoring (str): "cosine", "tfidf" or "bm25" (None for the matcher default)
+
+        Returns:
+            list: Up to k job match dicts, highest first
+        """
+        k = max(0, min(int(k), len(self.roles)))
+        if k == 0:
+            return []
+        scores = self.score(resume_text, scoring)
+        with timer("match.top_k"):
+            return self._top_matches(scores, k)
+
+    def _top_matches(self, scores, k, candidates=None):
+        """
+        Return the k best job match dicts of one score vector, ranked like match()
+
+        `candidates` may hold any k roles with the highest scores (e.g. from a
+        batched argpartition); they are found here otherwise.
+        """
+        n_roles = len(scores)
+        if k < n_roles:
+            if candidates is None:
+                candidates = np.argpartition(-scores, k - 1)[:k]
+            # argpartition picks arbitrarily among roles tying with the k-th
+            # best (after rounding), so take all of them
+            columns = np.flatnonzero(scores >= scores[candidates].min() - _RANK_MARGIN)
+        else:
+            columns = np.arange(n_roles)
+        similarities = np.zeros(len(columns))
+        positive = np.flatnonzero(scores[columns] > 0)
+        similarities[positive] = [round(float(score) * 100, 2) for score in scores[columns[positive]]]
+        # Highest similarity first, ties broken by catalog order, as in match()
+        ranking = np.lexsort((columns, -similarities))[:k]
+        return [{"job": self.roles[columns[i]], "similarity": float(similarities[i])} for i in ranking]
+
+    def match_many(self, resume_texts, top_k=None, chunk_size=1024, scoring=None):
+        """
+        Rank roles for many resumes with one sparse matrix multiply per chunk
+
+        Args:
+            resume_texts (list): Resume texts to score
+            top_k (int): Number of best roles to keep per resume (None keeps all)
+            chunk_size (int): Resumes densified at a time, bounds peak memory
+            scoring (str): "cosine", "tfidf" or "bm25" (None for the matcher default)
+
+        Returns:
+            list: One list of job matches per resume, highest first
+        """
+        scoring = _check_scoring(scoring or self.scoring)
+        n_roles = len(self.roles)
+        k = n_roles if top_k is None else max(0, min(int(top_k), n_roles))
+        if k == 0:
+            return [[] for _ in resume_texts]
+
+        postings = self._engine(scoring).postings
+        results = []
+
+        for start in range(0, len(resume_texts), chunk_size):
+            documents = self.transform(resume_texts[start:start + chunk_size], scoring)
+            with timer("match.score"):
+                scores = (documents @ postings).toarray()
+
+            if k < n_roles:
+                candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                results.extend(self._top_matches(row, k, columns) for row, columns in zip(scores, candidates))
+            else:
+                results.extend(self._top_matches(row, k) for row in scores)
+
+        return results
+
+class _ScoringEngine:
+    """
+    Role weights of one scoring engine
+
+    `postings` is the transposed term x role matrix, i.e. the inverted index
+    from each term to the roles that use it.
+    `term_weights`/`oov_weight` scale resume counts (TF-IDF only).
+    """
+    __slots__ = ("weights", "postings", "term_weights", "oov_weight")
+
+    def __init__(self, weights, term_weights=None, oov_weight=1.0):
+        self.weights = weights
+        self.postings = weights.T.tocsr()
+        self.term_weights = term_weights
+        self.oov_weight = oov_weight
+
+class MatchAccumulator:
+    """
+    Running term counts for a resume that is extracted page by page
+    
+    Each page is tokenized once as it arrives; `matches()` scores the counts
+    gathered so far, so partial results are available before extraction ends.
+    """
+
+    def __init__(self, matcher, scoring=None):
+        self.matcher = matcher
+        self.scoring = _check_scoring(scoring or matcher.scoring)
+        self.counts = Counter()
+
+    def feed(self, text):
+        """Add the terms of a piece of resume text"""
+        self.counts.update(self.matcher._analyzer(text))
+
+    def scores(self):
+        """Return similarity (0-1) of the text so far against every role"""
+        vector = self.matcher.transform_counts([self.counts], self.scoring)
+        with timer("match.score"):
+            return (vector @ self.matcher._engine(self.scoring).postings).toarray().ravel()
+
+    def matches(self):
+        """Return job matches for the text so far, highest first"""
+        return self.matcher.matches_from_scores(self.scores())
+
+def _check_scoring(scoring):
+    """Validate a scoring engine name"""
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring {scoring!r}; expected one of {', '.join(SCORING_MODES)}")
+    return scoring
+
+def build_role_matcher(job_data, normalizer=None):
+    """Build a RoleMatcher for the given job data, or None if unavailable"""
+    if not HAS_SKLEARN:
+        return None
+
+    try:
+        with timer("catalog.build_matcher"):
+            return RoleMatcher(job_data, normalizer=normalizer)
+    except Exception as e:
+        logger.warning("Error building role matcher: %s", e)
+        return None
+
+# Skill tokens keep trailing + and # so "c++" and "c#" survive tokenization
+SKILL_TOKEN_PATTERN = re.compile(r"\w+[+#]*")
+
+def tokenize_skills_text(text, normalizer=None):
+    """Split text into lowercase tokens used for skill matching, rewriting aliases if a normalizer is given"""
+    tokens = SKILL_TOKEN_PATTERN.findall(text.lower())
+    return normalizer.normalize(tokens) if normalizer is not None else tokens
+
+# Alias table shipped with the package: {canonical skill: [aliases]}
+DEFAULT_ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_aliases.json")
+
+def load_skill_aliases(path=None):
+    """
+    Load the skill alias table
     
+    Args:
+        path (str): JSON file mapping canonical skills to alias lists (defaults
+            to RESUME_AI_SKILL_ALIASES, then data/skill_aliases.json)
+    
+    Returns:
+        dict: {canonical skill: [aliases]}, empty if the file is missing or invalid
+    """
+    path = path or os.environ.get("RESUME_AI_SKILL_ALIASES") or DEFAULT_ALIASES_PATH
     try:
-        # Reset file pointer to beginning
-        uploaded_file.seek(0)
-        
-        # Read PDF bytes
-        pdf_bytes = uploaded_file.read()
-        
-        # Open PDF from bytes
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        with open(path, "r", encoding="utf-8") as f:
+            aliases = json.load(f)
+        logger.info("Loaded aliases for %d skills", len(aliases))
+        return aliases
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning("Error loading skill aliases: %s", e)
+        return {}
+
+class SkillNormalizer:
+    """
+    Rewrites skill aliases to their canonical tokens ("k8s" -> "kubernetes")
+    
+    The alias table is compiled once into a token trie whose leaves hold the
+    canonical token sequence, so normalizing is part of the tokenization
+    pass: one dict lookup per token, plus a short walk only where an alias
+    starts. The cost does not depend on the number of roles or aliases.
+    Longest aliases win ("restful api" before "restful"), and canonical
+    phrases are kept intact so "node js" is not partly rewritten.
+    
+    A normalizer is compiled for one tokenizer; `for_tokenizer` recompiles
+    the same table for another (e.g. the role matcher's analyzer).
+    """
+
+    _END = ""
+
+    def __init__(self, aliases=None, tokenize=None):
+        self.aliases = dict(aliases or {})
+        self.tokenize = tokenize
+        self.fingerprint = catalog_fingerprint(self.aliases)[:8] if self.aliases else ""
+        self._trie = {}
+
+        reference = lambda text: SKILL_TOKEN_PATTERN.findall(text.lower())
+        split = tokenize or reference
+        for canonical, names in self.aliases.items():
+            target = tuple(split(canonical))
+            if not target:
+                continue
+            if len(target) > 1:
+                self._insert(target, target)
+            for name in names:
+                tokens = tuple(split(name))
+                # A tokenizer that drops part of an alias ("r language" -> "language"
+                # under scikit-learn's analyzer) would turn common words into skills
+                if len(tokens) != len(reference(name)):
+                    logger.debug("Alias %r does not survive this tokenizer; skipped", name)
+                    continue
+                if tokens and tokens != target:
+                    self._insert(tokens, target)
+
+    def _insert(self, tokens, target):
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if self._END in node and node[self._END] != target:
+            logger.debug("Alias %r already maps to %r", " ".join(tokens), " ".join(node[self._END]))
+            return
+        node[self._END] = target
+
+    def __bool__(self):
+        return bool(self._trie)
+
+    def for_tokenizer(self, tokenize):
+        """Compile the same alias table for a different tokenizer, skipping aliases it splits differently"""
+        return SkillNormalizer(self.aliases, tokenize)
+
+    def normalize(self, tokens):
+        """Return the token list with every alias replaced by its canonical tokens"""
+        trie = self._trie
+        if not trie:
+            return tokens
+
+        end = self._END
+        out = []
+        n = len(tokens)
+        position = 0
+        while position < n:
+            token = tokens[position]
+            node = trie.get(token)
+            if node is None:
+                out.append(token)
+                position += 1
+                continue
+
+            # Longest alias starting here
+            target, length = None, 0
+            cursor = position + 1
+            while True:
+                if end in node:
+                    target, length = node[end], cursor - position
+                if cursor >= n:
+                    break
+                node = node.get(tokens[cursor])
+                if node is None:
+                    break
+                cursor += 1
+
+            if target is None:
+                out.append(token)
+                position += 1
+            else:
+                out.extend(target)
+                position += length
+        return out
+
+    def __call__(self, text):
+        """Tokenize and normalize text (usable as a scikit-learn analyzer)"""
+        return self.normalize(self.tokenize(text))
+
+_skill_normalizer = None
+_skill_normalizer_lock = threading.Lock()
+
+def get_skill_normalizer():
+    """Return the shared SkillNormalizer, loading the alias table on first use"""
+    global _skill_normalizer
+    if _skill_normalizer is None:
+        with _skill_normalizer_lock:
+            if _skill_normalizer is None:
+                _skill_normalizer = SkillNormalizer(load_skill_aliases())
+    return _skill_normalizer
+
+def set_skill_aliases(aliases):
+    """
+    Replace the shared alias table and rebuild the catalog's skill indexes
+    
+    Args:
+        aliases: {canonical skill: [aliases]}, a JSON file path, or None to disable
+    """
+    global _skill_normalizer
+    if isinstance(aliases, (str, os.PathLike)):
+        aliases = load_skill_aliases(aliases)
+    with _skill_normalizer_lock:
+        _skill_normalizer = SkillNormalizer(aliases)
+    if _job_catalog is not None:
+        _job_catalog.set_normalizer(_skill_normalizer)
+    return _skill_normalizer
+
+class SkillIndex:
+    """
+    Phrase matcher for every skill in the job catalog
+    
+    All role skills are compiled once into a token trie, so one linear pass
+    over a resume finds every skill occurrence, including multi-word and
+    punctuated skills such as "machine learning", "rest api" or "node.js".
+    Tokens pass through the optional SkillNormalizer first, so aliases such
+    as "nodejs" or "sklearn" find their canonical skills.
+    `skill_to_roles` is the inverted index from a normalized skill key to
+    the roles that require it.
+    """
+
+    # Trie nodes map tokens to child nodes; this key marks the end of a skill
+    _END = ""
+
+    def __init__(self, job_data, normalizer=None):
+        self.normalizer = normalizer
+        self._trie = {}
+        self.max_phrase_length = 0
+        self.skill_to_roles = {}
+        self.role_skills = {}
+
+        for role, skills in job_data.items():
+            self.add_role(role, skills)
+
+    def add_role(self, role, skills):
+        """Index the skills of a role (replacing any previous entry)"""
+        if role in self.role_skills:
+            self.remove_role(role)
+
+        entries = []
+        for skill in skills:
+            key = self.add_skill(skill)
+            entries.append((skill, key))
+            if key:
+                self.skill_to_roles.setdefault(key, []).append(role)
+        self.role_skills[role] = entries
+
+    def remove_role(self, role):
+        """Drop a role from the index, unmarking skills no other role needs"""
+        for _, key in self.role_skills.pop(role, ()):
+            roles = self.skill_to_roles.get(key)
+            if not roles:
+                continue
+            roles = [r for r in roles if r != role]
+            if roles:
+                self.skill_to_roles[key] = roles
+            else:
+                del self.skill_to_roles[key]
+                node = self._trie
+                for token in key.split(" "):
+                    node = node.get(token, {})
+                node.pop(self._END, None)
+
+    def add_skill(self, skill):
+        """Insert a skill phrase into the trie and return its normalized key"""
+        tokens = self.tokenize(skill)
+        if not tokens:
+            return ""
+
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        key = " ".join(tokens)
+        node[self._END] = key
+        self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+        return key
+
+    def tokenize(self, text):
+        """Tokenize text for matching against this index, with aliases normalized"""
+        return tokenize_skills_text(text, self.normalizer)
+
+    def find_tokens(self, tokens):
+        """Return the set of skill keys occurring in a token sequence"""
+        found = set()
+        trie = self._trie
+        end = self._END
+        n = len(tokens)
+
+        for start in range(n):
+            node = trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                if end in node:
+                    found.add(node[end])
+                if position >= n:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+
+        return found
+
+    def count_tokens(self, tokens):
+        """Return a Counter of how often each skill key occurs in a token sequence"""
+        counts = Counter()
+        trie = self._trie
+        end = self._END
+        n = len(tokens)
+
+        for start in range(n):
+            node = trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                if end in node:
+                    counts[node[end]] += 1
+                if position >= n:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+
+        return counts
+
+    def find_skills(self, text):
+        """Return the set of skill keys occurring anywhere in text"""
+        with timer("skills.find"):
+            return self.find_tokens(self.tokenize(text))
+
+    def role_counts(self, found):
+        """Return {role: number of its skills present} for a set of found keys"""
+        counts = Counter()
+        for key in found:
+            counts.update(self.skill_to_roles.get(key, ()))
+        return counts
+
+    def split_skills(self, role, found):
+        """Return (present, missing) original skill names of role given found keys"""
+        present, missing = [], []
+        for skill, key in self.role_skills.get(role, ()):
+            (present if key and key in found else missing).append(skill)
+        return present, missing
+
+def catalog_fingerprint(job_data):
+    """Return a stable hash of the job data, used to key cached match results"""
+    payload = json.dumps(job_data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+class JobCatalog:
+    """
+    Lazily loaded, hot-reloadable job role catalog
+    
+    The file may be JSON or a compiled catalog (see compiled_catalog.py),
+    which is memory-mapped instead of parsed. Nothing is read until the
+    catalog is first used. Afterwards the file's
+    mtime is checked at most every `reload_interval` seconds and the file is
+    re-parsed only when its content hash changes. On reload, the skill index
+    is patched in place for changed roles and the role matcher is rebuilt
+    from its unchanged rows, so derived indexes never need a full refit.
+    """
+
+    def __init__(self, path=None, reload_interval=1.0):
+        self.path = path or os.environ.get("RESUME_AI_CATALOG") or DEFAULT_CATALOG_PATH
+        self.reload_interval = reload_interval
+        self.version = 0
+        self._lock = threading.RLock()
+        self._data = None
+        self._fingerprint = None
+        self._mtime = None
+        self._digest = None
+        self._last_check = 0.0
+        self._skill_index = None
+        self._matcher = None
+        self._matcher_stale = True
+        self._normalizer = None
+
+    def _read(self):
+        """Return (mtime, read-only buffer) of the catalog file, or (None, None) if missing"""
+        try:
+            with open(self.path, "rb") as f:
+                mtime = os.fstat(f.fileno()).st_mtime_ns
+                try:
+                    return mtime, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # Empty files cannot be mapped
+                    return mtime, f.read()
+        except OSError:
+            return None, None
+
+    def reload(self, force=False):
+        """Re-read the catalog file if it changed since the last load"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._data is not None and now - self._last_check < self.reload_interval:
+                return False
+            self._last_check = now
+
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if not force and self._data is not None and mtime == self._mtime:
+                return False
+
+            with timer("catalog.read"):
+                mtime, buffer = self._read()
+            digest = hashlib.sha256(buffer).hexdigest() if buffer is not None else None
+            self._mtime = mtime
+            if self._data is not None and digest == self._digest:
+                return False
+            self._digest = digest
+
+            if buffer is None:
+                logger.warning("Using default job data")
+                self._apply(DEFAULT_JOB_DATA, catalog_fingerprint(DEFAULT_JOB_DATA))
+                return True
+
+            try:
+                with timer("catalog.load"):
+                    if is_compiled_catalog(buffer):
+                        # Compiled catalogs stay memory-mapped and are decoded on access
+                        data = CompiledCatalog(buffer)
+                        logger.info("Loaded %d job roles from compiled catalog", len(data))
+                    else:
+                        data = json.loads(bytes(buffer).decode("utf-8"))
+                        logger.info("Loaded %d job roles from JSON", len(data))
+                        if isinstance(buffer, mmap.mmap):
+                            buffer.close()
+            except Exception as e:
+                logger.warning("Error loading job data: %s", e)
+                if self._data is not None:
+                    return False
+                self._apply(DEFAULT_JOB_DATA, catalog_fingerprint(DEFAULT_JOB_DATA))
+                return True
+
+            self._apply(data, digest[:16])
+            return True
+
+    def _apply(self, data, fingerprint):
+        """Swap in new catalog data and update derived indexes incrementally"""
+        old = self._data or {}
+        changed = {role for role, skills in data.items() if old.get(role) != skills}
+        removed = [role for role in old if role not in data]
+
+        reordered = bool(changed or removed) or list(old) != list(data)
+
+        if self._skill_index is not None:
+            for role in removed:
+                self._skill_index.remove_role(role)
+            for role in changed:
+                self._skill_index.add_role(role, data[role])
+            if reordered:
+                # Keep role_skills in catalog order; the per-request loops iterate it
+                role_skills = self._skill_index.role_skills
+                self._skill_index.role_skills = {role: role_skills[role] for role in data}
+
+        if self._matcher is not None and reordered:
+            try:
+                self._matcher = self._matcher.updated(data, changed)
+            except Exception as e:
+                logger.warning("Error updating role matcher: %s", e)
+                self._matcher_stale = True
         
-        # Extract text from all pages
-        text = ""
+        self._data = data
+        self._fingerprint = fingerprint
+        self.version += 1
+
+    @property
+    def data(self):
+        """Mapping of role -> list of skills (JOB_DATA)"""
+        self.reload()
+        return self._data
+
+    @property
+    def normalizer(self):
+        """SkillNormalizer applied by the skill index and role matcher"""
+        if self._normalizer is None:
+            self._normalizer = get_skill_normalizer()
+        return self._normalizer
+
+    def set_normalizer(self, normalizer):
+        """Switch alias tables, rebuilding the skill index and matcher on next use"""
+        with self._lock:
+            self._normalizer = normalizer
+            self._skill_index = None
+            self._matcher = None
+            self._matcher_stale = True
+
+    @property
+    def fingerprint(self):
+        """Hash of the current catalog contents (and alias table, if any)"""
+        self.reload()
+        alias_fingerprint = self.normalizer.fingerprint
+        return f"{self._fingerprint}-{alias_fingerprint}" if alias_fingerprint else self._fingerprint
+
+    @property
+    def skill_index(self):
+        """SkillIndex over all role skills, built on first use"""
+        self.reload()
+        with self._lock:
+            if self._skill_index is None:
+                with timer("catalog.build_skill_index"):
+                    self._skill_index = SkillIndex(self._data, self.normalizer)
+            return self._skill_index
+
+    @property
+    def matcher(self):
+        """RoleMatcher over all roles (None without scikit-learn), built on first use"""
+        self.reload()
+        with self._lock:
+            if self._matcher_stale:
+                self._matcher = build_role_matcher(self._data, self.normalizer)
+                self._matcher_stale = False
+            return self._matcher
+
+_job_catalog = None
+_job_catalog_lock = threading.Lock()
+
+def get_job_catalog():
+    """Return the process-wide job catalog, creating it on first use"""
+    global _job_catalog
+    if _job_catalog is None:
+        with _job_catalog_lock:
+            if _job_catalog is None:
+                _job_catalog = JobCatalog()
+    return _job_catalog
+
+def set_catalog_path(path, reload_interval=1.0):
+    """Point the shared job catalog at an explicit file"""
+    global _job_catalog
+    with _job_catalog_lock:
+        _job_catalog = JobCatalog(path, reload_interval=reload_interval)
+    return _job_catalog
+
+def __getattr__(name):
+    """Resolve catalog-derived module attributes lazily (PEP 562)"""
+    if name == "JOB_DATA":
+        return get_job_catalog().data
+    if name == "ROLE_MATCHER":
+        return get_job_catalog().matcher
+    if name == "SKILL_INDEX":
+        return get_job_catalog().skill_index
+    if name == "CATALOG_FINGERPRINT":
+        return get_job_catalog().fingerprint
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class AnalysisCache:
+    """
+    Bounded LRU cache for extracted text and match results
+    
+    Entries are keyed by strings derived from the SHA-256 of the PDF bytes, so
+    the same resume hits the cache regardless of filename or session. When
+    `cache_dir` is set every entry is also written there as JSON, which lets
+    results survive restarts and be shared between worker processes.
+    """
+
+    def __init__(self, max_entries=256, cache_dir=None):
+        self.max_entries = max(1, int(max_entries))
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                increment("cache.hits")
+                return self._entries[key]
+
+        value = None
+        if self.cache_dir:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._remember(key, value)
+        increment("cache.misses" if value is None else "cache.hits")
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serializable value under key"""
+        with self._lock:
+            self._remember(key, value)
+
+        if self.cache_dir:
+            # Write atomically so concurrent readers never see partial files
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(value, f, ensure_ascii=False)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                logger.warning("Could not write cache entry %s: %s", key, e)
+
+    def clear(self):
+        """Drop all in-memory entries (the on-disk store is left untouched)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+_analysis_cache = AnalysisCache(
+    max_entries=int(os.environ.get("RESUME_AI_CACHE_SIZE", 256)),
+    cache_dir=os.environ.get("RESUME_AI_CACHE_DIR") or None
+)
+
+def configure_cache(max_entries=256, cache_dir=None):
+    """Replace the shared analysis cache (max_entries=0 disables caching)"""
+    global _analysis_cache
+    _analysis_cache = AnalysisCache(max_entries, cache_dir) if max_entries else None
+    return _analysis_cache
+
+def get_analysis_cache():
+    """Return the shared analysis cache, or None if caching is disabled"""
+    return _analysis_cache
+
+def pdf_content_hash(pdf_bytes):
+    """Return the SHA-256 hex digest identifying a PDF's content"""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+# Pages handed to one worker task when splitting a document across processes
+PAGES_PER_TASK = 8
+
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+def _get_process_pool(workers):
+    """Return a shared process pool with the given number of workers"""
+    with _process_pools_lock:
+        pool = _process_pools.get(workers)
+        if pool is None:
+            # Callers (the API server, Streamlit) are multithreaded, where fork is unsafe
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _process_pools[workers] = pool
+        return pool
+
+def shutdown_process_pools(wait=True):
+    """Shut down the shared extraction process pools (new ones are created on next use)"""
+    with _process_pools_lock:
+        pools = list(_process_pools.values())
+        _process_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+atexit.register(shutdown_process_pools)
+
+def read_pdf_bytes(uploaded_file):
+    """
+    Return the contents of a PDF source as a bytes-like object, avoiding copies
+    
+    Filesystem paths are memory-mapped, bytes/memoryview/mmap/bytearray are
+    used as-is and in-memory uploads (BytesIO, Streamlit's UploadedFile) are
+    exposed through getbuffer(). Only other file-like objects are read().
+    """
+    if isinstance(uploaded_file, (bytes, memoryview)):
+        return uploaded_file
+    if isinstance(uploaded_file, (bytearray, mmap.mmap)):
+        return memoryview(uploaded_file)
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        with open(uploaded_file, "rb") as f:
+            try:
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:
+                # Empty files cannot be mapped
+                return f.read()
+    
+    getbuffer = getattr(uploaded_file, "getbuffer", None)
+    if getbuffer is not None:
+        return getbuffer()
+    
+    uploaded_file.seek(0)
+    return uploaded_file.read()
+
+def _pool_payload(uploaded_file, pdf_bytes):
+    """Return what worker processes should open: the file path if there is one, else bytes"""
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        return os.fspath(uploaded_file)
+    return pdf_bytes if isinstance(pdf_bytes, bytes) else bytes(pdf_bytes)
+
+def open_pdf(pdf_source):
+    """Open a PDF from a filesystem path or a bytes-like buffer"""
+    with timer("pdf.open"):
+        if isinstance(pdf_source, str):
+            return fitz.open(pdf_source)
+        return fitz.open(stream=pdf_source, filetype="pdf")
+
+def _count_pdf_pages(pdf_source):
+    """Return the number of pages in a PDF"""
+    with open_pdf(pdf_source) as doc:
+        return doc.page_count
+
+def _extract_page_range(pdf_source, start, stop):
+    """Extract text for pages [start, stop) of a PDF (runs in worker processes)"""
+    with open_pdf(pdf_source) as doc:
+        return [doc[page_num].get_text("text") for page_num in range(start, stop)]
+
+def _split_pages(page_count, chunks):
+    """Split page indices into at most `chunks` contiguous (start, stop) ranges"""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def _join_pages(page_texts, max_chars=None):
+    """Join extracted page texts into the cleaned resume text"""
+    text = "".join(page_texts)
+    if max_chars is not None:
+        text = text[:max_chars]
+    text = text.strip()
+    increment("pdf.characters", len(text))
+    logger.debug("Total extracted: %d characters", len(text))
+    return text if text else "ERROR: No text found in PDF"
+
+def limits_key(max_pages=None, max_chars=None):
+    """Cache key suffix distinguishing extractions made under page/char limits"""
+    if max_pages is None and max_chars is None:
+        return ""
+    return f"-p{max_pages}-c{max_chars}"
+
+def _iter_pages_from_bytes(pdf_bytes, max_pages=None, max_chars=None):
+    """Yield (page number, page text) from PDF bytes, stopping at the limits"""
+    remaining = max_chars
+    with open_pdf(pdf_bytes) as doc:
         for page_num, page in enumerate(doc):
-            page_text = page.get_text("text")
-            text += page_text
-            print(f"Page {page_num + 1}: Extracted {len(page_text)} characters")
-        
-        doc.close()
-        
-        # Clean and return text
-        text = text.strip()
-        print(f"✅ Total extracted: {len(text)} characters")
-        
-        return text if text else "ERROR: No text found in PDF"
+            if max_pages is not None and page_num >= max_pages:
+                break
+            
+            with timer("pdf.page"):
+                page_text = page.get_text("text")
+            increment("pdf.pages")
+            if remaining is not None:
+                page_text = page_text[:remaining]
+                remaining -= len(page_text)
+            logger.debug("Page %d: Extracted %d characters", page_num + 1, len(page_text))
+            yield page_num + 1, page_text
+            
+            if remaining is not None and remaining <= 0:
+                break
+
+def _extract_text_from_bytes(pdf_bytes, workers=None, max_pages=None, max_chars=None, uploaded_file=None):
+    """Extract text from raw PDF bytes, optionally across worker processes"""
+    try:
+        with timer("pdf.extract"):
+            if workers and workers > 1:
+                page_count = _count_pdf_pages(pdf_bytes)
+                if max_pages is not None:
+                    page_count = min(page_count, max_pages)
+                page_ranges = _split_pages(page_count, workers)
+                pool = _get_process_pool(workers)
+                payload = _pool_payload(uploaded_file, pdf_bytes)
+                futures = [pool.submit(_extract_page_range, payload, start, stop) for start, stop in page_ranges]
+                increment("pdf.pages", page_count)
+                return _join_pages((page_text for future in futures for page_text in future.result()), max_chars)
+            
+            # Extract text page by page on the calling thread
+            return _join_pages(page_text for _, page_text in _iter_pages_from_bytes(pdf_bytes, max_pages, max_chars))
         
     except Exception as e:
         error_msg = f"ERROR extracting PDF: {str(e)}"
-        print(error_msg)
+        logger.error(error_msg)
+        return error_msg
+
+def _cached_text(pdf_bytes, digest, workers=None, max_pages=None, max_chars=None, uploaded_file=None):
+    """Return extracted text for PDF bytes, consulting the shared cache first"""
+    cache = _analysis_cache
+    key = f"{digest}{limits_key(max_pages, max_chars)}.text"
+    if cache is not None:
+        text = cache.get(key)
+        if text is not None:
+            return text
+    
+    text = _extract_text_from_bytes(pdf_bytes, workers, max_pages, max_chars, uploaded_file)
+    if cache is not None and not text.startswith("ERROR"):
+        cache.put(key, text)
+    return text
+
+def extract_text_from_pdf(uploaded_file, workers=None, max_pages=None, max_chars=None):
+    """
+    Extract text from uploaded PDF file using PyMuPDF
+    
+    Args:
+        uploaded_file: File-like PDF object, filesystem path or bytes-like buffer
+        workers (int): Split pages across this many processes (None or 1 for serial)
+        max_pages (int): Stop after this many pages (None for all)
+        max_chars (int): Stop once this many characters are extracted (None for all)
+    
+    Returns:
+        str: Extracted text, or a message starting with "ERROR"
+    """
+    if not HAS_PYMUPDF:
+        return "ERROR: PyMuPDF not installed. Install with: pip install PyMuPDF"
+    
+    try:
+        pdf_bytes = read_pdf_bytes(uploaded_file)
+    except Exception as e:
+        error_msg = f"ERROR extracting PDF: {str(e)}"
+        logger.error(error_msg)
         return error_msg
+    
+    return _cached_text(pdf_bytes, pdf_content_hash(pdf_bytes), workers, max_pages, max_chars, uploaded_file)
 
-def analyze_resume(uploaded_file):
-    """Analyze resume and find matching job roles"""
+def iter_pdf_pages(uploaded_file, max_pages=None, max_chars=None):
+    """
+    Yield (page number, page text) as each page of a PDF is parsed
+    
+    Args:
+        uploaded_file: File-like PDF object, filesystem path or bytes-like buffer
+        max_pages (int): Stop after this many pages (None for all)
+        max_chars (int): Stop once this many characters are yielded (None for all)
+    """
+    if not HAS_PYMUPDF:
+        raise RuntimeError("PyMuPDF not installed. Install with: pip install PyMuPDF")
+    
+    yield from _iter_pages_from_bytes(read_pdf_bytes(uploaded_file), max_pages, max_chars)
+
+def extract_texts_from_pdfs(uploaded_files, workers=None, pages_per_task=PAGES_PER_TASK,
+                            max_pages=None, max_chars=None):
+    """
+    Extract text from many PDFs across a process pool
+    
+    Every document is split into tasks of at most `pages_per_task` pages, so
+    both many small resumes and a few very long ones keep all workers busy.
+    
+    Args:
+        uploaded_files (iterable): File-like PDF objects, paths or bytes-like buffers
+        workers (int): Number of worker processes (None or 1 for serial)
+        pages_per_task (int): Maximum pages extracted by one task
+        max_pages (int): Pages extracted per document at most (None for all)
+        max_chars (int): Characters kept per document at most (None for all)
+    
+    Returns:
+        list: Extracted text (or "ERROR..." message) per file, in input order
+    """
+    if not HAS_PYMUPDF:
+        return ["ERROR: PyMuPDF not installed. Install with: pip install PyMuPDF" for _ in uploaded_files]
+    
+    if not workers or workers <= 1:
+        return [
+            extract_text_from_pdf(uploaded_file, max_pages=max_pages, max_chars=max_chars)
+            for uploaded_file in uploaded_files
+        ]
+    
+    pool = _get_process_pool(workers)
+    cache = _analysis_cache
+    limits = limits_key(max_pages, max_chars)
+    results = []
+    pending = []
+    
+    # Submit every page range of every uncached document before waiting on any of them
+    for uploaded_file in uploaded_files:
+        try:
+            pdf_bytes = read_pdf_bytes(uploaded_file)
+            digest = pdf_content_hash(pdf_bytes)
+            text = cache.get(f"{digest}{limits}.text") if cache is not None else None
+            if text is not None:
+                results.append(text)
+                continue
+            
+            page_count = _count_pdf_pages(pdf_bytes)
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            chunks = -(-page_count // max(1, pages_per_task))
+            payload = _pool_payload(uploaded_file, pdf_bytes)
+            futures = [
+                pool.submit(_extract_page_range, payload, start, stop)
+                for start, stop in _split_pages(page_count, chunks)
+            ]
+            increment("pdf.pages", page_count)
+            pending.append((len(results), digest, futures))
+            results.append(None)
+        except Exception as e:
+            error_msg = f"ERROR extracting PDF: {str(e)}"
+            logger.error(error_msg)
+            results.append(error_msg)
+    
+    for index, digest, futures in pending:
+        try:
+            results[index] = _join_pages((page_text for future in futures for page_text in future.result()), max_chars)
+            if cache is not None and not results[index].startswith("ERROR"):
+                cache.put(f"{digest}{limits}.text", results[index])
+        except Exception as e:
+            error_msg = f"ERROR extracting PDF: {str(e)}"
+            logger.error(error_msg)
+            results[index] = error_msg
+    
+    return results
+
+def _matches_key(digest, max_pages, max_chars, catalog, scoring, top_k=None):
+    """Cache key for job matches of a PDF under the current catalog and scoring engine"""
+    key = f"{digest}{limits_key(max_pages, max_chars)}-{catalog.fingerprint}"
+    if scoring != "cosine":
+        # IDF-based scores shift whenever the weights are re-derived from a grown corpus
+        matcher = catalog.matcher
+        key += f"-{scoring}-n{matcher.weights_corpus_size if matcher is not None else 0}"
+    if top_k is not None:
+        key += f"-top{top_k}"
+    return f"{key}.matches"
+
+def analyze_resume(uploaded_file, workers=None, max_pages=None, max_chars=None, scoring=None, update_corpus=False,
+                   top_k=None):
+    """
+    Analyze resume and find matching job roles
+    
+    Args:
+        uploaded_file: File-like PDF object, filesystem path or bytes-like buffer
+        workers (int): Split pages across this many processes (None or 1 for serial)
+        max_pages (int): Stop after this many pages (None for all)
+        max_chars (int): Stop once this many characters are extracted (None for all)
+        scoring (str): "cosine", "tfidf" or "bm25" (None for DEFAULT_SCORING)
+        update_corpus (bool): Add the resume to the corpus statistics before scoring it
+            (results served from the cache are not counted again); the IDF weights
+            follow in batches, see RoleMatcher.add_documents
+        top_k (int): Return only the best top_k roles, skipping the full ranking (None for all)
+    
+    Returns:
+        tuple: (resume_text, job_matches)
+    """
+    scoring = _check_scoring(scoring or DEFAULT_SCORING)
+    
+    if not HAS_PYMUPDF:
+        return extract_text_from_pdf(uploaded_file), []
+    
+    try:
+        pdf_bytes = read_pdf_bytes(uploaded_file)
+    except Exception as e:
+        error_msg = f"ERROR extracting PDF: {str(e)}"
+        logger.error(error_msg)
+        return error_msg, []
+    
+    # Return straight from the cache when this exact PDF was analyzed before
+    digest = pdf_content_hash(pdf_bytes)
+    catalog = get_job_catalog()
+    cache = _analysis_cache
+    if cache is not None:
+        cached_matches = cache.get(_matches_key(digest, max_pages, max_chars, catalog, scoring, top_k))
+        if cached_matches is not None:
+            resume_text = _cached_text(pdf_bytes, digest, workers, max_pages, max_chars, uploaded_file)
+            return resume_text, [dict(job) for job in cached_matches]
     
     # Extract text from PDF
-    resume_text = extract_text_from_pdf(uploaded_file)
+    resume_text = _cached_text(pdf_bytes, digest, workers, max_pages, max_chars, uploaded_file)
     
     # Check for errors
     if not resume_text or resume_text.startswith("ERROR"):
         return resume_text, []
     
     # Check if sklearn is available for similarity analysis
-    if not HAS_SKLEARN:
-        print("⚠️ scikit-learn not available, using simple keyword matching")
-        return resume_text, simple_job_matching(resume_text)
+    matcher = catalog.matcher
+    if matcher is None:
+        logger.warning("scikit-learn not available, using simple keyword matching")
+        job_matches = simple_job_matching(resume_text)
+        if top_k is not None:
+            job_matches = job_matches[:top_k]
+    else:
+        if update_corpus:
+            matcher.add_documents([resume_text.lower()])
+        if top_k is not None:
+            # Rank only the roles that can reach the top k
+            job_matches = matcher.top_k(resume_text.lower(), top_k, scoring)
+        else:
+            # Score the resume against every role in one sparse product
+            job_matches = matcher.match(resume_text.lower(), scoring)
+    increment("resumes.analyzed")
     
-    # Perform cosine similarity analysis
-    resume_lower = resume_text.lower()
+    if cache is not None:
+        cache.put(_matches_key(digest, max_pages, max_chars, catalog, scoring, top_k), [dict(job) for job in job_matches])
+    
+    logger.debug("Found %d job matches", len(job_matches))
+    return resume_text, job_matches
+
+def analyze_resume_stream(uploaded_file, max_pages=None, max_chars=None, scoring=None):
+    """
+    Analyze a resume while it is being extracted
+    
+    Pages are parsed one at a time and fed into an incremental term counter,
+    so callers can show provisional matches before the whole PDF is read.
+    
+    Args:
+        uploaded_file: File-like PDF object, filesystem path or bytes-like buffer
+        max_pages (int): Stop after this many pages (None for all)
+        max_chars (int): Stop once this many characters are extracted (None for all)
+        scoring (str): "cosine", "tfidf" or "bm25" (None for DEFAULT_SCORING)
+    
+    Yields:
+        dict: {"page", "characters", "matches", "done"} after every page; the
+        final update has done=True and the full "text" (or an "ERROR..." text
+        and no matches if extraction failed)
+    """
+    catalog = get_job_catalog()
+    matcher = catalog.matcher
+    accumulator = matcher.accumulator(scoring or DEFAULT_SCORING) if matcher is not None else None
+    skill_index = catalog.skill_index
+    found_skills = set()
+    page_texts = []
+    characters = 0
     job_matches = []
     
-    for job_title, skills in JOB_DATA.items():
-        try:
-            # Create job description from skills
-            job_description = " ".join(skills).lower()
-            
-            # Calculate cosine similarity
-            vectorizer = CountVectorizer()
-            vectors = vectorizer.fit_transform([resume_lower, job_description])
-            similarity = cosine_similarity(vectors)[0][1]
-            
-            # Convert to percentage
-            similarity_percentage = round(similarity * 100, 2)
+    try:
+        for page_num, page_text in iter_pdf_pages(uploaded_file, max_pages, max_chars):
+            page_texts.append(page_text)
+            characters += len(page_text)
             
-            job_matches.append({
-                "job": job_title,
-                "similarity": similarity_percentage
-            })
+            if accumulator is not None:
+                accumulator.feed(page_text)
+                job_matches = accumulator.matches()
+            else:
+                found_skills |= skill_index.find_skills(page_text)
+                job_matches = _keyword_matches(catalog, found_skills)
             
-        except Exception as e:
-            print(f"Error processing {job_title}: {e}")
-            continue
+            yield {"page": page_num, "characters": characters, "matches": job_matches, "done": False}
+    except Exception as e:
+        error_msg = f"ERROR extracting PDF: {str(e)}"
+        logger.error(error_msg)
+        yield {"page": len(page_texts), "characters": characters, "matches": [], "done": True, "text": error_msg}
+        return
     
-    # Sort by similarity (highest first)
-    job_matches.sort(key=lambda x: x["similarity"], reverse=True)
+    resume_text = _join_pages(page_texts)
+    if resume_text.startswith("ERROR"):
+        job_matches = []
     
-    print(f"✅ Found {len(job_matches)} job matches")
-    return resume_text, job_matches
+    yield {"page": len(page_texts), "characters": characters, "matches": job_matches, "done": True, "text": resume_text}
+
+def analyze_resumes(uploaded_files, top_k=5, workers=None, max_pages=None, max_chars=None, scoring=None,
+                    update_corpus=False):
+    """
+    Analyze many resumes and rank job roles for each in one batch
+    
+    Args:
+        uploaded_files (iterable): File-like PDF objects, paths or bytes-like buffers
+        top_k (int): Number of best roles to return per resume (None for all)
+        workers (int): Worker processes for PDF extraction (None or 1 for serial)
+        max_pages (int): Pages extracted per resume at most (None for all)
+        max_chars (int): Characters kept per resume at most (None for all)
+        scoring (str): "cosine", "tfidf" or "bm25" (None for DEFAULT_SCORING)
+        update_corpus (bool): Add the batch to the corpus statistics before scoring (the IDF
+            weights follow in batches, see RoleMatcher.add_documents)
+    
+    Returns:
+        list: (resume_text, job_matches) tuples in input order
+    """
+    scoring = _check_scoring(scoring or DEFAULT_SCORING)
+    resume_texts = extract_texts_from_pdfs(uploaded_files, workers=workers, max_pages=max_pages, max_chars=max_chars)
+    valid = [i for i, text in enumerate(resume_texts) if text and not text.startswith("ERROR")]
+    results = [(text, []) for text in resume_texts]
+    
+    if not valid:
+        return results
+    
+    valid_texts = [resume_texts[i].lower() for i in valid]
+    catalog = get_job_catalog()
+    matcher = catalog.matcher
+    
+    if matcher is None:
+        logger.warning("scikit-learn not available, using simple keyword matching")
+        batch_matches = [simple_job_matching(text) for text in valid_texts]
+        if top_k is not None:
+            batch_matches = [matches[:top_k] for matches in batch_matches]
+    else:
+        if update_corpus:
+            matcher.add_documents(valid_texts)
+        batch_matches = matcher.match_many(valid_texts, top_k=top_k, scoring=scoring)
+    
+    for i, job_matches in zip(valid, batch_matches):
+        results[i] = (resume_texts[i], job_matches)
+    increment("resumes.analyzed", len(valid))
+    
+    logger.info("Scored %d/%d resumes against %d job roles", len(valid), len(resume_texts), len(catalog.data))
+    return results
 
 def simple_job_matching(resume_text):
     """Simple keyword-based matching (fallback when sklearn not available)"""
-    resume_lower = resume_text.lower()
-    resume_words = set(re.findall(r'\b\w+\b', resume_lower))
+    # One pass over the resume finds every skill, then the inverted index
+    # turns the hits into per-role counts
+    catalog = get_job_catalog()
+    return _keyword_matches(catalog, catalog.skill_index.find_skills(resume_text))
+
+def _keyword_matches(catalog, found_skills):
+    """Rank roles by the share of their skills present in found_skills"""
+    role_counts = catalog.skill_index.role_counts(found_skills)
     
     job_matches = []
     
-    for job_title, skills in JOB_DATA.items():
+    # role_skills is already decoded, unlike catalog.data for compiled catalogs
+    for job_title, skills in catalog.skill_index.role_skills.items():
         # Count matching skills
-        matching_skills = sum(1 for skill in skills if skill.lower() in resume_words)
+        matching_skills = role_counts.get(job_title, 0)
         total_skills = len(skills)
         
         # Calculate percentage
@@ -167,7 +1604,8 @@ def suggest_improvements(resume_text, target_role):
         }
     
     # Get required skills for the role
-    required_skills = JOB_DATA.get(target_role, [])
+    catalog = get_job_catalog()
+    required_skills = catalog.data.get(target_role, [])
     
     if not required_skills:
         return {
@@ -177,12 +1615,14 @@ def suggest_improvements(resume_text, target_role):
             "missing_skills": []
         }
     
-    # Extract words from resume
-    resume_words = set(re.findall(r'\b\w+\b', resume_text.lower()))
-    
-    # Find present and missing skills
-    present_skills = [skill for skill in required_skills if skill.lower() in resume_words]
-    missing_skills = [skill for skill in required_skills if skill.lower() not in resume_words]
+    # Find present and missing skills, including multi-word phrases
+    skill_index = catalog.skill_index
+    found_skills = skill_index.find_skills(resume_text)
+    return _skill_gap_report(skill_index, target_role, required_skills, found_skills)
+
+def _skill_gap_report(skill_index, target_role, required_skills, found_skills):
+    """Build the suggest_improvements result for one role from found skill keys"""
+    present_skills, missing_skills = skill_index.split_skills(target_role, found_skills)
     
     # Determine status
     if len(present_skills) > len(missing_skills):
@@ -204,15 +1644,45 @@ def suggest_improvements(resume_text, target_role):
         "match_percentage": round((len(present_skills) / len(required_skills)) * 100, 2) if required_skills else 0
     }
 
+def suggest_improvements_all(resume_text):
+    """
+    Analyze skill gaps for every job role in a single pass
+    
+    The resume is tokenized and scanned once; each role's result is then
+    built from the shared set of found skills.
+    
+    Args:
+        resume_text (str): Extracted resume text
+    
+    Returns:
+        dict: {role: suggest_improvements result} for every role with skill data
+    """
+    catalog = get_job_catalog()
+    skill_index = catalog.skill_index
+    found_skills = skill_index.find_skills(resume_text)
+    
+    with timer("gaps.report_all"):
+        return {
+            role: _skill_gap_report(skill_index, role, required_skills, found_skills)
+            for role, required_skills in skill_index.role_skills.items()
+            if required_skills
+        }
+
 def get_all_job_roles():
     """Return sorted list of all available job roles"""
-    return sorted(list(JOB_DATA.keys()))
+    return sorted(list(get_job_catalog().data.keys()))
 
 def get_module_info():
     """Return information about loaded modules and data"""
+    catalog = get_job_catalog()
+    job_roles = list(catalog.data.keys())
     return {
         "pymupdf_available": HAS_PYMUPDF,
         "sklearn_available": HAS_SKLEARN,
-        "total_job_roles": len(JOB_DATA),
-        "job_roles": list(JOB_DATA.keys())
+        "catalog_path": catalog.path,
+        "catalog_version": catalog.version,
+        "scoring": DEFAULT_SCORING,
+        "skill_aliases": len(catalog.normalizer.aliases),
+        "total_job_roles": len(job_roles),
+        "job_roles": job_roles
     }
@@ -0,0 +1,401 @@
+"""
+Structured Resume Parser
+
+Segments a resume into sections (summary, experience, education, skills,
+projects, ...) and extracts entities from them: dates and date ranges,
+degrees, schools and employers. The result is a small `__slots__` document
+model, so later stages can work on the sections they need (e.g. the report
+summary) instead of rescanning the full text.
+
+PDFs are parsed from PyMuPDF's layout data ("dict" text blocks): besides the
+standard heading names, lines set noticeably larger than the body font, or in
+bold capitals, start a section. Plain text (already extracted or pasted) is
+segmented on the standard heading names alone.
+
+Usage:
+    document = parse_resume_pdf("resume.pdf")
+    document.section_text("experience", "projects")
+    [entity.text for entity in document.entities("employer")]
+"""
+import re
+import logging
+from collections import Counter
+
+from resume_ai import (
+    HAS_PYMUPDF, get_analysis_cache, pdf_content_hash, read_pdf_bytes, open_pdf, limits_key
+)
+from instrumentation import timer, increment
+
+logger = logging.getLogger(__name__)
+
+# Bump when parsing changes so cached documents are rebuilt
+PARSER_VERSION = 2
+
+# Section name -> regex for the headings that introduce it
+SECTION_HEADINGS = {
+    "summary": r"(?:professional\s+|career\s+)?summary|profile|objective|career\s+objective|about\s+me",
+    "experience": r"(?:work\s+|professional\s+|relevant\s+)?experience|employment(?:\s+history)?|work\s+history|internships?",
+    "education": r"education(?:al\s+background)?|academic\s+background|academics",
+    "skills": r"(?:technical\s+|core\s+|key\s+)?skills(?:\s+(?:&|and)\s+\w+)?|technologies|competencies|tech\s+stack",
+    "projects": r"(?:academic\s+|personal\s+|key\s+)?projects",
+    "certifications": r"certifications?|licenses?(?:\s+(?:&|and)\s+certifications?)?|courses",
+    "achievements": r"achievements|awards(?:\s+(?:&|and)\s+\w+)?|honou?rs",
+}
+
+# Sections the report summary is drawn from, in order
+SUMMARY_SECTIONS = ("summary", "experience", "projects", "skills", "education")
+
+_HEADING = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_HEADINGS.items()), re.IGNORECASE
+)
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_YEAR = r"(?:19|20)\d{2}"
+_DATE = rf"(?:{_MONTH}\s+{_YEAR}|\d{{1,2}}/{_YEAR}|{_YEAR})"
+
+_DATE_RANGE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|present|current|now|today)\b", re.IGNORECASE
+)
+_SINGLE_DATE = re.compile(rf"\b(?:{_MONTH}\s+{_YEAR}|\d{{1,2}}/{_YEAR})\b", re.IGNORECASE)
+_YEAR_IN = re.compile(_YEAR)
+
+_DEGREE = re.compile(
+    r"\b(?:(?i:bachelor|master|doctor)(?:'?s)?(?:\s+(?:of|in)\s+[A-Za-z&]+(?:\s+(?:of|in|and|&)?\s*[A-Z][A-Za-z&]*)*)?"
+    r"|(?i:associate)(?:'?s)?\s+degree|(?i:diploma)\s+in\s+[A-Za-z]+(?:\s+[A-Z][A-Za-z]*)*)"
+    r"|\b(?:Ph\.?\s?D|MBA|B\.?\s?Sc|M\.?\s?Sc|B\.?\s?S|M\.?\s?S|B\.?\s?Tech|M\.?\s?Tech|B\.?\s?E|M\.?\s?E|B\.?\s?A|M\.?\s?A)\.?"
+    r"(?:\s+(?:in\s+)?[A-Z][A-Za-z&]*(?:\s+[A-Z][A-Za-z&]*)*)?(?=[\s,;|()]|$)"
+)
+_SCHOOL = re.compile(
+    r"[A-Z][\w&.'-]*(?:\s+(?:of|for|and|&|[A-Z][\w&.'-]*))*\s+(?:University|College|Institute|School|Academy)"
+    r"(?:\s+of\s+[A-Z][\w&.'-]*(?:\s+[A-Z][\w&.'-]*)*)?"
+    r"|(?:University|College|Institute)\s+of\s+[A-Z][\w&.'-]*(?:\s+(?:and\s+)?[A-Z][\w&.'-]*)*"
+)
+_COMPANY = re.compile(
+    r"[A-Z][\w&.'-]*(?:\s+[A-Z][\w&.'-]*)*,?\s+(?:Inc|LLC|Ltd|Corp|Corporation|Technologies|Solutions|Labs|Systems"
+    r"|Group|GmbH|Limited|Company|Co|Pvt\.?\s+Ltd)\b\.?"
+)
+_AT_COMPANY = re.compile(r"\b(?:at|@)\s+([A-Z][\w&.'-]*(?:\s+[A-Z][\w&.'-]*)*)")
+_SEPARATORS = re.compile(r"\s*(?:\||•|·|,|\s[-–—]\s)\s*")
+_JOB_TITLE_WORDS = re.compile(
+    r"\b(?:engineer|developer|manager|analyst|intern|scientist|consultant|designer|lead|architect|specialist"
+    r"|assistant|director|administrator|officer|associate|coordinator|programmer|researcher|head|trainee)\b",
+    re.IGNORECASE
+)
+
+# Headings are short; longer lines in a large font are names or slogans
+MAX_HEADING_WORDS = 5
+
+# Font size relative to the body text from which a line counts as a heading
+HEADING_SIZE_RATIO = 1.15
+
+class Entity:
+    """
+    A value extracted from one section
+
+    `kind` is "date", "degree", "school" or "employer". Dates carry the years
+    they span in `start` and `end`; `end` is None for ranges that run to the
+    present.
+    """
+    __slots__ = ("kind", "text", "section", "start", "end")
+
+    def __init__(self, kind, text, section, start=None, end=None):
+        self.kind = kind
+        self.text = text
+        self.section = section
+        self.start = start
+        self.end = end
+
+    def to_dict(self):
+        return {"kind": self.kind, "text": self.text, "start": self.start, "end": self.end}
+
+    def __repr__(self):
+        return f"Entity({self.kind!r}, {self.text!r})"
+
+class Section:
+    """A run of lines under one heading ("header" for the lines before the first heading)"""
+    __slots__ = ("name", "heading", "lines", "entities")
+
+    def __init__(self, name, heading="", lines=None, entities=None):
+        self.name = name
+        self.heading = heading
+        self.lines = lines if lines is not None else []
+        self.entities = entities if entities is not None else []
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "heading": self.heading,
+            "lines": self.lines,
+            "entities": [entity.to_dict() for entity in self.entities],
+        }
+
+    def __repr__(self):
+        return f"Section({self.name!r}, {len(self.lines)} lines)"
+
+class ResumeDocument:
+    """
+    Sections of a parsed resume in reading order
+
+    `source` is "layout" when fonts were available and "text" otherwise. A
+    name may occur more than once (e.g. "Experience" and "Internships").
+    """
+    __slots__ = ("sections", "source")
+
+    def __init__(self, sections, source="text"):
+        self.sections = sections
+        self.source = source
+
+    @property
+    def text(self):
+        """The resume text, headings included"""
+        parts = []
+        for section in self.sections:
+            if section.heading:
+                parts.append(section.heading)
+            parts.extend(section.lines)
+        return "\n".join(parts)
+
+    @property
+    def section_names(self):
+        return list(dict.fromkeys(section.name for section in self.sections))
+
+    def get(self, name):
+        """Return the first section called `name`, or None"""
+        for section in self.sections:
+            if section.name == name:
+                return section
+        return None
+
+    def section_text(self, *names):
+        """Return the text of every section with one of `names`, in reading order"""
+        return "\n".join(section.text for section in self.sections if section.name in names and section.lines)
+
+    def entities(self, kind=None):
+        """Return every entity, or those of one kind, in reading order"""
+        return [
+            entity for section in self.sections for entity in section.entities if kind is None or entity.kind == kind
+        ]
+
+    def summary(self, max_words=200):
+        """
+        Return up to `max_words` words summarizing the candidate
+
+        Taken from the summary section first, then experience, projects,
+        skills and education; the full text is used when none was found.
+        """
+        words = []
+        for name in SUMMARY_SECTIONS:
+            words.extend(self.section_text(name).split())
+        if not words:
+            words = self.text.split()
+        if len(words) > max_words:
+            return " ".join(words[:max_words]) + "..."
+        return " ".join(words)
+
+    def to_dict(self):
+        return {
+            "version": PARSER_VERSION,
+            "source": self.source,
+            "sections": [section.to_dict() for section in self.sections],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sections = []
+        for item in data["sections"]:
+            section = Section(item["name"], item["heading"], list(item["lines"]))
+            section.entities = [
+                Entity(entity["kind"], entity["text"], section.name, entity["start"], entity["end"])
+                for entity in item["entities"]
+            ]
+            sections.append(section)
+        return cls(sections, data.get("source", "text"))
+
+    def __repr__(self):
+        return f"ResumeDocument({self.source!r}, sections={self.section_names!r})"
+
+def heading_name(line):
+    """Return the section a heading line introduces, or None if it is not a standard heading"""
+    match = _HEADING.fullmatch(line.strip().rstrip(":").strip())
+    return match.lastgroup if match else None
+
+def _looks_like_heading(text, size, bold, body_size):
+    """Layout rule for headings with non-standard names"""
+    if len(text.split()) > MAX_HEADING_WORDS or text.endswith((".", ",")) or any(ch.isdigit() for ch in text):
+        return False
+    if size >= body_size * HEADING_SIZE_RATIO:
+        return True
+    return bold and text.isupper()
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_") or "other"
+
+def _year(text):
+    match = _YEAR_IN.search(text)
+    return int(match.group()) if match else None
+
+def _dates(section_name, text):
+    entities = []
+    taken = []
+    for match in _DATE_RANGE.finditer(text):
+        end = match.group("end")
+        entities.append(Entity("date", match.group().strip(), section_name, _year(match.group("start")), _year(end)))
+        taken.append(match.span())
+    for match in _SINGLE_DATE.finditer(text):
+        if any(start <= match.start() < stop for start, stop in taken):
+            continue
+        year = _year(match.group())
+        entities.append(Entity("date", match.group(), section_name, year, year))
+    return entities
+
+def _employers(section_name, line):
+    """Employer names in one experience line"""
+    names = [match.group().rstrip(",") for match in _COMPANY.finditer(line)]
+    names.extend(match.group(1) for match in _AT_COMPANY.finditer(line))
+
+    # "Acme Corp | Backend Developer | Jan 2020 - Present": the part that is neither title nor date
+    if not names and _DATE_RANGE.search(line):
+        parts = [part for part in _SEPARATORS.split(_DATE_RANGE.sub("", line)) if part]
+        if len(parts) >= 2:
+            names.extend(
+                part for part in parts
+                if part[0].isupper() and not _JOB_TITLE_WORDS.search(part) and not _SINGLE_DATE.search(part)
+            )
+    return [Entity("employer", name.strip(), section_name) for name in names]
+
+def _extract_entities(sections):
+    """Fill in the entities of every section"""
+    has_education = any(section.name == "education" for section in sections)
+    for section in sections:
+        seen = set()
+        entities = []
+        education = section.name == "education" or (not has_education and section.name != "header")
+        for line in section.lines:
+            found = _dates(section.name, line)
+            if education:
+                found.extend(Entity("degree", m.group().strip(), section.name) for m in _DEGREE.finditer(line))
+                found.extend(Entity("school", m.group().strip(), section.name) for m in _SCHOOL.finditer(line))
+            if section.name == "experience":
+                found.extend(_employers(section.name, line))
+            for entity in found:
+                if (entity.kind, entity.text) not in seen:
+                    seen.add((entity.kind, entity.text))
+                    entities.append(entity)
+        section.entities = entities
+
+def _segment(lines, body_size=None):
+    """
+    Split (text, size, bold) lines into sections
+
+    Without a body font size (plain text) only standard heading names start
+    sections.
+    """
+    sections = []
+    current = Section("header")
+    for text, size, bold in lines:
+        text = text.strip()
+        if not text:
+            continue
+        name = heading_name(text)
+        # Before the first section large lines are usually the candidate's name
+        if name is None and body_size and current.name != "header" and _looks_like_heading(text, size, bold, body_size):
+            name = _slug(text)
+        if name is None:
+            current.lines.append(text)
+            continue
+        if current.lines or current.heading:
+            sections.append(current)
+        current = Section(name, text)
+    if current.lines or current.heading:
+        sections.append(current)
+
+    _extract_entities(sections)
+    return sections
+
+def parse_resume_text(resume_text):
+    """
+    Parse extracted resume text into a ResumeDocument
+
+    Args:
+        resume_text (str): Extracted or pasted resume text
+
+    Returns:
+        ResumeDocument: Sections found on standard heading names
+    """
+    with timer("parse.text"):
+        sections = _segment((line, 0.0, False) for line in resume_text.splitlines())
+    return ResumeDocument(sections, "text")
+
+def _layout_lines(doc, max_pages=None, max_chars=None):
+    """Return (text, font size, bold) per layout line and the body font size"""
+    lines = []
+    sizes = Counter()
+    remaining = max_chars
+    for page_num, page in enumerate(doc):
+        if max_pages is not None and page_num >= max_pages:
+            break
+        for block in page.get_text("dict")["blocks"]:
+            if block.get("type") != 0:
+                continue
+            for line in block["lines"]:
+                spans = [span for span in line["spans"] if span["text"].strip()]
+                if not spans:
+                    continue
+                text = "".join(span["text"] for span in line["spans"])
+                if remaining is not None:
+                    text = text[:remaining]
+                    remaining -= len(text)
+                size = max(span["size"] for span in spans)
+                # Flag bit 4 marks bold text; some fonts only say so in their name
+                bold = all(span["flags"] & 16 or "bold" in span["font"].lower() for span in spans)
+                for span in spans:
+                    sizes[round(span["size"], 1)] += len(span["text"])
+                lines.append((text, size, bold))
+                if remaining is not None and remaining <= 0:
+                    return lines, _body_size(sizes)
+    return lines, _body_size(sizes)
+
+def _body_size(sizes):
+    """The font size most of the characters are set in"""
+    return sizes.most_common(1)[0][0] if sizes else None
+
+def parse_resume_pdf(uploaded_file, max_pages=None, max_chars=None):
+    """
+    Parse a PDF resume into a ResumeDocument using its font layout
+
+    Documents are memoized per PDF hash in the shared analysis cache.
+
+    Args:
+        uploaded_file: File-like PDF object, filesystem path or bytes-like buffer
+        max_pages (int): Stop after this many pages (None for all)
+        max_chars (int): Stop once this many characters are parsed (None for all)
+
+    Returns:
+        ResumeDocument: Parsed sections and entities
+    """
+    if not HAS_PYMUPDF:
+        raise RuntimeError("PyMuPDF not installed. Install with: pip install PyMuPDF")
+
+    pdf_bytes = read_pdf_bytes(uploaded_file)
+    cache = get_analysis_cache()
+    key = None
+    if cache is not None:
+        key = f"{pdf_content_hash(pdf_bytes)}{limits_key(max_pages, max_chars)}-v{PARSER_VERSION}.parsed"
+        data = cache.get(key)
+        if data is not None:
+            return ResumeDocument.from_dict(data)
+
+    with timer("parse.layout"):
+        with open_pdf(pdf_bytes) as doc:
+            lines, body_size = _layout_lines(doc, max_pages, max_chars)
+        document = ResumeDocument(_segment(lines, body_size), "layout")
+    increment("parse.documents")
+    logger.debug("Parsed %d sections: %s", len(document.sections), document.section_names)
+
+    if key is not None:
+        cache.put(key, document.to_dict())
+    return document
@@ -0,0 +1,434 @@
+"""
+Persistent Resume Store
+
+Keeps every analyzed resume in a local SQLite database together with the
+skills found in it and its score against every role, so recruiters can
+search the pool ("top 50 candidates for Data Scientist") without parsing a
+single PDF again.
+
+Everything is indexed when a resume is added, inside one transaction:
+
+    resumes        text, name, source, content hash, ATS base score
+    resume_skills  (resume, skill, mentions), indexed by skill
+    role_scores    (resume, role, similarity, skill match), indexed by
+                   (role, similarity DESC) and (role, skill_match DESC)
+    resumes_fts    FTS5 full-text index over the text, or a plain
+                   (term, resume) inverted index where SQLite lacks FTS5
+
+so a ranked query for one role is a single index range scan. Resumes are
+keyed by the SHA-256 of their text; adding one again is a no-op unless the
+catalog changed since it was scored (see `rescore`).
+
+Usage:
+    store = ResumeStore("resumes.db")
+    store.add_resume(resume_text, name="jane_doe.pdf")
+    store.top_candidates("Data Scientist", limit=50)
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import Counter
+
+from resume_ai import get_job_catalog, tokenize_skills_text, DEFAULT_SCORING, _check_scoring
+from ats_analyzer import ats_profile
+from instrumentation import timer, increment
+
+logger = logging.getLogger(__name__)
+
+# Schema version, recorded in the database's user_version
+STORE_VERSION = 1
+
+# Columns role_scores can be ranked by
+RANK_COLUMNS = ("similarity", "skill_match")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    name TEXT,
+    source TEXT,
+    text TEXT NOT NULL,
+    characters INTEGER NOT NULL,
+    ats_score INTEGER,
+    scoring TEXT NOT NULL,
+    catalog_fingerprint TEXT NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_skills (
+    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    mentions INTEGER NOT NULL,
+    PRIMARY KEY (resume_id, skill)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resume_skills_by_skill ON resume_skills (skill, resume_id);
+CREATE TABLE IF NOT EXISTS role_scores (
+    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    skill_match REAL NOT NULL,
+    PRIMARY KEY (resume_id, role)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS role_scores_by_similarity ON role_scores (role, similarity DESC);
+CREATE INDEX IF NOT EXISTS role_scores_by_skill_match ON role_scores (role, skill_match DESC);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(text, content='resumes', content_rowid='id');
+"""
+
+_TERMS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_terms (
+    term TEXT NOT NULL,
+    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (term, resume_id)
+) WITHOUT ROWID;
+"""
+
+def _has_fts5(conn):
+    """Return True if this SQLite build supports FTS5"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def text_hash(resume_text):
+    """Return the SHA-256 hex digest identifying a resume's text"""
+    return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+class ResumeStore:
+    """
+    SQLite-backed pool of analyzed resumes
+
+    One connection is shared by all threads and serialized with a lock;
+    the database runs in WAL mode so other processes can read while it is
+    written.
+
+    Args:
+        path (str): Database file (":memory:" for a throwaway store)
+        scoring (str): Scoring engine used for the stored similarities
+    """
+
+    def __init__(self, path, scoring=None):
+        self.path = path
+        self.scoring = _check_scoring(scoring or DEFAULT_SCORING)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode = WAL")
+                self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self.has_fts = _has_fts5(self._conn)
+            self._conn.executescript(_FTS_SCHEMA if self.has_fts else _TERMS_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    def _scores(self, resume_text):
+        """Return ({skill: mentions}, [(role, similarity %, skill match %)], ATS base score) for a resume"""
+        catalog = get_job_catalog()
+        skill_index = catalog.skill_index
+        skill_counts = skill_index.count_tokens(skill_index.tokenize(resume_text))
+
+        scores = {}
+        matcher = catalog.matcher
+        if matcher is not None:
+            similarities = matcher.score(resume_text, self.scoring)
+            for i in similarities.nonzero()[0]:
+                scores[matcher.roles[i]] = [round(float(similarities[i]) * 100, 2), 0.0]
+
+        for role, present in skill_index.role_counts(skill_counts.keys()).items():
+            required = len(skill_index.role_skills.get(role, ()))
+            if required:
+                scores.setdefault(role, [0.0, 0.0])[1] = round(present / required * 100, 2)
+
+        rows = [(role, similarity, skill_match) for role, (similarity, skill_match) in scores.items()]
+        return skill_counts, rows, ats_profile(resume_text)["base_score"]
+
+    def _index(self, resume_id, resume_text, skill_counts, role_rows):
+        """Write the skill, score and text index rows of one resume (caller holds a transaction)"""
+        conn = self._conn
+        conn.executemany(
+            "INSERT INTO resume_skills (resume_id, skill, mentions) VALUES (?, ?, ?)",
+            [(resume_id, skill, mentions) for skill, mentions in skill_counts.items()]
+        )
+        conn.executemany(
+            "INSERT INTO role_scores (resume_id, role, similarity, skill_match) VALUES (?, ?, ?, ?)",
+            [(resume_id, role, similarity, skill_match) for role, similarity, skill_match in role_rows]
+        )
+        if self.has_fts:
+            conn.execute("INSERT INTO resumes_fts (rowid, text) VALUES (?, ?)", (resume_id, resume_text))
+        else:
+            conn.executemany(
+                "INSERT INTO resume_terms (term, resume_id, count) VALUES (?, ?, ?)",
+                [(term, resume_id, count) for term, count in Counter(tokenize_skills_text(resume_text)).items()]
+            )
+
+    def _unindex(self, resume_id, resume_text):
+        conn = self._conn
+        conn.execute("DELETE FROM resume_skills WHERE resume_id = ?", (resume_id,))
+        conn.execute("DELETE FROM role_scores WHERE resume_id = ?", (resume_id,))
+        if self.has_fts:
+            conn.execute("INSERT INTO resumes_fts (resumes_fts, rowid, text) VALUES ('delete', ?, ?)",
+                         (resume_id, resume_text))
+        else:
+            conn.execute("DELETE FROM resume_terms WHERE resume_id = ?", (resume_id,))
+
+    def add_resume(self, resume_text, name=None, source=None):
+        """
+        Store and index an analyzed resume
+
+        Args:
+            resume_text (str): Extracted resume text
+            name (str): Display name, e.g. the uploaded file name
+            source (str): Where the resume came from, e.g. its path
+
+        Returns:
+            int: The resume id, or None for empty or "ERROR..." text
+        """
+        if not resume_text or resume_text.startswith("ERROR"):
+            return None
+
+        digest = text_hash(resume_text)
+        fingerprint = get_job_catalog().fingerprint
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, scoring, catalog_fingerprint FROM resumes WHERE content_hash = ?", (digest,)
+            ).fetchone()
+        if row is not None and row["scoring"] == self.scoring and row["catalog_fingerprint"] == fingerprint:
+            increment("store.duplicates")
+            return row["id"]
+
+        with timer("store.score"):
+            skill_counts, role_rows, ats_score = self._scores(resume_text)
+
+        with timer("store.insert"), self._lock, self._conn:
+            conn = self._conn
+            # The INSERT takes the write lock first; if another thread or process
+            # stored the same text since the lookup above, it is a no-op and the
+            # row is re-read inside this transaction
+            cursor = conn.execute(
+                "INSERT INTO resumes (content_hash, name, source, text, characters, ats_score, scoring, "
+                "catalog_fingerprint, added_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(content_hash) DO NOTHING",
+                (digest, name, source, resume_text, len(resume_text), ats_score, self.scoring, fingerprint,
+                 time.time())
+            )
+            if cursor.rowcount:
+                resume_id = cursor.lastrowid
+            else:
+                row = conn.execute(
+                    "SELECT id, scoring, catalog_fingerprint FROM resumes WHERE content_hash = ?", (digest,)
+                ).fetchone()
+                resume_id = row["id"]
+                if row["scoring"] == self.scoring and row["catalog_fingerprint"] == fingerprint:
+                    increment("store.duplicates")
+                    return resume_id
+                self._unindex(resume_id, resume_text)
+                conn.execute(
+                    "UPDATE resumes SET name = COALESCE(?, name), source = COALESCE(?, source), ats_score = ?, "
+                    "scoring = ?, catalog_fingerprint = ? WHERE id = ?",
+                    (name, source, ats_score, self.scoring, fingerprint, resume_id)
+                )
+            self._index(resume_id, resume_text, skill_counts, role_rows)
+        increment("store.resumes")
+        return resume_id
+
+    def rescore(self):
+        """
+        Re-score resumes indexed under another catalog or scoring engine
+
+        Uses the stored text, so no PDF is read. Returns the number updated.
+        """
+        fingerprint = get_job_catalog().fingerprint
+        with self._lock:
+            stale = self._conn.execute(
+                "SELECT text FROM resumes WHERE catalog_fingerprint != ? OR scoring != ?", (fingerprint, self.scoring)
+            ).fetchall()
+        for row in stale:
+            self.add_resume(row["text"])
+        return len(stale)
+
+    def top_candidates(self, role, limit=50, by="similarity", min_score=0.0):
+        """
+        Return the best stored resumes for a role
+
+        Args:
+            role (str): Job role from the catalog
+            limit (int): Candidates returned at most
+            by (str): "similarity" (role matcher) or "skill_match" (share of the role's skills)
+            min_score (float): Skip candidates scoring below this percentage
+
+        Returns:
+            list: Dicts with id, name, source, similarity, skill_match and ats_score, best first
+        """
+        if by not in RANK_COLUMNS:
+            raise ValueError(f"Unknown ranking {by!r}; expected one of: {', '.join(RANK_COLUMNS)}")
+
+        with timer("store.top_candidates"), self._lock:
+            rows = self._conn.execute(
+                f"SELECT r.id, r.name, r.source, s.similarity, s.skill_match, r.ats_score "
+                f"FROM role_scores s JOIN resumes r ON r.id = s.resume_id "
+                f"WHERE s.role = ? AND s.{by} >= ? ORDER BY s.{by} DESC, r.id LIMIT ?",
+                (role, min_score, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def candidates_with_skills(self, skills, limit=50):
+        """
+        Return resumes mentioning every one of `skills`, most mentions first
+
+        Skills are normalized like catalog skills, so aliases match too.
+        """
+        skill_index = get_job_catalog().skill_index
+        keys = list(dict.fromkeys(" ".join(skill_index.tokenize(skill)) for skill in skills))
+        keys = [key for key in keys if key]
+        if not keys:
+            return []
+
+        placeholders = ", ".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT r.id, r.name, r.source, SUM(k.mentions) AS mentions, r.ats_score "
+                f"FROM resume_skills k JOIN resumes r ON r.id = k.resume_id "
+                f"WHERE k.skill IN ({placeholders}) GROUP BY k.resume_id HAVING COUNT(*) = ? "
+                f"ORDER BY mentions DESC, r.id LIMIT ?",
+                (*keys, len(keys), limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, query, limit=50):
+        """
+        Full-text search over stored resumes
+
+        With FTS5 the query uses its syntax ("python AND kafka", "machine
+        learning") and results are ranked by bm25; otherwise resumes are
+        ranked by how often they contain the query's terms.
+
+        Returns:
+            list: Dicts with id, name, source and rank, best first
+        """
+        with timer("store.search"), self._lock:
+            if self.has_fts:
+                try:
+                    rows = self._conn.execute(
+                        "SELECT r.id, r.name, r.source, -bm25(resumes_fts) AS rank FROM resumes_fts "
+                        "JOIN resumes r ON r.id = resumes_fts.rowid WHERE resumes_fts MATCH ? "
+                        "ORDER BY bm25(resumes_fts) LIMIT ?",
+                        (query, limit)
+                    ).fetchall()
+                except sqlite3.OperationalError as e:
+                    raise ValueError(f"Invalid search query: {e}") from e
+            else:
+                terms = list(dict.fromkeys(tokenize_skills_text(query)))
+                if not terms:
+                    return []
+                placeholders = ", ".join("?" * len(terms))
+                rows = self._conn.execute(
+                    f"SELECT r.id, r.name, r.source, SUM(t.count) AS rank FROM resume_terms t "
+                    f"JOIN resumes r ON r.id = t.resume_id WHERE t.term IN ({placeholders}) "
+                    f"GROUP BY t.resume_id ORDER BY COUNT(*) DESC, rank DESC, r.id LIMIT ?",
+                    (*terms, limit)
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_resume(self, resume_id):
+        """Return a stored resume with its skills, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+            if row is None:
+                return None
+            skills = self._conn.execute(
+                "SELECT skill, mentions FROM resume_skills WHERE resume_id = ? ORDER BY mentions DESC, skill",
+                (resume_id,)
+            ).fetchall()
+        resume = dict(row)
+        resume["skills"] = {skill["skill"]: skill["mentions"] for skill in skills}
+        return resume
+
+    def remove_resume(self, resume_id):
+        """Delete a resume and its index rows; returns True if it existed"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT text FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+            if row is None:
+                return False
+            self._unindex(resume_id, row["text"])
+            self._conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+        return True
+
+    def iter_texts(self, batch_size=1000, after_id=0):
+        """Yield (id, text) of the stored resumes with ids above `after_id` in id order, `batch_size` rows at a time"""
+        last_id = after_id
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, text FROM resumes WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["id"], row["text"]
+            last_id = rows[-1]["id"]
+
+    def describe(self, resume_ids):
+        """Return {id: {"id", "name", "source", "ats_score"}} for the stored ones among `resume_ids`"""
+        resume_ids = [int(resume_id) for resume_id in resume_ids]
+        if not resume_ids:
+            return {}
+        placeholders = ", ".join("?" * len(resume_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, name, source, ats_score FROM resumes WHERE id IN ({placeholders})", resume_ids
+            ).fetchall()
+        return {row["id"]: dict(row) for row in rows}
+
+    def state(self):
+        """Return (resume count, highest id), which changes whenever resumes are added or removed"""
+        with self._lock:
+            count, max_id = self._conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM resumes").fetchone()
+        return count, max_id
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_resume_store = None
+_resume_store_lock = threading.Lock()
+
+def get_resume_store():
+    """
+    Return the shared ResumeStore, or None when storing is disabled
+
+    The store is enabled by setting RESUME_AI_STORE to a database path.
+    """
+    global _resume_store
+    if _resume_store is None:
+        path = os.environ.get("RESUME_AI_STORE")
+        if not path:
+            return None
+        with _resume_store_lock:
+            if _resume_store is None:
+                _resume_store = ResumeStore(path)
+    return _resume_store
+
+def set_resume_store(path, scoring=None):
+    """Point the shared store at a database file (None disables it)"""
+    global _resume_store
+    with _resume_store_lock:
+        if _resume_store is not None:
+            _resume_store.close()
+        _resume_store = ResumeStore(path, scoring) if path else None
+    return _resume_store
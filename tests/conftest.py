@@ -0,0 +1,33 @@
+import os
+import sys
+import json
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_ai  # noqa: E402
+
+
+@pytest.fixture
+def job_catalog(tmp_path):
+    """
+    Point the shared job catalog at a temporary JSON file
+
+    Yields a function that (re)writes the catalog and reloads it, returning
+    the JobCatalog. The default catalog is restored afterwards.
+    """
+    path = tmp_path / "job_roles.json"
+    catalog = None
+
+    def write(job_data):
+        nonlocal catalog
+        path.write_text(json.dumps(job_data), encoding="utf-8")
+        if catalog is None:
+            catalog = resume_ai.set_catalog_path(str(path), reload_interval=0)
+        catalog.reload(force=True)
+        return catalog
+
+    yield write
+    resume_ai.set_catalog_path(None)
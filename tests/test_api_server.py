@@ -0,0 +1,122 @@
+import json
+import asyncio
+
+import pytest
+
+import api_server
+from resume_ai import HAS_PYMUPDF
+
+JOB_DATA = {"Backend Developer": ["python", "sql", "docker"], "Data Analyst": ["sql", "excel", "tableau"]}
+RESUME = "Summary\nBackend developer.\nSkills\npython, sql, docker"
+
+
+def call(method, path, body=b"", query=""):
+    """Run one request through the ASGI app and return (status, headers, body)"""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(), "headers": []}
+    asyncio.run(api_server.app(scope, receive, send))
+    headers = dict(sent[0]["headers"])
+    return sent[0]["status"], headers, sent[1]["body"]
+
+
+def post_json(path, payload):
+    return call("POST", path, json.dumps(payload).encode("utf-8"))
+
+
+@pytest.fixture
+def catalog(job_catalog):
+    return job_catalog(JOB_DATA)
+
+
+def test_unknown_path_and_method(catalog):
+    assert call("GET", "/nope")[0] == 404
+    assert call("GET", "/suggest")[0] == 405
+
+
+def test_roles(catalog):
+    status, _, body = call("GET", "/roles")
+    assert status == 200
+    assert json.loads(body) == {"roles": ["Backend Developer", "Data Analyst"]}
+
+
+@pytest.mark.parametrize("payload", [
+    "not an object",
+    {},
+    {"resume_text": RESUME, "role": ["x"]},
+    {"resume_text": RESUME, "role": 3},
+])
+def test_suggest_rejects_bad_payloads(catalog, payload):
+    assert post_json("/suggest", payload)[0] == 400
+
+
+def test_suggest(catalog):
+    status, _, body = post_json("/suggest", {"resume_text": RESUME, "role": "Backend Developer"})
+    assert status == 200
+    assert json.loads(body)["match_percentage"] == 100.0
+
+
+def test_invalid_json_is_rejected(catalog):
+    assert call("POST", "/suggest", b"{not json")[0] == 400
+
+
+@pytest.mark.parametrize("payload", [
+    {"resume_text": RESUME},
+    {"resume_text": RESUME, "role": ["x"]},
+    {"resume_text": RESUME, "role": {"a": 1}},
+    {"resume_text": RESUME, "role": "Backend Developer", "username": ["x"]},
+    {"resume_text": RESUME, "role": "Backend Developer", "top_matches": "x"},
+    {"resume_text": RESUME, "role": "Backend Developer", "top_matches": [1]},
+    {"resume_text": RESUME, "role": "Backend Developer", "top_matches": [{"job": "a", "similarity": "9"}]},
+])
+def test_report_rejects_bad_payloads(catalog, payload):
+    assert post_json("/report", payload)[0] == 400
+
+
+def test_report_unknown_role(catalog):
+    assert post_json("/report", {"resume_text": RESUME, "role": "Astronaut"})[0] == 404
+
+
+def test_report_escapes_markup_in_user_text(catalog):
+    status, headers, body = post_json("/report", {
+        "resume_text": "Summary\nI <b>love</b> python & sql <unclosed\nSkills\npython",
+        "role": "Backend Developer",
+        "username": "<b>Alex",
+        "top_matches": [{"job": "<i>Backend", "similarity": 95.5}],
+    })
+    assert status == 200
+    assert headers[b"content-type"] == b"application/pdf"
+    assert body.startswith(b"%PDF")
+
+
+@pytest.mark.parametrize("query", ["max_chars=-5", "max_pages=0", "top_k=-1", "scoring=nope", "top_k=abc"])
+def test_analyze_rejects_bad_query(catalog, query):
+    assert call("POST", "/analyze", b"%PDF-1.4", query)[0] == 400
+
+
+def test_analyze_requires_body(catalog):
+    assert call("POST", "/analyze")[0] == 400
+
+
+@pytest.mark.skipif(not HAS_PYMUPDF, reason="PyMuPDF not installed")
+def test_analyze_pdf(catalog, monkeypatch):
+    from benchmark import make_resume_pdf
+    monkeypatch.setattr(api_server, "EXTRACT_WORKERS", 1)
+
+    status, _, body = call("POST", "/analyze", make_resume_pdf(RESUME, pages=1), "top_k=1&include_text=1")
+    assert status == 200
+    payload = json.loads(body)
+    assert payload["matches"][0]["job"] == "Backend Developer"
+    assert "python" in payload["resume_text"]
+
+
+def test_analyze_unreadable_pdf(catalog, monkeypatch):
+    monkeypatch.setattr(api_server, "EXTRACT_WORKERS", 1)
+    assert call("POST", "/analyze", b"definitely not a pdf")[0] == 422
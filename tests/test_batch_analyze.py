@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from resume_ai import HAS_PYMUPDF
+from batch_analyze import load_completed, run
+
+RESUME = "Summary\nBackend developer.\nExperience\nBuilt services in python and sql.\nSkills\npython, sql, docker"
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_load_completed_skips_errors_and_partial_lines(tmp_path):
+    output = tmp_path / "results.jsonl"
+    output.write_text(
+        json.dumps({"path": "/a.pdf", "status": "ok"}) + "\n"
+        + json.dumps({"path": "/b.pdf", "status": "error", "error": "ERROR: broken"}) + "\n"
+        + json.dumps({"status": "ok"}) + "\n"
+        + '{"path": "/c.pdf", "sta',
+        encoding="utf-8"
+    )
+    assert load_completed(str(output)) == {"/a.pdf"}
+    assert load_completed(str(tmp_path / "missing.jsonl")) == set()
+
+
+@pytest.fixture
+def resumes(tmp_path, job_catalog, monkeypatch):
+    from benchmark import make_resume_pdf
+
+    monkeypatch.delenv("RESUME_AI_STORE", raising=False)
+    job_catalog({"Backend Developer": ["python", "sql", "docker"], "Data Analyst": ["sql", "excel"]})
+    directory = tmp_path / "resumes"
+    directory.mkdir()
+    (directory / "good.pdf").write_bytes(make_resume_pdf(RESUME, pages=1))
+    (directory / "broken.pdf").write_bytes(b"not a pdf")
+    return directory
+
+
+@pytest.mark.skipif(not HAS_PYMUPDF, reason="PyMuPDF not installed")
+def test_rerun_skips_completed_and_retries_errors(tmp_path, resumes):
+    from benchmark import make_resume_pdf
+
+    output = str(tmp_path / "results.jsonl")
+    summary = run([str(resumes)], output, workers=1)
+    assert (summary["found"], summary["skipped"], summary["processed"], summary["errors"]) == (2, 0, 2, 1)
+    records = {record["path"]: record for record in read_records(output)}
+    good, broken = str(resumes / "good.pdf"), str(resumes / "broken.pdf")
+    assert records[good]["status"] == "ok"
+    assert records[good]["top_roles"][0]["job"] == "Backend Developer"
+    assert records[broken]["status"] == "error"
+
+    # Only the failed resume is processed again; its new record is appended
+    (resumes / "broken.pdf").write_bytes(make_resume_pdf(RESUME, pages=1))
+    summary = run([str(resumes)], output, workers=1)
+    assert (summary["skipped"], summary["processed"], summary["errors"]) == (1, 1, 0)
+    records = read_records(output)
+    assert [record["path"] for record in records] == sorted([good, broken]) + [broken]
+    assert records[-1]["status"] == "ok"
+    assert load_completed(output) == {good, broken}
+
+    # Nothing is left to do
+    summary = run([str(resumes)], output, workers=1)
+    assert (summary["skipped"], summary["processed"]) == (2, 0)
+    assert len(read_records(output)) == 3
+
+
+@pytest.mark.skipif(not HAS_PYMUPDF, reason="PyMuPDF not installed")
+def test_rerun_after_interrupted_write_terminates_partial_line(tmp_path, resumes):
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"path": "' + str(resumes / "good.pdf") + '", "sta', encoding="utf-8")
+
+    summary = run([str(resumes)], str(output), workers=1)
+    assert (summary["skipped"], summary["processed"]) == (0, 2)
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert [json.loads(line)["path"] for line in lines[1:]] == sorted(str(path) for path in resumes.iterdir())
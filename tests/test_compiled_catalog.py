@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from compiled_catalog import CompiledCatalog, compile_catalog, is_compiled_catalog, write_compiled_catalog
+
+JOB_DATA = {
+    "Data Scientist": ["python", "machine learning", "statistics", "sql"],
+    "Backend Developer": ["python", "sql", "docker", "rest api"],
+    "Développeur Frontend": ["javascript", "react", "css", "html"],
+    "Empty Role": [],
+}
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "roles.catalog"
+    write_compiled_catalog(JOB_DATA, str(path))
+    catalog = CompiledCatalog.open(str(path))
+    yield catalog
+    catalog.close()
+
+
+def test_round_trip(catalog):
+    assert catalog.to_dict() == JOB_DATA
+    assert list(catalog) == list(JOB_DATA)
+    assert len(catalog) == len(JOB_DATA)
+    assert catalog == JOB_DATA
+
+
+def test_lookups(catalog):
+    assert catalog["Développeur Frontend"] == JOB_DATA["Développeur Frontend"]
+    assert catalog.get("Astronaut") is None
+    assert "Backend Developer" in catalog
+    assert "Astronaut" not in catalog and 42 not in catalog
+    with pytest.raises(KeyError):
+        catalog["Astronaut"]
+
+
+def test_interned_skill_ids(catalog):
+    vocabulary = catalog.vocabulary
+    assert vocabulary == sorted({skill for skills in JOB_DATA.values() for skill in skills})
+    role_id = catalog.role_id("Backend Developer")
+    assert [vocabulary[i] for i in catalog.role_skill_ids(role_id)] == JOB_DATA["Backend Developer"]
+
+
+def test_items_is_a_reusable_view(catalog):
+    items = catalog.items()
+    assert len(items) == len(JOB_DATA)
+    assert ("Data Scientist", JOB_DATA["Data Scientist"]) in items
+    assert ("Data Scientist", ["java"]) not in items
+    assert list(items) == list(JOB_DATA.items())
+    assert list(items) == list(JOB_DATA.items())
+
+
+def test_compile_catalog_from_json(tmp_path):
+    json_path = tmp_path / "roles.json"
+    json_path.write_text(json.dumps(JOB_DATA), encoding="utf-8")
+
+    output = compile_catalog(str(json_path))
+    assert output == str(tmp_path / "roles.catalog")
+    with open(output, "rb") as f:
+        assert is_compiled_catalog(f.read(16))
+    catalog = CompiledCatalog.open(output)
+    try:
+        assert catalog.to_dict() == JOB_DATA
+    finally:
+        catalog.close()
+
+
+def test_not_a_catalog():
+    with pytest.raises(ValueError):
+        CompiledCatalog(b"{}" * 64)
@@ -0,0 +1,101 @@
+import os
+import json
+
+import pytest
+
+from resume_ai import HAS_SKLEARN, SCORING_MODES, JobCatalog, RoleMatcher, SkillIndex
+
+OLD_ROLES = {
+    "Data Scientist": ["Python", "Machine Learning", "SQL"],
+    "Backend Developer": ["Java", "SQL", "Docker"],
+    "Designer": ["Figma", "Sketch"],
+}
+
+# Designer removed, Backend Developer changed, Data Analyst added, order changed
+NEW_ROLES = {
+    "Data Analyst": ["SQL", "Tableau", "Excel"],
+    "Backend Developer": ["Go", "SQL", "Kubernetes"],
+    "Data Scientist": ["Python", "Machine Learning", "SQL"],
+}
+
+RESUMES = [
+    "python machine learning sql",
+    "go kubernetes sql docker",
+    "tableau excel sql reporting",
+    "figma sketch",
+    "",
+]
+
+
+def test_catalog_is_not_read_until_used(tmp_path):
+    catalog = JobCatalog(str(tmp_path / "missing.json"))
+    assert catalog._data is None
+    assert catalog.version == 0
+
+
+def test_reload_skips_unchanged_content(job_catalog):
+    catalog = job_catalog(OLD_ROLES)
+    version = catalog.version
+    assert catalog.reload(force=True) is False
+    assert catalog.version == version
+
+
+def test_reload_picks_up_modified_file(job_catalog):
+    catalog = job_catalog(OLD_ROLES)
+    fingerprint = catalog.fingerprint
+    assert list(catalog.data) == list(OLD_ROLES)
+
+    # Rewrite the file behind the catalog's back; the next access notices it
+    stat = os.stat(catalog.path)
+    with open(catalog.path, "w", encoding="utf-8") as f:
+        json.dump(NEW_ROLES, f)
+    os.utime(catalog.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert dict(catalog.data) == NEW_ROLES
+    assert list(catalog.data) == list(NEW_ROLES)
+    assert catalog.fingerprint != fingerprint
+
+
+def test_reload_patches_skill_index(job_catalog):
+    catalog = job_catalog(OLD_ROLES)
+    index = catalog.skill_index
+
+    catalog = job_catalog(NEW_ROLES)
+    assert catalog.skill_index is index
+
+    fresh = SkillIndex(NEW_ROLES, catalog.normalizer)
+    assert list(index.role_skills) == list(NEW_ROLES)
+    assert index.role_skills == fresh.role_skills
+    assert {key: sorted(roles) for key, roles in index.skill_to_roles.items()} == \
+        {key: sorted(roles) for key, roles in fresh.skill_to_roles.items()}
+    for text in RESUMES:
+        assert index.find_skills(text) == fresh.find_skills(text)
+
+
+@pytest.mark.skipif(not HAS_SKLEARN, reason="scikit-learn not installed")
+def test_reload_updates_matcher_incrementally(job_catalog):
+    catalog = job_catalog(OLD_ROLES)
+    matcher = catalog.matcher
+
+    catalog = job_catalog(NEW_ROLES)
+    assert catalog.matcher is not matcher
+    assert catalog.matcher.roles == list(NEW_ROLES)
+
+    fresh = RoleMatcher(NEW_ROLES, normalizer=catalog.normalizer)
+    for text in RESUMES:
+        assert catalog.matcher.match(text) == fresh.match(text)
+
+
+@pytest.mark.skipif(not HAS_SKLEARN, reason="scikit-learn not installed")
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_updated_matcher_equals_fresh_build(scoring):
+    matcher = RoleMatcher(OLD_ROLES)
+    changed = {role for role, skills in NEW_ROLES.items() if OLD_ROLES.get(role) != skills}
+    updated = matcher.updated(NEW_ROLES, changed)
+    fresh = RoleMatcher(NEW_ROLES)
+
+    # The original matcher is left untouched
+    assert matcher.roles == list(OLD_ROLES)
+    assert updated.roles == fresh.roles
+    for text in RESUMES:
+        assert updated.match(text, scoring) == fresh.match(text, scoring)
@@ -0,0 +1,129 @@
+import time
+import asyncio
+
+import pytest
+
+import job_search
+from job_search import JOB_BOARDS, FakeJobBackend, JobBackend, JobSearch, RateLimiter, TTLCache
+
+FAST = {board: (1000.0, 10) for board in JOB_BOARDS}
+
+
+def make_search(backend, **kwargs):
+    kwargs.setdefault("rate_limits", FAST)
+    return JobSearch(backend, **kwargs)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_search.time, "monotonic", clock)
+    return clock
+
+
+def test_incomplete_backend_fails_at_construction():
+    class NoSearch(JobBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        NoSearch()
+
+
+def test_boards_and_roles_are_searched_concurrently():
+    backend = FakeJobBackend(latency=0.2)
+    search = make_search(backend)
+
+    started = time.perf_counter()
+    openings = asyncio.run(search.search_roles(["Data Scientist", "Backend Developer", "Data Scientist"], "Berlin"))
+    elapsed = time.perf_counter() - started
+
+    # 2 roles x 5 boards would take 2 s one after another
+    assert elapsed < 1.0
+    assert list(openings) == ["Data Scientist", "Backend Developer"]
+    assert len(backend.calls) == 2 * len(JOB_BOARDS)
+    postings = openings["Data Scientist"]["Indeed"]
+    assert len(postings) == 5
+    assert postings[0]["board"] == "Indeed" and "Berlin" in postings[0]["title"]
+
+
+def test_rate_limiter_spaces_requests_after_the_burst(clock):
+    limiter = RateLimiter(rate=10.0, burst=3)
+
+    delays = [limiter.reserve() for _ in range(5)]
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    assert delays[3] == pytest.approx(0.1)
+    assert delays[4] == pytest.approx(0.2)
+
+    # Idle time refills the bucket, but never beyond the burst
+    clock.now += 10
+    assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.reserve() == pytest.approx(0.1)
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = TTLCache(ttl=10)
+    cache.put("a", 1)
+    cache.put("b", 2, ttl=1)
+
+    clock.now += 5
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    clock.now += 6
+    assert cache.get("a") is None
+
+
+def test_successful_results_are_cached_for_the_ttl():
+    backend = FakeJobBackend()
+    search = make_search(backend, ttl=60, failure_ttl=0.05)
+
+    first = asyncio.run(search.search_role("Data Scientist"))
+    time.sleep(0.1)
+    assert asyncio.run(search.search_role("data scientist ")) is first
+    assert len(backend.calls) == len(JOB_BOARDS)
+
+
+def test_failed_board_is_empty_and_retried_after_failure_ttl():
+    backend = FakeJobBackend(failing_boards={"Indeed"})
+    search = make_search(backend, ttl=60, failure_ttl=0.05)
+
+    openings = asyncio.run(search.search_role("Data Scientist"))
+    assert openings["Indeed"] == []
+    assert len(openings["LinkedIn"]) == 5
+
+    asyncio.run(search.search_role("Data Scientist"))
+    assert len(backend.calls) == len(JOB_BOARDS)
+
+    time.sleep(0.1)
+    asyncio.run(search.search_role("Data Scientist"))
+    assert len(backend.calls) == 2 * len(JOB_BOARDS)
+
+
+def test_slow_boards_time_out():
+    backend = FakeJobBackend(latency=1.0)
+    search = make_search(backend, timeout=0.05, failure_ttl=0.05)
+
+    started = time.perf_counter()
+    openings = asyncio.run(search.search_role("Data Scientist"))
+    assert time.perf_counter() - started < 0.5
+    assert openings == {board: [] for board in JOB_BOARDS}
+
+
+def test_search_roles_sync_reuses_one_background_loop():
+    search = make_search(FakeJobBackend(latency=0.01))
+    try:
+        first = search.search_roles_sync(["Data Scientist"])
+        loop = search._loop
+        second = search.search_roles_sync(["Data Scientist", "Designer"])
+        assert search._loop is loop
+        assert second["Data Scientist"] == first["Data Scientist"]
+        assert set(second["Designer"]) == set(JOB_BOARDS)
+    finally:
+        search.close()
@@ -0,0 +1,54 @@
+import pytest
+
+from resume_ai import HAS_PYMUPDF, suggest_improvements
+from pdf_generator import generate_role_report
+
+RESUME = "Summary\nBackend developer.\nSkills\npython, sql, docker"
+
+
+def pdf_text(pdf_bytes):
+    import fitz
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return "".join(page.get_text("text") for page in doc)
+
+
+@pytest.mark.skipif(not HAS_PYMUPDF, reason="PyMuPDF not installed")
+def test_role_report_is_rebuilt_after_catalog_reload(job_catalog):
+    job_catalog({"Backend Developer": ["python", "sql", "docker"]})
+    first = generate_role_report(RESUME, "Backend Developer", "Alex")
+    assert "Match Score: 100.0%" in pdf_text(first)
+    assert generate_role_report(RESUME, "Backend Developer", "Alex") is first
+
+    job_catalog({"Backend Developer": ["python", "sql", "docker", "kafka", "redis", "go"]})
+    assert suggest_improvements(RESUME, "Backend Developer")["match_percentage"] == 50.0
+    assert "Match Score: 50.0%" in pdf_text(generate_role_report(RESUME, "Backend Developer", "Alex"))
+
+
+def zip_texts(archive_bytes):
+    import io
+    import zipfile
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+        return {name: pdf_text(archive.read(name)) for name in archive.namelist()}
+
+
+@pytest.mark.skipif(not HAS_PYMUPDF, reason="PyMuPDF not installed")
+def test_reports_zip_from_pool_equals_serial_rendering(job_catalog):
+    import io
+    from pdf_generator import generate_reports_zip
+
+    job_catalog({"Backend Developer": ["python", "sql", "docker", "kafka"], "Data Analyst": ["sql", "excel"]})
+    items = [
+        (RESUME, "Backend Developer", "Alex"),
+        (RESUME, "Data Analyst", "Sam"),
+        ("Skills\nexcel, tableau", "Data Analyst", "Kim"),
+    ]
+
+    serial, parallel = io.BytesIO(), io.BytesIO()
+    assert generate_reports_zip(items, serial) == {"reports": 3, "errors": []}
+    assert generate_reports_zip(items, parallel, workers=2) == {"reports": 3, "errors": []}
+
+    serial_texts = zip_texts(serial.getvalue())
+    assert list(serial_texts) == list(zip_texts(parallel.getvalue()))
+    assert serial_texts == zip_texts(parallel.getvalue())
+    # Workers scored against the test catalog, not the default one
+    assert "Match Score: 75.0%" in serial_texts["00001_Alex_Backend_Developer.pdf"]
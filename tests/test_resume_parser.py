@@ -0,0 +1,31 @@
+from resume_parser import parse_resume_text
+
+
+def test_capitalized_degrees_are_extracted():
+    text = "\n".join([
+        "Jane Doe",
+        "Education",
+        "Bachelor of Science in Computer Science, Stanford University, 2015 - 2019",
+        "Master of Business Administration",
+        "Masters in Data Science",
+        "Doctor of Philosophy in Physics",
+        "B.Sc. Mathematics",
+    ])
+
+    degrees = [entity.text for entity in parse_resume_text(text).entities("degree")]
+
+    assert degrees == [
+        "Bachelor of Science in Computer Science",
+        "Master of Business Administration",
+        "Masters in Data Science",
+        "Doctor of Philosophy in Physics",
+        "B.Sc. Mathematics",
+    ]
+
+
+def test_lowercase_degrees_are_still_extracted():
+    text = "Education\nbachelor's in economics"
+
+    degrees = [entity.text for entity in parse_resume_text(text).entities("degree")]
+
+    assert degrees == ["bachelor's in economics"]
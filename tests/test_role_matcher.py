@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from resume_ai import HAS_SKLEARN, SCORING_MODES
+
+pytestmark = pytest.mark.skipif(not HAS_SKLEARN, reason="scikit-learn not installed")
+
+SKILLS = [
+    "python", "java", "sql", "docker", "kubernetes", "aws", "react", "node.js", "machine learning",
+    "statistics", "tableau", "excel", "figma", "swift", "terraform", "spark", "pandas", "rest api",
+]
+
+
+def make_job_data(n_roles, seed=0):
+    rng = random.Random(seed)
+    return {f"Role {i}": rng.sample(SKILLS, rng.randint(2, 6)) for i in range(n_roles)}
+
+
+def make_resumes(n, seed=1):
+    rng = random.Random(seed)
+    words = " ".join(SKILLS).split() + ["team", "delivered", "customers", "built"]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(0, 12))) for _ in range(n)]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    from resume_ai import RoleMatcher
+    return RoleMatcher(make_job_data(200))
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_top_k_equals_match_prefix(matcher, scoring):
+    for text in make_resumes(100):
+        for k in (1, 5, 20):
+            assert matcher.top_k(text, k, scoring) == matcher.match(text, scoring)[:k]
+
+
+def test_top_k_of_empty_resume_lists_roles_in_catalog_order(matcher):
+    assert [match["job"] for match in matcher.top_k("", 3)] == ["Role 0", "Role 1", "Role 2"]
+
+
+def test_corpus_updates_refresh_idf_weights_in_batches():
+    from resume_ai import CORPUS_REFRESH_FRACTION, RoleMatcher
+
+    matcher = RoleMatcher(make_job_data(100), scoring="bm25")
+    text = "python sql docker"
+    before = matcher.match(text)
+    weights = matcher._engine("bm25")
+
+    # Fewer resumes than the refresh batch: the weights and scores are reused
+    batch = int(CORPUS_REFRESH_FRACTION * 100)
+    matcher.add_documents(["python"] * (batch - 1))
+    assert matcher.corpus_size == batch - 1
+    assert matcher.weights_corpus_size == 0
+    assert matcher._engine("bm25") is weights
+    assert matcher.match(text) == before
+
+    # Completing the batch re-derives the weights from the grown corpus
+    matcher.add_documents(["python"])
+    assert matcher.weights_corpus_size == batch
+    assert matcher._engine("bm25") is not weights
+    python = matcher.vocabulary["python"]
+    assert matcher.idf("bm25")[python] < RoleMatcher(make_job_data(100)).idf("bm25")[python]
+
+
+def test_refresh_weights_applies_pending_corpus_statistics():
+    from resume_ai import RoleMatcher
+
+    matcher = RoleMatcher(make_job_data(1000), scoring="tfidf")
+    matcher.add_documents(["python sql"])
+    assert matcher.weights_corpus_size == 0
+    matcher.refresh_weights()
+    assert matcher.weights_corpus_size == 1
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_match_many_equals_match_prefix(matcher, scoring):
+    resumes = make_resumes(100)
+    for k in (None, 1, 5):
+        expected = [matcher.match(text, scoring)[:k] for text in resumes]
+        assert matcher.match_many(resumes, top_k=k, chunk_size=16, scoring=scoring) == expected
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_match_many_ties_follow_catalog_order(scoring):
+    from resume_ai import RoleMatcher
+
+    # Identical skill lists tie on every resume; names are not in sorted order
+    job_data = {"Zeta": ["python", "sql"], "Alpha": ["python", "sql"], "Mid": ["python", "sql"], "Other": ["figma"]}
+    matcher = RoleMatcher(job_data)
+    for matches in matcher.match_many(["python sql", "python", ""], top_k=3, scoring=scoring):
+        assert [match["job"] for match in matches] == ["Zeta", "Alpha", "Mid"]
@@ -0,0 +1,46 @@
+import pytest
+
+from resume_ai import HAS_SKLEARN, RoleMatcher, SkillNormalizer, load_skill_aliases, tokenize_skills_text
+
+JOB_DATA = {
+    "Data Scientist": ["python", "r programming", "machine learning", "statistics"],
+    "DevOps Engineer": ["docker", "kubernetes", "aws", "terraform"],
+}
+
+NON_SKILL_SENTENCE = "I speak the English language and enjoy reading about the history of the region"
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return SkillNormalizer(load_skill_aliases())
+
+
+def test_aliases_are_rewritten_to_canonical_skills(normalizer):
+    tokens = tokenize_skills_text("Deployed services on k8s with sklearn models", normalizer)
+
+    assert "kubernetes" in tokens
+    assert tokens[tokens.index("scikit"):tokens.index("scikit") + 2] == ["scikit", "learn"]
+
+
+def test_non_skill_sentence_has_no_canonical_skills(normalizer):
+    tokens = tokenize_skills_text(NON_SKILL_SENTENCE)
+
+    assert tokenize_skills_text(NON_SKILL_SENTENCE, normalizer) == tokens
+
+
+@pytest.mark.skipif(not HAS_SKLEARN, reason="scikit-learn not installed")
+def test_matcher_analyzer_does_not_turn_words_into_skills(normalizer):
+    plain = RoleMatcher(JOB_DATA)
+    matcher = RoleMatcher(JOB_DATA, normalizer=normalizer)
+
+    assert matcher._analyzer(NON_SKILL_SENTENCE) == plain._analyzer(NON_SKILL_SENTENCE)
+    assert "programming" not in matcher._analyzer("the English language")
+    assert all(match["similarity"] == 0 for match in matcher.match("english language"))
+
+
+@pytest.mark.skipif(not HAS_SKLEARN, reason="scikit-learn not installed")
+def test_matcher_analyzer_still_rewrites_aliases(normalizer):
+    matcher = RoleMatcher(JOB_DATA, normalizer=normalizer)
+
+    assert "kubernetes" in matcher._analyzer("k8s and terraform")
+    assert matcher.match("k8s")[0]["job"] == "DevOps Engineer"